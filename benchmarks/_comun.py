@@ -0,0 +1,94 @@
+"""Utilidades compartidas por los benchmarks."""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import joblib
+
+RAIZ = Path(__file__).resolve().parent.parent
+RUTA_SUSTITUTO = Path(tempfile.gettempdir()) / "eventia_modelo_sustituto.pkl"
+
+EVENTO_EJEMPLO = {
+    "Departamento": "Antioquia",
+    "Municipio": "Medellín",
+    "CategoriaFunciones": "Unica",
+    "EsCapital": "1",
+    "artista": "Karol G",
+    "genero": "Reggaeton",
+    "tipo": "Nacional",
+    "NumeroFunciones": 1,
+    "PrecioMinimo": 120000.0,
+    "PrecioMaximo": 450000.0,
+    "cantidad_artistas_evento": 2,
+}
+
+
+def importar_main():
+    """Importa ``main`` usando el modelo sustituto (lo genera si no existe) y lo carga."""
+    if not RUTA_SUSTITUTO.exists():
+        from modelo_sustituto import construir_modelo
+
+        joblib.dump(construir_modelo(), RUTA_SUSTITUTO)
+    os.environ.setdefault("EVENTIA_MODEL_PATH", str(RUTA_SUSTITUTO))
+    sys.path.insert(0, str(RAIZ))
+    import main
+
+    main.cargar_modelo()
+    return main
+
+
+def medir(funcion, repeticiones=200, calentamiento=10):
+    """Devuelve la mediana y el p95 (en ms) de ``repeticiones`` llamadas a ``funcion``."""
+    for _ in range(calentamiento):
+        funcion()
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    tiempos.sort()
+    return tiempos[len(tiempos) // 2], tiempos[int(len(tiempos) * 0.95) - 1]
+
+
+async def _carga_asgi(app, peticion, n, concurrencia):
+    import httpx
+
+    latencias = []
+    estados = {}
+    pendientes = iter(range(n))
+    transporte = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transporte, base_url="http://bench") as cliente:
+        async def trabajador():
+            for _ in pendientes:
+                inicio = time.perf_counter()
+                resp = await peticion(cliente)
+                latencias.append((time.perf_counter() - inicio) * 1000)
+                estados[resp.status_code] = estados.get(resp.status_code, 0) + 1
+
+        inicio = time.perf_counter()
+        await asyncio.gather(*(trabajador() for _ in range(concurrencia)))
+        duracion = time.perf_counter() - inicio
+
+    latencias.sort()
+    percentil = lambda p: latencias[min(len(latencias) - 1, int(len(latencias) * p))]
+    return {
+        "peticiones": n,
+        "concurrencia": concurrencia,
+        "req_s": n / duracion,
+        "p50_ms": percentil(0.50),
+        "p95_ms": percentil(0.95),
+        "p99_ms": percentil(0.99),
+        "estados": estados,
+    }
+
+
+def carga_asgi(app, peticion, n=500, concurrencia=10):
+    """Prueba de carga en proceso contra una app ASGI.
+
+    ``peticion`` es una corrutina que recibe un ``httpx.AsyncClient`` y devuelve la
+    respuesta. Devuelve req/s y percentiles de latencia (ms).
+    """
+    return asyncio.run(_carga_asgi(app, peticion, n, concurrencia))
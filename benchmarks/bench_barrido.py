@@ -0,0 +1,45 @@
+"""Barrido de fechas: paridad con /api/v1/predict y latencia de /api/v1/predict/range.
+
+Verifica que la curva del barrido coincide con la predicción del día central de
+/api/v1/predict en fechas de muestra y mide la latencia de extremo a extremo
+(incluida la serialización JSON) para barridos de 30 días a 3 años:
+
+    python benchmarks/bench_barrido.py
+"""
+import asyncio
+
+import httpx
+import numpy as np
+
+from _comun import EVENTO_EJEMPLO, importar_main, medir
+
+main = importar_main()
+EVENTO = dict(EVENTO_EJEMPLO, artista_nombre=EVENTO_EJEMPLO["artista"])
+
+
+async def _post(ruta, cuerpo):
+    transporte = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transporte, base_url="http://bench") as cliente:
+        respuesta = await cliente.post(ruta, json=cuerpo)
+    assert respuesta.status_code == 200, respuesta.text
+    return respuesta.json()
+
+
+def barrido(inicio, fin, top_k=10):
+    return asyncio.run(_post("/api/v1/predict/range", dict(EVENTO, fecha_inicio=inicio, fecha_fin=fin, top_k=top_k)))
+
+
+if __name__ == "__main__":
+    resultado = barrido("2025-01-01", "2025-12-31")
+    curva = dict(zip(resultado["curva"]["fechas"], resultado["curva"]["predicciones"]))
+    for fecha in ["2025-01-01", "2025-03-15", "2025-06-14", "2025-12-31"]:
+        ventana = asyncio.run(_post("/api/v1/predict", dict(EVENTO, fecha=fecha)))
+        assert np.isclose(ventana["predicciones"][2]["prediccion"], curva[fecha], rtol=1e-9), fecha
+    mejores = [m["prediccion"] for m in resultado["mejores"]]
+    assert mejores == sorted(curva.values(), reverse=True)[:10]
+    print("mejores fechas 2025:", [m["fecha"] for m in resultado["mejores"][:5]])
+
+    for dias, fin in [(30, "2025-01-30"), (365, "2025-12-31"), (1095, "2027-12-31")]:
+        mediana, p95 = medir(lambda: barrido("2025-01-01", fin), repeticiones=50, calentamiento=3)
+        predictor = medir(lambda: main.barrer_fechas(main.EVENTO_CALENTAMIENTO, "2025-01-01", dias), 50, 3)[0]
+        print(f"{dias:>5} días: extremo a extremo mediana {mediana:.1f} ms | p95 {p95:.1f} ms | barrer_fechas {predictor:.1f} ms")
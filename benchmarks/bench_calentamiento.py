@@ -0,0 +1,85 @@
+"""Latencia de las primeras peticiones a /predecir con y sin calentamiento.
+
+Cada configuración arranca en un proceso nuevo (para pagar de verdad las
+importaciones perezosas y las cachés de primera llamada), carga el modelo y mide
+las primeras peticiones a /predecir con fechas distintas (sin aciertos de caché),
+después de calentar el cliente con peticiones que no llegan al modelo:
+
+    python benchmarks/bench_calentamiento.py [--estimadores gb xgb] [--peticiones 5]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import joblib
+
+
+def hijo(peticiones):
+    from _comun import EVENTO_EJEMPLO, importar_main
+
+    inicio = time.perf_counter()
+    main = importar_main()
+    listo = time.perf_counter() - inicio
+    from fastapi.testclient import TestClient
+
+    latencias = []
+    with TestClient(main.app) as cliente:
+        # El cliente también paga su primera llamada: se calienta con rutas que no usan el modelo
+        for _ in range(3):
+            cliente.post("/predecir", data={})
+        for i in range(peticiones):
+            formulario = dict(
+                EVENTO_EJEMPLO, artista="Concierto", artista_nombre=EVENTO_EJEMPLO["artista"], fecha=f"2026-05-{i + 10}"
+            )
+            inicio = time.perf_counter()
+            resp = cliente.post("/predecir", data=formulario)
+            latencias.append((time.perf_counter() - inicio) * 1000)
+            assert resp.status_code == 200, resp.text
+    print(json.dumps({"listo_s": listo, "latencias_ms": latencias, "tiempos": main.MODELOS.activa.tiempos_ms}))
+
+
+def artefacto(estimador):
+    if estimador == "gb":
+        from _comun import RUTA_SUSTITUTO as ruta
+    else:
+        ruta = Path(tempfile.gettempdir()) / f"eventia_modelo_sustituto_{estimador}.pkl"
+    if not ruta.exists():
+        from modelo_sustituto import construir_modelo
+
+        joblib.dump(construir_modelo(estimador=estimador), ruta)
+    return ruta
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--estimadores", nargs="+", default=["gb", "xgb"])
+    parser.add_argument("--peticiones", type=int, default=5)
+    parser.add_argument("--hijo", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.hijo:
+        hijo(args.peticiones)
+        sys.exit()
+
+    print(f"{'modelo':>6} | {'calentamiento':>13} | {'listo':>7} | primeras peticiones a /predecir (ms)")
+    for estimador in args.estimadores:
+        for repeticiones in (0, 3):
+            entorno = dict(
+                os.environ,
+                EVENTIA_MODEL_PATH=str(artefacto(estimador)),
+                EVENTIA_CALENTAMIENTO_REPETICIONES=str(repeticiones),
+                EVENTIA_CACHE_TAMANO="0",
+            )
+            salida = subprocess.run(
+                [sys.executable, __file__, "--hijo", "--peticiones", str(args.peticiones)],
+                env=entorno, capture_output=True, text=True, check=True,
+            ).stdout
+            r = json.loads(salida.strip().splitlines()[-1])
+            latencias = " ".join(f"{ms:7.1f}" for ms in r["latencias_ms"])
+            print(f"{estimador:>6} | {'sí' if repeticiones else 'no':>13} | {r['listo_s']:6.2f}s | {latencias}")
+            if repeticiones:
+                print(f"{'':>6}   desglose: {r['tiempos']}")
@@ -0,0 +1,69 @@
+"""Lotes codificados frente al DataFrame: paridad y costo de armar y predecir.
+
+Verifica que ``PredictorCompilado`` da lo mismo con un ``LoteCodificado`` que con
+el DataFrame (eventos escalares, columnas por fila y valores desconocidos) y
+mide, para varios tamaños de lote, armar la entrada y armarla más predecir:
+
+    python benchmarks/bench_codificacion.py [--filas 5 365 5000 50000]
+"""
+import argparse
+
+import numpy as np
+
+from _comun import EVENTO_EJEMPLO, importar_main, medir
+
+main = importar_main()
+
+
+def entradas(n, por_fila):
+    fechas = np.datetime64("2025-01-01") + np.arange(n) % 730
+    temporales = main.CALENDARIO.consultar(fechas)
+    evento = dict(EVENTO_EJEMPLO)
+    if por_fila:
+        ciudades = np.arange(n) % len(main.GEOGRAFIA["municipio"])
+        evento.update(
+            Departamento=main.GEOGRAFIA["departamento"][ciudades],
+            Municipio=main.GEOGRAFIA["municipio"][ciudades],
+            EsCapital=main.GEOGRAFIA["es_capital"][ciudades],
+            artista=np.array(["Karol G", "Artista nuevo", "Shakira"], dtype=object)[np.arange(n) % 3],
+            PrecioMinimo=np.linspace(50_000, 200_000, n),
+        )
+    return evento, temporales
+
+
+def verificar():
+    for n in (1, 5, 1000):
+        for por_fila in (False, True):
+            evento, temporales = entradas(n, por_fila)
+            esperado = main.predictor.predict(main.construir_datos_modelo(evento, temporales))
+            obtenido = main.predictor.predict(main.construir_lote(evento, temporales))
+            assert np.allclose(obtenido, esperado, rtol=1e-9, atol=0), (n, por_fila)
+    evento = dict(EVENTO_EJEMPLO, artista="Artista nuevo", genero="Cumbia")
+    assert set(main.INDICE_CATEGORIAS.desconocidas(evento, main.COLUMNAS_VALIDADAS)) == {"artista", "genero"}
+    print("✅ Paridad DataFrame / lote codificado (escalares, por fila y desconocidos)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--filas", type=int, nargs="+", default=[5, 365, 5000, 50000])
+    args = parser.parse_args()
+
+    verificar()
+    evento = dict(EVENTO_EJEMPLO, artista="Artista nuevo")
+    mediana, _ = medir(lambda: main.INDICE_CATEGORIAS.desconocidas(evento, main.COLUMNAS_VALIDADAS), 2000)
+    print(f"validación de categorías: {mediana * 1000:.1f} µs")
+    for por_fila in (False, True):
+        print("columnas por fila (ciudad, artista, precio)" if por_fila else "evento escalar")
+        for n in args.filas:
+            evento, temporales = entradas(n, por_fila)
+            repeticiones = max(5, min(200, 200_000 // n))
+            fila = {}
+            for nombre, construir in (("dataframe", main.construir_datos_modelo), ("lote", main.construir_lote)):
+                armar, _ = medir(lambda: construir(evento, temporales), repeticiones)
+                total, _ = medir(lambda: main.predictor.predict(construir(evento, temporales)), repeticiones)
+                fila[nombre] = (armar, total)
+            (armar_df, total_df), (armar_lote, total_lote) = fila["dataframe"], fila["lote"]
+            print(
+                f"{n:>7} filas | armar: DataFrame {armar_df:8.3f} ms, lote {armar_lote:8.3f} ms | "
+                f"armar+predecir: {total_df:8.2f} -> {total_lote:8.2f} ms ({(total_lote / total_df - 1) * 100:+.0f} %)"
+            )
@@ -0,0 +1,73 @@
+"""Compara la descarga previa (``resp.content`` en memoria) con la descarga en streaming.
+
+Sirve un artefacto sintético por HTTP local y mide tiempo y pico de memoria Python:
+
+    python benchmarks/bench_descarga.py [--mb 200]
+"""
+import argparse
+import functools
+import http.server
+import os
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+import requests
+
+from _comun import RAIZ
+
+sys.path.insert(0, str(RAIZ))
+from descarga_modelo import asegurar_modelo, sha256_archivo  # noqa: E402
+
+
+class ManejadorSilencioso(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+def descarga_en_memoria(url, destino):
+    resp = requests.get(url)
+    with open(destino, "wb") as f:
+        f.write(resp.content)
+
+
+def medir(funcion, url, destino):
+    if os.path.exists(destino):
+        os.remove(destino)
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    funcion(url, destino)
+    duracion = time.perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return duracion, pico / 1024 / 1024
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mb", type=int, default=200, help="tamaño del artefacto sintético")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directorio:
+        origen = os.path.join(directorio, "modelo.pkl")
+        with open(origen, "wb") as f:
+            for _ in range(args.mb):
+                f.write(os.urandom(1024 * 1024))
+        sha256 = sha256_archivo(origen)
+
+        manejador = functools.partial(ManejadorSilencioso, directory=directorio)
+        servidor = http.server.ThreadingHTTPServer(("127.0.0.1", 0), manejador)
+        threading.Thread(target=servidor.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{servidor.server_port}/modelo.pkl"
+        destino = os.path.join(directorio, "descargado.pkl")
+
+        variantes = [
+            ("en memoria", descarga_en_memoria),
+            ("streaming + SHA-256", lambda u, d: asegurar_modelo(u, d, sha256)),
+        ]
+        for nombre, funcion in variantes:
+            duracion, pico = medir(funcion, url, destino)
+            print(f"{nombre:>20}: {duracion:.2f} s | pico de memoria {pico:.1f} MB")
+        servidor.shutdown()
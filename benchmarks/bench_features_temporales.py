@@ -0,0 +1,75 @@
+"""Micro-benchmark de las features temporales: implementación escalar original vs. vectorizada.
+
+    python benchmarks/bench_features_temporales.py [--max-escalar 100000]
+"""
+import argparse
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from _comun import RAIZ
+
+sys.path.insert(0, str(RAIZ))
+from features_temporales import calcular_features_temporales_vector  # noqa: E402
+
+
+def calcular_features_temporales_original(fecha_str):
+    """Implementación escalar previa a la vectorización, como referencia."""
+    fecha = datetime.strptime(fecha_str, "%Y-%m-%d")
+    dias_semana = ["Lunes", "Martes", "Miércoles", "Jueves", "Viernes", "Sábado", "Domingo"]
+    dias_semana_cortos = ["Lun", "Mar", "Mié", "Jue", "Vie", "Sáb", "Dom"]
+    meses = ["", "Ene", "Feb", "Mar", "Abr", "May", "Jun", "Jul", "Ago", "Sep", "Oct", "Nov", "Dic"]
+    dia_semana_num = fecha.weekday()
+    semana_del_anio = fecha.isocalendar()[1]
+    dia_del_anio = fecha.timetuple().tm_yday
+    return {
+        "anio": fecha.year,
+        "semana_sin": np.sin(2 * np.pi * semana_del_anio / 52),
+        "semana_cos": np.cos(2 * np.pi * semana_del_anio / 52),
+        "dia_sin": np.sin(2 * np.pi * dia_del_anio / 365),
+        "dia_cos": np.cos(2 * np.pi * dia_del_anio / 365),
+        "dia_semana": dia_semana_num,
+        "dia_semana_es": dias_semana[dia_semana_num],
+        "dia_semana_corto": dias_semana_cortos[dia_semana_num],
+        "fecha_formateada": f"{dias_semana_cortos[dia_semana_num]} {fecha.day} {meses[fecha.month]}",
+        "fecha_corta": f"{fecha.day} {meses[fecha.month]}",
+    }
+
+
+def verificar_paridad():
+    fechas = pd.date_range("2015-01-01", "2035-12-31").strftime("%Y-%m-%d").tolist()
+    vector = calcular_features_temporales_vector(fechas)
+    for i, fecha in enumerate(fechas):
+        original = calcular_features_temporales_original(fecha)
+        for clave, valor in original.items():
+            assert vector[clave][i] == valor, (fecha, clave, vector[clave][i], valor)
+    print(f"✅ Paridad verificada en {len(fechas)} fechas")
+
+
+def cronometrar(funcion):
+    inicio = time.perf_counter()
+    funcion()
+    return time.perf_counter() - inicio
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--max-escalar", type=int, default=100_000,
+                        help="tamaño máximo para el que se mide el bucle escalar")
+    args = parser.parse_args()
+
+    verificar_paridad()
+    rng = np.random.default_rng(0)
+    print(f"{'n':>9} | {'escalar (ms)':>12} | {'vector (ms)':>11} | {'aceleración':>11}")
+    for n in [1, 10, 100, 1_000, 10_000, 100_000, 1_000_000]:
+        dias = rng.integers(0, 365 * 10, n)
+        fechas = (np.datetime64("2020-01-01") + dias).astype(str).tolist()
+        t_vector = cronometrar(lambda: calcular_features_temporales_vector(fechas))
+        if n <= args.max_escalar:
+            t_escalar = cronometrar(lambda: [calcular_features_temporales_original(f) for f in fechas])
+            print(f"{n:>9} | {t_escalar * 1000:>12.2f} | {t_vector * 1000:>11.2f} | {t_escalar / t_vector:>10.1f}x")
+        else:
+            print(f"{n:>9} | {'-':>12} | {t_vector * 1000:>11.2f} | {'-':>11}")
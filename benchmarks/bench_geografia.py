@@ -0,0 +1,41 @@
+"""Índice de geografía: EsCapital derivado y autocompletado por prefijo.
+
+Verifica que EsCapital del índice coincide con la búsqueda lineal en
+``CAPITALES`` para todos los municipios y mide ``ubicar`` (exacto y sin tildes),
+``buscar_municipios`` y las rutas de autocompletado de extremo a extremo:
+
+    python benchmarks/bench_geografia.py
+"""
+from _comun import carga_asgi, importar_main, medir
+
+main = importar_main()
+
+
+def verificar():
+    for departamento, municipios in main.DEPARTAMENTOS_MUNICIPIOS.items():
+        for municipio in municipios:
+            esperado = "1" if municipio in main.CAPITALES else "0"
+            assert main.ubicar(departamento, municipio, "9")[2] == esperado, municipio
+            assert main.ubicar(departamento.upper(), municipio.lower(), "9")[1] == municipio, municipio
+    assert main.ubicar("Atlántida", "Ciudad perdida", "1") == ("Atlántida", "Ciudad perdida", "1")
+    print(f"✅ EsCapital derivado para {len(main.GEOGRAFIA['municipio'])} municipios")
+
+
+if __name__ == "__main__":
+    verificar()
+    for nombre, funcion in [
+        ("ubicar exacto", lambda: main.ubicar("Antioquia", "Medellín")),
+        ("ubicar sin tildes", lambda: main.ubicar("antioquia", "MEDELLIN")),
+        ("búsqueda lineal en CAPITALES", lambda: "Puerto Carreño" in main.CAPITALES),
+        ("buscar_municipios('san')", lambda: main.GEO.buscar_municipios("san", 10)),
+        ("buscar_municipios('villa de l')", lambda: main.GEO.buscar_municipios("villa de l", 10)),
+    ]:
+        mediana, p95 = medir(funcion, 20_000, 100)
+        print(f"{nombre:>32}: mediana {mediana * 1000:6.2f} µs | p95 {p95 * 1000:6.2f} µs")
+
+    for ruta in ("/api/v1/autocomplete/municipios?q=me", "/api/v1/autocomplete/artistas?q=k"):
+        async def peticion(cliente, ruta=ruta):
+            return await cliente.get(ruta)
+
+        r = carga_asgi(main.app, peticion, 2000, 8)
+        print(f"{ruta:>40}: {r['req_s']:6.0f} req/s | p50 {r['p50_ms']:.2f} ms | p99 {r['p99_ms']:.2f} ms | {r['estados']}")
@@ -0,0 +1,62 @@
+"""Planificador de giras: paridad, latencia y memoria pico.
+
+Verifica que la matriz de /api/v1/plan/tour coincide con /api/v1/predict para
+algunas ciudades y fechas (con EsCapital derivado) y mide la latencia y la
+memoria pico de Python (tracemalloc) de ``evaluar_gira`` para todos los
+municipios en rangos de 7 días a un año:
+
+    python benchmarks/bench_gira.py
+"""
+import asyncio
+import time
+import tracemalloc
+
+import httpx
+import numpy as np
+
+from _comun import EVENTO_EJEMPLO, importar_main
+
+main = importar_main()
+CONFIGURACION = {
+    clave: valor
+    for clave, valor in dict(EVENTO_EJEMPLO, artista_nombre=EVENTO_EJEMPLO["artista"]).items()
+    if clave not in ("Departamento", "Municipio", "EsCapital", "artista")
+}
+
+
+async def _post(ruta, cuerpo):
+    transporte = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transporte, base_url="http://bench") as cliente:
+        respuesta = await cliente.post(ruta, json=cuerpo)
+    assert respuesta.status_code == 200, respuesta.text
+    return respuesta.json()
+
+
+if __name__ == "__main__":
+    gira = asyncio.run(_post("/api/v1/plan/tour", dict(CONFIGURACION, fecha_inicio="2025-06-10", fecha_fin="2025-06-20")))
+    matriz = gira["matriz"]
+    for municipio, fecha in [("Medellín", "2025-06-14"), ("Bello", "2025-06-12"), ("Mitú", "2025-06-20")]:
+        departamento = next(d for d, ms in main.DEPARTAMENTOS_MUNICIPIOS.items() if municipio in ms)
+        escenario = dict(
+            CONFIGURACION,
+            Departamento=departamento,
+            Municipio=municipio,
+            EsCapital="1" if municipio in main.CAPITALES else "0",
+            fecha=fecha,
+        )
+        ventana = asyncio.run(_post("/api/v1/predict", escenario))
+        celda = matriz["predicciones"][matriz["municipios"].index(municipio)][matriz["fechas"].index(fecha)]
+        assert np.isclose(ventana["predicciones"][2]["prediccion"], celda, rtol=1e-9), municipio
+    print("mejores ciudades:", [c["Municipio"] for c in gira["ciudades"][:5]])
+
+    evento = main.ConfiguracionEvento(**CONFIGURACION).a_evento()
+    ciudades = np.arange(len(main.GEOGRAFIA["municipio"]))
+    for dias in [7, 30, 365]:
+        main.evaluar_gira(evento, ciudades, "2025-01-01", dias)
+        tracemalloc.start()
+        inicio = time.perf_counter()
+        main.evaluar_gira(evento, ciudades, "2025-01-01", dias)
+        ms = (time.perf_counter() - inicio) * 1000
+        pico = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"{len(ciudades)} ciudades x {dias:>3} días ({len(ciudades) * dias:>6} filas): {ms:>6.0f} ms | pico {pico / 1e6:.1f} MB")
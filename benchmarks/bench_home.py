@@ -0,0 +1,47 @@
+"""Peticiones por segundo de GET / renderizando en cada petición vs. página precalculada.
+
+    python benchmarks/bench_home.py [--peticiones 2000 --concurrencia 10]
+"""
+import argparse
+
+from fastapi import FastAPI
+from fastapi.responses import HTMLResponse
+
+from _comun import carga_asgi, importar_main
+
+main = importar_main()
+
+# Réplica del comportamiento anterior: renderizar el HTML completo en cada GET
+app_anterior = FastAPI()
+app_anterior.get("/", response_class=HTMLResponse)(main.renderizar_home)
+
+
+async def get_simple(cliente):
+    return await cliente.get("/")
+
+
+async def get_gzip(cliente):
+    return await cliente.get("/", headers={"Accept-Encoding": "gzip"})
+
+
+async def get_condicional(cliente):
+    return await cliente.get("/", headers={"If-None-Match": main.PAGINA_HOME.etag})
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--peticiones", type=int, default=2000)
+    parser.add_argument("--concurrencia", type=int, default=10)
+    args = parser.parse_args()
+
+    for nombre, variante in main.PAGINA_HOME.variantes.items():
+        print(f"Variante {nombre}: {len(variante) / 1024:.1f} KB")
+    casos = [
+        ("renderizado por petición", app_anterior, get_simple),
+        ("precalculada", main.app, get_simple),
+        ("precalculada + gzip", main.app, get_gzip),
+        ("condicional (304)", main.app, get_condicional),
+    ]
+    for nombre, app, peticion in casos:
+        r = carga_asgi(app, peticion, args.peticiones, args.concurrencia)
+        print(f"{nombre:>26}: {r['req_s']:>8.0f} req/s | p50 {r['p50_ms']:.2f} ms | p99 {r['p99_ms']:.2f} ms | {r['estados']}")
@@ -0,0 +1,86 @@
+"""RSS por worker y total al servir el modelo con N procesos.
+
+Compara tres estrategias de carga:
+
+* ``independiente``: cada worker hace ``joblib.load`` (como ``uvicorn --workers N``).
+* ``mmap``: cada worker hace ``joblib.load(..., mmap_mode="r")``.
+* ``precarga``: el proceso padre carga el modelo y los workers se crean con fork
+  (como ``gunicorn --preload``), compartiendo las páginas por copy-on-write.
+
+Además del RSS se reporta el PSS (memoria compartida prorrateada), que es lo que
+realmente suma entre procesos. Solo funciona en Linux (/proc/self/smaps_rollup).
+
+    python benchmarks/bench_memoria_workers.py [--arboles 2000 --profundidad 8]
+"""
+import argparse
+import gc
+import multiprocessing as mp
+import os
+import tempfile
+
+import joblib
+import numpy as np
+
+from modelo_sustituto import construir_modelo, generar_datos
+
+MODELO = None
+
+
+def memoria_propia():
+    """(RSS, PSS) del proceso actual en MB."""
+    valores = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for linea in f:
+            partes = linea.split()
+            if partes[0] in ("Rss:", "Pss:"):
+                valores[partes[0]] = int(partes[1]) / 1024
+    return valores["Rss:"], valores["Pss:"]
+
+
+def worker(ruta, modo, barrera, cola):
+    modelo = MODELO if modo == "precarga" else joblib.load(ruta, mmap_mode="r" if modo == "mmap" else None)
+    datos, _ = generar_datos(100, semilla=1)
+    modelo.predict(datos)
+    cola.put(memoria_propia())
+    # Todos los workers siguen vivos mientras se mide, como en un servidor real
+    barrera.wait()
+
+
+def medir(ruta, modo, n_workers):
+    global MODELO
+    contexto = mp.get_context("fork" if modo == "precarga" else "spawn")
+    if modo == "precarga":
+        MODELO = joblib.load(ruta)
+        gc.freeze()
+    barrera = contexto.Barrier(n_workers)
+    cola = contexto.Queue()
+    procesos = [contexto.Process(target=worker, args=(ruta, modo, barrera, cola)) for _ in range(n_workers)]
+    for p in procesos:
+        p.start()
+    medidas = [cola.get() for _ in procesos]
+    for p in procesos:
+        p.join()
+    MODELO = None
+    gc.unfreeze()
+    return medidas
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--arboles", type=int, default=2000)
+    parser.add_argument("--profundidad", type=int, default=8)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "modelo.pkl")
+        joblib.dump(construir_modelo(arboles=args.arboles, profundidad=args.profundidad), ruta)
+        print(f"Artefacto: {os.path.getsize(ruta) / 1024 / 1024:.1f} MB")
+        print(f"{'modo':>14} | {'N':>2} | {'RSS/worker':>10} | {'RSS total':>9} | {'PSS total':>9}")
+        for modo in ["independiente", "mmap", "precarga"]:
+            for n in args.workers:
+                medidas = np.array(medir(ruta, modo, n))
+                print(
+                    f"{modo:>14} | {n:>2} | {medidas[:, 0].mean():>7.1f} MB | "
+                    f"{medidas[:, 0].sum():>6.1f} MB | {medidas[:, 1].sum():>6.1f} MB"
+                )
@@ -0,0 +1,108 @@
+"""Costo de la instrumentación de métricas sobre POST /predecir.
+
+Mide de dos formas, con la caché desactivada para que cada petición llegue al modelo:
+
+- directo: el costo de las operaciones que agrega una petición (middleware y
+  etapas) frente a la latencia media de la petición;
+- extremo a extremo: la latencia media con EVENTIA_METRICAS=1 y =0, en
+  subprocesos alternados para repartir el ruido. En máquinas compartidas la
+  dispersión entre rondas suele superar el costo medido; la medición directa es
+  la referencia.
+
+    python benchmarks/bench_metricas.py [--peticiones 2000] [--rondas 3]
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+
+os.environ.setdefault("EVENTIA_CACHE_TAMANO", "0")
+
+from _comun import EVENTO_EJEMPLO, carga_asgi, importar_main  # noqa: E402
+
+FORMULARIO = dict(EVENTO_EJEMPLO, artista_nombre=EVENTO_EJEMPLO["artista"], fecha="2025-06-14")
+
+
+async def peticion(cliente):
+    return await cliente.post("/predecir", data=FORMULARIO)
+
+
+def latencia_media_ms(main, n):
+    r = carga_asgi(main.app, peticion, n, concurrencia=1)
+    return 1000 / r["req_s"]
+
+
+def costo_instrumentacion_us(main, repeticiones=20_000):
+    """Microsegundos de las observaciones que hace una petición a /predecir."""
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        for nombre in ("features", "dataframe", "cache", "render"):
+            with main.etapa(nombre):
+                pass
+        main.FILAS_POR_LOTE.observar(5)
+        with main.ETAPAS.medir("predict"):
+            pass
+        main.PETICIONES.inc("POST", "/predecir", 200)
+        main.LATENCIA_PETICIONES.observar(0.01, "POST", "/predecir")
+    return (time.perf_counter() - inicio) / repeticiones * 1e6
+
+
+def costo_middleware_us(main, repeticiones=20_000):
+    """Microsegundos que agrega ``MiddlewareMetricas`` a una app ASGI que no hace nada."""
+
+    async def app_vacia(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200})
+
+    async def enviar(mensaje):
+        pass
+
+    envuelta = main.MiddlewareMetricas(app_vacia, main.PETICIONES, main.LATENCIA_PETICIONES)
+    scope = {"type": "http", "method": "GET"}
+
+    async def medir(app):
+        inicio = time.perf_counter()
+        for _ in range(repeticiones):
+            await app(scope, None, enviar)
+        return time.perf_counter() - inicio
+
+    return (asyncio.run(medir(envuelta)) - asyncio.run(medir(app_vacia))) / repeticiones * 1e6
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--peticiones", type=int, default=2000)
+    parser.add_argument("--rondas", type=int, default=3)
+    parser.add_argument("--solo-latencia", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.solo_latencia:
+        main = importar_main()
+        latencia_media_ms(main, 200)
+        print(json.dumps(latencia_media_ms(main, args.peticiones)))
+        sys.exit()
+
+    main = importar_main()
+    latencia = latencia_media_ms(main, args.peticiones)
+    costo = costo_instrumentacion_us(main) + costo_middleware_us(main)
+    print(f"directo: {costo:.1f} µs por petición sobre {latencia:.2f} ms ({costo / 10 / latencia:.2f} %)")
+
+    medias = {"1": [], "0": []}
+    for _ in range(args.rondas):
+        for valor in ("1", "0"):
+            salida = subprocess.run(
+                [sys.executable, __file__, "--solo-latencia", "--peticiones", str(args.peticiones)],
+                env={**os.environ, "EVENTIA_METRICAS": valor, "PYTHONWARNINGS": "ignore"},
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout
+            medias[valor].append(json.loads(salida.strip().splitlines()[-1]))
+    con, sin = min(medias["1"]), min(medias["0"])
+    dispersion = (max(medias["0"]) / sin - 1) * 100
+    print(
+        f"extremo a extremo (mejor de {args.rondas}): con métricas {con:.3f} ms | sin {sin:.3f} ms "
+        f"({(con / sin - 1) * 100:+.2f} %; dispersión entre rondas sin métricas {dispersion:.1f} %)"
+    )
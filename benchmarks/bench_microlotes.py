@@ -0,0 +1,59 @@
+"""Curvas throughput/latencia de /api/v1/predict con y sin microlotes.
+
+Para cada configuración (sin microlotes y varias combinaciones de filas máximas y
+espera máxima) y cada nivel de concurrencia, lanza peticiones con fechas distintas
+(sin caché) y reporta req/s, p50 y p99. Usa el ejecutor de inferencia de producción
+(EVENTIA_INFERENCIA_HILOS hilos): las peticiones que esperan su microlote no ocupan
+sus hilos, así que su tamaño no acota cuántas coinciden en un lote:
+
+    python benchmarks/bench_microlotes.py [--peticiones 400]
+"""
+import argparse
+import os
+
+os.environ.setdefault("EVENTIA_CACHE_TAMANO", "0")
+
+from _comun import EVENTO_EJEMPLO, carga_asgi, importar_main  # noqa: E402
+
+main = importar_main()
+
+CONFIGURACIONES = [None, (64, 1), (64, 2), (256, 5)]
+
+
+def peticion_aleatoria():
+    contador = iter(range(10**9))
+
+    async def peticion(cliente):
+        dia = next(contador) % 3000
+        evento = dict(EVENTO_EJEMPLO, artista_nombre=EVENTO_EJEMPLO["artista"])
+        evento["fecha"] = str(main.CALENDARIO.inicio + dia)
+        return await cliente.post("/api/v1/predict", json=evento)
+
+    return peticion
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--peticiones", type=int, default=400)
+    parser.add_argument("--concurrencias", type=int, nargs="+", default=[1, 4, 16, 64])
+    args = parser.parse_args()
+
+    print(f"ejecutor: {main.EJECUTOR.trabajadores} hilos, cola {main.EJECUTOR.max_cola}")
+    print(f"{'configuración':>22} | {'conc.':>5} | {'req/s':>7} | {'p50 ms':>7} | {'p99 ms':>7} | {'filas/lote':>10}")
+    for configuracion in CONFIGURACIONES:
+        if configuracion is None:
+            main.PLANIFICADOR, nombre = None, "por petición"
+        else:
+            filas, espera_ms = configuracion
+            nombre = f"microlotes {filas}f/{espera_ms}ms"
+        for concurrencia in args.concurrencias:
+            if configuracion is not None:
+                main.PLANIFICADOR = main.PlanificadorMicrolotes(
+                    main.predecir_modelo, filas, espera_ms / 1000, hilos=max(1, main.INFERENCIA_PROCESOS)
+                )
+            r = carga_asgi(main.app, peticion_aleatoria(), args.peticiones, concurrencia)
+            por_lote = main.PLANIFICADOR.metricas()["filas_por_lote"] if main.PLANIFICADOR else 5.0
+            print(
+                f"{nombre:>22} | {concurrencia:>5} | {r['req_s']:>7.0f} | {r['p50_ms']:>7.1f} | "
+                f"{r['p99_ms']:>7.1f} | {por_lote:>10.1f}"
+            )
@@ -0,0 +1,58 @@
+"""Optimización de precios: búsqueda refinada frente a grilla exhaustiva.
+
+Para varias grillas (pasos por eje x número de funciones) mide la latencia de
+/api/v1/optimize/prices en ambos modos, las celdas evaluadas y cuánto se aleja
+el óptimo refinado del exhaustivo:
+
+    python benchmarks/bench_precios.py
+"""
+import asyncio
+import time
+
+import httpx
+
+from _comun import EVENTO_EJEMPLO, importar_main
+
+main = importar_main()
+EVENTO = dict(EVENTO_EJEMPLO, artista_nombre=EVENTO_EJEMPLO["artista"], fecha="2025-06-14")
+GRILLAS = [(21, [1]), (41, [1]), (41, [1, 2, 3, 4]), (81, [1, 2, 3, 4])]
+
+
+async def _post(cuerpo):
+    transporte = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transporte, base_url="http://bench") as cliente:
+        respuesta = await cliente.post("/api/v1/optimize/prices", json=cuerpo)
+    assert respuesta.status_code == 200, respuesta.text
+    return respuesta.json()
+
+
+def optimizar(pasos, funciones, refinar, repeticiones=3):
+    cuerpo = dict(
+        EVENTO,
+        precio_minimo_desde=20_000,
+        precio_minimo_hasta=300_000,
+        precio_maximo_desde=50_000,
+        precio_maximo_hasta=900_000,
+        pasos=pasos,
+        numero_funciones=funciones,
+        refinar=refinar,
+    )
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = asyncio.run(_post(cuerpo))
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return resultado, sorted(tiempos)[len(tiempos) // 2]
+
+
+if __name__ == "__main__":
+    print(f"{'grilla':>14} | {'modo':>10} | {'celdas':>13} | {'ms':>7} | {'ingresos':>14} | {'vs. exhaustivo':>14}")
+    for pasos, funciones in GRILLAS:
+        exhaustivo, ms_exhaustivo = optimizar(pasos, funciones, refinar=False)
+        refinado, ms_refinado = optimizar(pasos, funciones, refinar=True)
+        nombre = f"{pasos}x{pasos}x{len(funciones)}"
+        optimo = exhaustivo["mejor"]["ingresos_estimados"]
+        for modo, resultado, ms in [("exhaustivo", exhaustivo, ms_exhaustivo), ("refinado", refinado, ms_refinado)]:
+            celdas = f"{resultado['celdas_evaluadas']}/{resultado['celdas_validas']}"
+            ingresos = resultado["mejor"]["ingresos_estimados"]
+            print(f"{nombre:>14} | {modo:>10} | {celdas:>13} | {ms:>7.0f} | {ingresos:>14,} | {ingresos / optimo:>13.2%}")
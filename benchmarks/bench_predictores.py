@@ -0,0 +1,89 @@
+"""Paridad y rendimiento de los backends de inferencia (pipeline vs. compilado).
+
+Verifica sobre una grilla generada de entradas (incluyendo categorías que el
+modelo no vio) que el backend compilado reproduce al pipeline de referencia, y
+mide latencia y throughput para lotes de 1 a 100k filas (la paridad la cubre
+también ``tests/test_predictores.py``):
+
+    python benchmarks/bench_predictores.py [--estimador gb|xgb]
+"""
+import argparse
+import itertools
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from _comun import RAIZ
+from modelo_sustituto import ARTISTAS, CATEGORIAS, GENEROS, LUGARES, TIPOS, construir_modelo, generar_datos
+
+sys.path.insert(0, str(RAIZ))
+from features_temporales import calcular_features_temporales_vector  # noqa: E402
+from predictores import PredictorCompilado, PredictorPipeline  # noqa: E402
+
+
+def grilla_paridad():
+    """Producto cartesiano de lugares, artistas, géneros, tipos, categorías, fechas y precios."""
+    lugares = LUGARES + [("Amazonas", "Leticia", "1")]
+    artistas = ARTISTAS[:3] + ["Artista desconocido"]
+    generos = GENEROS[:3] + ["Cumbia"]
+    fechas = np.arange(np.datetime64("2024-12-27"), np.datetime64("2025-01-06"))
+    precios = [(0.0, 0.0), (50_000.0, 150_000.0), (250_000.0, 900_000.0)]
+    combinaciones = list(itertools.product(lugares, artistas, generos, TIPOS, CATEGORIAS[:2], range(len(fechas)), precios))
+    temporales = calcular_features_temporales_vector(fechas[[c[5] for c in combinaciones]])
+    return pd.DataFrame({
+        "Departamento": [c[0][0] for c in combinaciones],
+        "Municipio": [c[0][1] for c in combinaciones],
+        "DiaSemana": temporales["dia_semana"],
+        "CategoriaFunciones": [c[4] for c in combinaciones],
+        "EsCapital": [c[0][2] for c in combinaciones],
+        "artista": [c[1] for c in combinaciones],
+        "genero": [c[2] for c in combinaciones],
+        "tipo": [c[3] for c in combinaciones],
+        "Año": temporales["anio"],
+        "SemanaDelAño_sin": temporales["semana_sin"],
+        "SemanaDelAño_cos": temporales["semana_cos"],
+        "DiaDelAño_sin": temporales["dia_sin"],
+        "DiaDelAño_cos": temporales["dia_cos"],
+        "NumeroFunciones": 2,
+        "PrecioMinimo": [c[6][0] for c in combinaciones],
+        "PrecioMaximo": [c[6][1] for c in combinaciones],
+        "cantidad_artistas_evento": 3,
+    })
+
+
+def medir(predictor, datos, repeticiones):
+    predictor.predict(datos)
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        predictor.predict(datos)
+        tiempos.append(time.perf_counter() - inicio)
+    return float(np.median(tiempos))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--estimador", choices=["gb", "xgb"], default="gb")
+    parser.add_argument("--tolerancia", type=float, default=1e-6)
+    args = parser.parse_args()
+
+    modelo = construir_modelo(estimador=args.estimador)
+    referencia = PredictorPipeline(modelo)
+    compilado = PredictorCompilado(modelo)
+
+    grilla = grilla_paridad()
+    esperado = referencia.predict(grilla)
+    obtenido = compilado.predict(grilla)
+    error = np.max(np.abs(obtenido - esperado) / np.maximum(np.abs(esperado), 1))
+    assert error <= args.tolerancia, f"error relativo máximo {error:.2e} > {args.tolerancia:.0e}"
+    print(f"✅ Paridad en {len(grilla)} filas (error relativo máximo {error:.1e})")
+
+    print(f"{'filas':>7} | {'pipeline (ms)':>13} | {'compilado (ms)':>14} | {'filas/s compilado':>17} | {'aceleración':>11}")
+    for n in [1, 10, 100, 1_000, 10_000, 100_000]:
+        datos, _ = generar_datos(n, semilla=2)
+        repeticiones = max(3, min(200, 20_000 // n))
+        t_ref = medir(referencia, datos, repeticiones)
+        t_comp = medir(compilado, datos, repeticiones)
+        print(f"{n:>7} | {t_ref * 1000:>13.2f} | {t_comp * 1000:>14.2f} | {n / t_comp:>17,.0f} | {t_ref / t_comp:>10.1f}x")
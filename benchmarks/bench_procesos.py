@@ -0,0 +1,80 @@
+"""Escalamiento de la inferencia en procesos trabajadores frente a hilos en proceso.
+
+Con el modelo sustituto guardado en disco, lanza tantos hilos clientes como
+trabajadores y mide filas/s durante unos segundos, primero con el backend
+compilado en el propio proceso (los hilos comparten el GIL) y luego con
+``PredictorProcesos`` para 1..N procesos. Verifica además que las predicciones
+coinciden exactamente:
+
+    python benchmarks/bench_procesos.py [--procesos 1 2 4 8] [--filas 500] [--estimador gb|xgb]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import joblib
+import numpy as np
+
+from _comun import RAIZ
+from modelo_sustituto import construir_modelo, generar_datos
+
+sys.path.insert(0, str(RAIZ))
+from pool_procesos import PredictorProcesos  # noqa: E402
+from predictores import PredictorCompilado  # noqa: E402
+
+
+def filas_por_segundo(predictor, lotes, hilos, segundos):
+    filas = [0] * hilos
+    fin = time.perf_counter() + segundos
+
+    def cliente(i):
+        j = i
+        while time.perf_counter() < fin:
+            lote = lotes[j % len(lotes)]
+            predictor.predict(lote)
+            filas[i] += len(lote)
+            j += hilos
+
+    trabajadores = [threading.Thread(target=cliente, args=(i,)) for i in range(hilos)]
+    inicio = time.perf_counter()
+    for t in trabajadores:
+        t.start()
+    for t in trabajadores:
+        t.join()
+    return sum(filas) / (time.perf_counter() - inicio)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--procesos", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--filas", type=int, default=500, help="filas por llamada a predict")
+    parser.add_argument("--segundos", type=float, default=3.0)
+    parser.add_argument("--estimador", choices=["gb", "xgb"], default="gb")
+    args = parser.parse_args()
+
+    ruta = Path(tempfile.gettempdir()) / f"eventia_modelo_procesos_{args.estimador}.pkl"
+    joblib.dump(construir_modelo(estimador=args.estimador), ruta)
+    compilado = PredictorCompilado(joblib.load(ruta))
+    datos, _ = generar_datos(args.filas * 16, semilla=1)
+    lotes = [datos.iloc[i:i + args.filas].reset_index(drop=True) for i in range(0, len(datos), args.filas)]
+    referencia = compilado.predict(datos)
+
+    print(f"CPUs disponibles: {os.cpu_count()}, {args.filas} filas por llamada")
+    print(f"{'configuración':>16} | {'hilos':>5} | {'filas/s':>10} | {'vs. 1 hilo':>10}")
+    base = None
+    for n in args.procesos:
+        r = filas_por_segundo(compilado, lotes, n, args.segundos)
+        base = base or r
+        print(f"{'en proceso':>16} | {n:>5} | {r:>10.0f} | {r / base:>9.2f}x")
+    for n in args.procesos:
+        inicio = time.perf_counter()
+        en_procesos = PredictorProcesos(compilado, ruta, n)
+        arranque = time.perf_counter() - inicio
+        np.testing.assert_array_equal(en_procesos.predict(datos), referencia)
+        r = filas_por_segundo(en_procesos, lotes, n, args.segundos)
+        print(f"{f'{n} procesos':>16} | {n:>5} | {r:>10.0f} | {r / base:>9.2f}x   (arranque {arranque:.1f} s)")
+        en_procesos.cerrar()
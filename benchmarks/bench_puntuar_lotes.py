@@ -0,0 +1,78 @@
+"""Puntuación masiva: paridad con /predecir, filas/s y memoria pico según el tamaño.
+
+Genera catálogos CSV sintéticos, los puntúa con ``puntuar_lotes.py`` en un
+subproceso (que reporta su RSS máximo; con varios procesos es el del
+proceso que lee y escribe) y verifica una muestra contra
+``main.predictor`` fila a fila (con ``main.ubicar``, como /predecir):
+
+    python benchmarks/bench_puntuar_lotes.py [--filas 100000 1000000] [--procesos 1 2]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from _comun import RAIZ, RUTA_SUSTITUTO, importar_main
+from modelo_sustituto import generar_datos
+
+main = importar_main()
+from features_temporales import calcular_features_temporales_vector  # noqa: E402
+
+DIRECTORIO = Path(tempfile.gettempdir())
+
+
+def generar_catalogo(ruta, n, tramo=200_000):
+    """Escribe un catálogo de ``n`` eventos por partes, sin tenerlo entero en memoria."""
+    for parte, desde in enumerate(range(0, n, tramo)):
+        datos, _ = generar_datos(min(tramo, n - desde), semilla=parte)
+        dias = np.random.default_rng(parte).integers(0, 365 * 6, len(datos))
+        catalogo = datos[[
+            "Departamento", "Municipio", "EsCapital", "CategoriaFunciones", "artista", "genero", "tipo",
+            "NumeroFunciones", "PrecioMinimo", "PrecioMaximo", "cantidad_artistas_evento",
+        ]].rename(columns={"artista": "artista_nombre"})
+        catalogo.insert(0, "fecha", (np.datetime64("2022-01-01") + dias).astype(str))
+        catalogo.to_csv(ruta, mode="w" if parte == 0 else "a", header=parte == 0, index=False)
+
+
+def verificar(entrada, salida, muestras=200):
+    catalogo = pd.read_csv(entrada, nrows=muestras, dtype={"EsCapital": str})
+    resultado = pd.read_parquet(salida).head(muestras)
+    for i, fila in catalogo.iterrows():
+        evento = dict(fila.drop(["fecha", "artista_nombre"]), artista=fila["artista_nombre"])
+        # Como /predecir: nombres canónicos y EsCapital derivado, sin importar el de la entrada
+        evento["Departamento"], evento["Municipio"], evento["EsCapital"] = main.ubicar(
+            fila["Departamento"], fila["Municipio"]
+        )
+        datos = main.construir_datos_modelo(evento, calcular_features_temporales_vector(
+            np.array([fila["fecha"]], dtype="datetime64[D]")
+        ))
+        assert np.isclose(resultado["prediccion"][i], main.predictor.predict(datos)[0], rtol=1e-9), i
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--filas", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--procesos", type=int, nargs="+", default=[1, 2])
+    args = parser.parse_args()
+
+    for n in args.filas:
+        entrada = DIRECTORIO / f"eventia_catalogo_{n}.csv"
+        salida = DIRECTORIO / f"eventia_catalogo_{n}.parquet"
+        if not entrada.exists():
+            generar_catalogo(entrada, n)
+        for procesos in args.procesos:
+            proceso = subprocess.run(
+                [sys.executable, str(RAIZ / "puntuar_lotes.py"), str(entrada), str(salida), "--procesos", str(procesos)],
+                env={**os.environ, "EVENTIA_MODEL_PATH": str(RUTA_SUSTITUTO), "PYTHONWARNINGS": "ignore"},
+                capture_output=True,
+                text=True,
+            )
+            assert proceso.returncode == 0, proceso.stderr
+            resumen = [linea for linea in proceso.stderr.splitlines() if linea.startswith("✅") and "filas" in linea][-1]
+            print(f"{n:>9,} filas, {procesos} proceso(s): {resumen[2:]}")
+        verificar(entrada, salida)
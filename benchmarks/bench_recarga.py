@@ -0,0 +1,124 @@
+"""Recarga en caliente del modelo bajo carga.
+
+Mientras varios clientes llaman a /api/v1/predict, recarga el modelo con
+``POST /admin/modelo/recargar`` (un artefacto distinto que da predicciones
+distintas) y después revierte. Verifica que ninguna petición falla, que cada
+una termina con la versión con la que empezó (su predicción es la de la
+versión vieja o la de la nueva, nunca una mezcla) y mide cuánto tarda en
+publicarse la versión nueva y en revertir:
+
+    python benchmarks/bench_recarga.py [--concurrencia 8]
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import joblib
+
+os.environ.setdefault("EVENTIA_ADMIN_TOKEN", "bench")
+
+from _comun import EVENTO_EJEMPLO, importar_main
+
+main = importar_main()
+CABECERAS = {"Authorization": f"Bearer {os.environ['EVENTIA_ADMIN_TOKEN']}"}
+PARAMETROS = dict(EVENTO_EJEMPLO, artista="Concierto", artista_nombre=EVENTO_EJEMPLO["artista"], fecha="2026-03-14")
+
+
+def artefacto_alternativo():
+    """Modelo sustituto entrenado con otra semilla (otras predicciones)."""
+    from modelo_sustituto import construir_modelo
+
+    ruta = Path(tempfile.gettempdir()) / "eventia_modelo_sustituto_b.pkl"
+    if not ruta.exists():
+        joblib.dump(construir_modelo(semilla=1), ruta)
+    return ruta
+
+
+async def escenario(concurrencia):
+    import httpx
+
+    ruta_b = artefacto_alternativo()
+    transporte = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transporte, base_url="http://bench") as cliente:
+        async def predecir():
+            resp = await cliente.post("/api/v1/predict", json=PARAMETROS)
+            if resp.status_code != 200:
+                return resp.status_code, resp.text
+            return 200, tuple(p["prediccion"] for p in resp.json()["predicciones"])
+
+        _, inicial = await predecir()
+        resultados, activo = [], True
+
+        async def trabajador():
+            while activo:
+                resultados.append(await predecir())
+                # Con la caché caliente una petición puede no ceder el bucle de eventos
+                await asyncio.sleep(0)
+
+        async def esperar_recarga():
+            while True:
+                estado = (await cliente.get("/admin/modelo", headers=CABECERAS)).json()
+                if estado["recarga"]["estado"] != "en_curso":
+                    return estado
+                await asyncio.sleep(0.005)
+
+        trabajadores = [asyncio.create_task(trabajador()) for _ in range(concurrencia)]
+        await asyncio.sleep(0.3)
+        inicio = time.perf_counter()
+        resp = await cliente.post("/admin/modelo/recargar", json={"archivo": ruta_b.name}, headers=CABECERAS)
+        assert resp.status_code == 202, resp.text
+        otra = await cliente.post("/admin/modelo/recargar", json={"archivo": ruta_b.name}, headers=CABECERAS)
+        estado = await esperar_recarga()
+        publicada = time.perf_counter() - inicio
+        assert estado["recarga"]["estado"] == "publicada", estado
+        await asyncio.sleep(0.3)
+        _, nueva = await predecir()
+
+        inicio = time.perf_counter()
+        resp = await cliente.post("/admin/modelo/revertir", headers=CABECERAS)
+        revertida = time.perf_counter() - inicio
+        assert resp.status_code == 200, resp.text
+        await asyncio.sleep(0.3)
+        activo = False
+        await asyncio.gather(*trabajadores)
+        _, final = await predecir()
+
+        estados = {
+            "sin token": (await cliente.get("/admin/modelo")).status_code,
+            "recarga duplicada": otra.status_code,
+        }
+        for caso, solicitud in [
+            ("archivo inexistente", {"archivo": "no_existe.pkl"}),
+            ("ruta absoluta", {"archivo": str(ruta_b)}),
+            ("fuera del directorio", {"archivo": "../etc/passwd"}),
+            ("url local", {"url": "file:///etc/passwd"}),
+        ]:
+            resp = await cliente.post("/admin/modelo/recargar", json=solicitud, headers=CABECERAS)
+            estados[caso] = resp.status_code
+        estados["versión inexistente"] = (
+            await cliente.post("/admin/modelo/revertir", json={"numero": 99}, headers=CABECERAS)
+        ).status_code
+    return inicial, nueva, final, resultados, publicada, revertida, estados
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrencia", type=int, default=8)
+    args = parser.parse_args()
+
+    inicial, nueva, final, resultados, publicada, revertida, estados = asyncio.run(escenario(args.concurrencia))
+    fallidas = [r for r in resultados if r[0] != 200]
+    mezcladas = [r for r in resultados if r[0] == 200 and r[1] not in (inicial, nueva)]
+    por_version = {"vieja": sum(r[1] == inicial for r in resultados), "nueva": sum(r[1] == nueva for r in resultados)}
+    assert inicial != nueva and final == inicial, (inicial, nueva, final)
+    assert not fallidas and not mezcladas, (fallidas[:3], mezcladas[:3])
+    assert estados == {
+        "sin token": 401, "recarga duplicada": 409, "archivo inexistente": 422, "ruta absoluta": 422,
+        "fuera del directorio": 422, "url local": 422, "versión inexistente": 409,
+    }, estados
+    print(f"✅ {len(resultados)} peticiones durante la recarga, 0 fallidas, cada una con una sola versión {por_version}")
+    print(f"✅ Respuestas de administración: {estados}")
+    print(f"recarga (carga + calentamiento + publicación): {publicada * 1000:.0f} ms | reversión: {revertida * 1000:.2f} ms")
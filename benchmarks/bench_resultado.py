@@ -0,0 +1,62 @@
+"""Bytes y tiempo de servidor de la página de resultados de /predecir.
+
+Reporta el tamaño de la respuesta (sin y con gzip), el de los recursos estáticos
+que el navegador descarga una sola vez, el tiempo de renderizado de la plantilla y
+las peticiones por segundo de POST /predecir en proceso:
+
+    python benchmarks/bench_resultado.py
+"""
+import gzip
+import re
+import time
+
+from fastapi.testclient import TestClient
+
+from _comun import carga_asgi, importar_main
+
+main = importar_main()
+
+FORMULARIO = {
+    "fecha": "2025-06-14",
+    "Departamento": "Antioquia",
+    "Municipio": "Medellín",
+    "EsCapital": "1",
+    "artista": "Concierto",
+    "artista_nombre": "Karol G",
+    "genero": "Reggaeton",
+    "tipo": "Nacional",
+    "CategoriaFunciones": "Unica",
+    "NumeroFunciones": "1",
+    "PrecioMinimo": "120000",
+    "PrecioMaximo": "450000",
+    "cantidad_artistas_evento": "2",
+}
+
+
+async def post_predecir(cliente):
+    return await cliente.post("/predecir", data=FORMULARIO)
+
+
+if __name__ == "__main__":
+    cliente = TestClient(main.app)
+    pagina = cliente.post("/predecir", data=FORMULARIO).content
+    print(f"Respuesta /predecir: {len(pagina) / 1024:.1f} KB ({len(gzip.compress(pagina)) / 1024:.1f} KB con gzip)")
+    for url in re.findall(rb'(?:href|src)="(/static/[^"]+)"', pagina):
+        recurso = cliente.get(url.decode())
+        print(f"  recurso {url.decode()}: {len(recurso.content) / 1024:.1f} KB, {recurso.headers['cache-control']}")
+
+    contexto = dict(
+        FORMULARIO, NumeroFunciones=1, PrecioMinimo=120000.0, PrecioMaximo=450000.0,
+        departamentos=main.DEPARTAMENTOS_ORDENADOS, municipios=main.DEPARTAMENTOS_MUNICIPIOS["Antioquia"],
+        promedio=9000.0, max_pred=9500.0, min_pred=8200.0, fecha_max="15 Jun", fecha_min="16 Jun",
+        ingresos_estimados=2_500_000_000,
+        barras=[{"valor": 9000, "altura": 65.0, "color": "#b39ddb", "dia_semana": "Sábado", "fecha_corta": "14 Jun"}] * 5,
+    )
+    repeticiones = 2000
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        main.PLANTILLA_RESULTADO.render(**contexto)
+    print(f"Renderizado de la plantilla: {(time.perf_counter() - inicio) / repeticiones * 1e6:.0f} µs")
+
+    r = carga_asgi(main.app, post_predecir, n=500, concurrencia=1)
+    print(f"POST /predecir: {r['req_s']:.0f} req/s | p50 {r['p50_ms']:.2f} ms | p99 {r['p99_ms']:.2f} ms")
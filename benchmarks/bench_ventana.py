@@ -0,0 +1,57 @@
+"""Compara la predicción fila a fila de la ventana de ±2 días con la predicción en lote.
+
+    python benchmarks/bench_ventana.py
+"""
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from _comun import EVENTO_EJEMPLO, importar_main, medir
+
+main = importar_main()
+from features_temporales import calcular_features_temporales  # noqa: E402
+
+FECHA = "2025-06-14"
+
+
+def ventana_fila_a_fila():
+    fecha_base = datetime.strptime(FECHA, "%Y-%m-%d")
+    preds = []
+    for i in main.DESPLAZAMIENTOS_VENTANA:
+        features = calcular_features_temporales((fecha_base + timedelta(days=i)).strftime("%Y-%m-%d"))
+        datos = pd.DataFrame([{
+            "Departamento": EVENTO_EJEMPLO["Departamento"],
+            "Municipio": EVENTO_EJEMPLO["Municipio"],
+            "DiaSemana": features["dia_semana"],
+            "CategoriaFunciones": EVENTO_EJEMPLO["CategoriaFunciones"],
+            "EsCapital": EVENTO_EJEMPLO["EsCapital"],
+            "artista": EVENTO_EJEMPLO["artista"],
+            "genero": EVENTO_EJEMPLO["genero"],
+            "tipo": EVENTO_EJEMPLO["tipo"],
+            "Año": features["anio"],
+            "SemanaDelAño_sin": features["semana_sin"],
+            "SemanaDelAño_cos": features["semana_cos"],
+            "DiaDelAño_sin": features["dia_sin"],
+            "DiaDelAño_cos": features["dia_cos"],
+            "NumeroFunciones": EVENTO_EJEMPLO["NumeroFunciones"],
+            "PrecioMinimo": EVENTO_EJEMPLO["PrecioMinimo"],
+            "PrecioMaximo": EVENTO_EJEMPLO["PrecioMaximo"],
+            "cantidad_artistas_evento": EVENTO_EJEMPLO["cantidad_artistas_evento"],
+        }])
+        preds.append(float(main.modelo.predict(datos)[0]))
+    return np.array(preds)
+
+
+def ventana_en_lote():
+    fecha_base = datetime.strptime(FECHA, "%Y-%m-%d")
+    fechas = [(fecha_base + timedelta(days=i)).strftime("%Y-%m-%d") for i in main.DESPLAZAMIENTOS_VENTANA]
+    datos = main.construir_datos_modelo(EVENTO_EJEMPLO, main.CALENDARIO.consultar(fechas))
+    return np.asarray(main.modelo.predict(datos), dtype=float)
+
+
+if __name__ == "__main__":
+    assert np.array_equal(ventana_fila_a_fila(), ventana_en_lote()), "las predicciones no coinciden"
+    for nombre, funcion in [("fila a fila", ventana_fila_a_fila), ("en lote", ventana_en_lote)]:
+        mediana, p95 = medir(funcion)
+        print(f"{nombre:>12}: mediana {mediana:.2f} ms | p95 {p95:.2f} ms")
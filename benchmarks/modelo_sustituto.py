@@ -0,0 +1,96 @@
+"""Genera un modelo sustituto con el mismo esquema de entrada que el modelo real.
+
+Sirve para ejecutar los benchmarks sin descargar el artefacto de Google Drive:
+
+    python benchmarks/modelo_sustituto.py /tmp/modelo_sustituto.pkl [gb|xgb]
+"""
+import sys
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.compose import ColumnTransformer
+from sklearn.ensemble import GradientBoostingRegressor
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder
+
+COLUMNAS_CATEGORICAS = [
+    "Departamento", "Municipio", "CategoriaFunciones", "EsCapital", "artista", "genero", "tipo",
+]
+
+LUGARES = [
+    ("Antioquia", "Medellín", "1"), ("Antioquia", "Envigado", "0"),
+    ("Cundinamarca", "Bogotá", "1"), ("Cundinamarca", "Chía", "0"),
+    ("Valle del Cauca", "Cali", "1"), ("Valle del Cauca", "Palmira", "0"),
+    ("Atlántico", "Barranquilla", "1"), ("Santander", "Bucaramanga", "1"),
+]
+ARTISTAS = ["Guns N' Roses", "Karol G", "Carlos Vives", "Shakira", "Metallica", "J Balvin"]
+GENEROS = ["Rock", "Reggaeton", "Vallenato", "Pop", "Metal", "Salsa"]
+TIPOS = ["Mixto", "Nacional", "Internacional"]
+CATEGORIAS = ["Unica", "Pocas", "Varias", "Muchas"]
+
+
+def generar_datos(n=5000, semilla=0):
+    rng = np.random.default_rng(semilla)
+    lugares = [LUGARES[i] for i in rng.integers(0, len(LUGARES), n)]
+    fechas = pd.Timestamp("2020-01-01") + pd.to_timedelta(rng.integers(0, 365 * 8, n), unit="D")
+    semana = fechas.isocalendar().week.to_numpy(dtype=float)
+    dia = fechas.dayofyear.to_numpy(dtype=float)
+    precio_min = rng.integers(20, 300, n) * 1000.0
+    datos = pd.DataFrame({
+        "Departamento": [l[0] for l in lugares],
+        "Municipio": [l[1] for l in lugares],
+        "DiaSemana": fechas.dayofweek.to_numpy(),
+        "CategoriaFunciones": rng.choice(CATEGORIAS, n),
+        "EsCapital": [l[2] for l in lugares],
+        "artista": rng.choice(ARTISTAS, n),
+        "genero": rng.choice(GENEROS, n),
+        "tipo": rng.choice(TIPOS, n),
+        "Año": fechas.year.to_numpy(),
+        "SemanaDelAño_sin": np.sin(2 * np.pi * semana / 52),
+        "SemanaDelAño_cos": np.cos(2 * np.pi * semana / 52),
+        "DiaDelAño_sin": np.sin(2 * np.pi * dia / 365),
+        "DiaDelAño_cos": np.cos(2 * np.pi * dia / 365),
+        "NumeroFunciones": rng.integers(1, 6, n),
+        "PrecioMinimo": precio_min,
+        "PrecioMaximo": precio_min + rng.integers(0, 800, n) * 1000.0,
+        "cantidad_artistas_evento": rng.integers(1, 8, n),
+    })
+    asistentes = (
+        3000
+        + 4000 * (datos["EsCapital"] == "1")
+        + 1500 * (datos["DiaSemana"] >= 4)
+        + 800 * datos["NumeroFunciones"]
+        - 0.01 * datos["PrecioMinimo"]
+        + 600 * datos["cantidad_artistas_evento"]
+        + rng.normal(0, 500, n)
+    )
+    return datos, asistentes.to_numpy()
+
+
+def construir_modelo(n=5000, semilla=0, arboles=200, profundidad=4, estimador="gb"):
+    """Pipeline (OneHotEncoder + árboles) entrenado con datos sintéticos.
+
+    ``estimador`` es ``"gb"`` (GradientBoostingRegressor) o ``"xgb"`` (XGBRegressor).
+    """
+    datos, asistentes = generar_datos(n, semilla)
+    preprocesamiento = ColumnTransformer(
+        [("categoricas", OneHotEncoder(handle_unknown="ignore"), COLUMNAS_CATEGORICAS)],
+        remainder="passthrough",
+    )
+    if estimador == "xgb":
+        from xgboost import XGBRegressor
+
+        regresor = XGBRegressor(n_estimators=arboles, max_depth=profundidad, random_state=semilla)
+    else:
+        regresor = GradientBoostingRegressor(n_estimators=arboles, max_depth=profundidad, random_state=semilla)
+    modelo = Pipeline([("preprocesamiento", preprocesamiento), ("regresor", regresor)])
+    modelo.fit(datos, asistentes)
+    return modelo
+
+
+if __name__ == "__main__":
+    destino = sys.argv[1] if len(sys.argv) > 1 else "modelo_sustituto.pkl"
+    estimador = sys.argv[2] if len(sys.argv) > 2 else "gb"
+    joblib.dump(construir_modelo(estimador=estimador), destino)
+    print(f"✅ Modelo sustituto guardado en {destino}")
@@ -0,0 +1,162 @@
+"""Suite reproducible de benchmarks del camino de servicio, con salida JSON.
+
+Corre contra el modelo sustituto de ``modelo_sustituto.py`` (mismo esquema de
+entrada que el modelo real; se genera con semilla fija si no existe), con la
+caché de predicciones desactivada para que cada petición llegue al modelo:
+
+- micro: features temporales, armado del DataFrame, predict de una fila frente a
+  lotes (pipeline de sklearn y backend activo) y renderizado de la página de
+  resultados;
+- carga: prueba de carga ASGI en proceso de GET /, POST /predecir y
+  POST /api/v1/predict a varios niveles de concurrencia (req/s, p50/p95/p99).
+
+    python benchmarks/suite.py [--salida resultados.json] [--rapido]
+    python benchmarks/suite.py --comparar base.json nuevo.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+os.environ.setdefault("EVENTIA_CACHE_TAMANO", "0")
+
+from _comun import EVENTO_EJEMPLO, RAIZ, carga_asgi, medir  # noqa: E402
+
+FORMULARIO = dict(EVENTO_EJEMPLO, artista="Concierto", artista_nombre=EVENTO_EJEMPLO["artista"], fecha="2025-06-14")
+CONCURRENCIAS = [1, 8, 32]
+
+
+def metadatos():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=RAIZ, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        cambios = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], cwd=RAIZ, capture_output=True, text=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit, cambios = None, ""
+    import numpy
+    import pandas
+    import sklearn
+
+    return {
+        "commit": commit,
+        "cambios_sin_commit": bool(cambios),
+        "fecha": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "cpus": os.cpu_count(),
+        "numpy": numpy.__version__,
+        "pandas": pandas.__version__,
+        "sklearn": sklearn.__version__,
+    }
+
+
+def micro(main, repeticiones):
+    import numpy as np
+
+    from features_temporales import calcular_features_temporales, calcular_features_temporales_vector
+
+    evento = main.EVENTO_CALENTAMIENTO
+    ventana = main.CALENDARIO.rango("2025-06-12", 5)
+    fechas_anio = np.arange(np.datetime64("2025-01-01"), np.datetime64("2026-01-01"))
+    una_fila = main.construir_datos_modelo(evento, main.CALENDARIO.rango("2025-06-14", 1))
+    lotes = {n: main.construir_datos_modelo(evento, main.CALENDARIO.consultar(fechas_anio[np.arange(n) % 365])) for n in (5, 1000)}
+    casos = {
+        "features.escalar": lambda: calcular_features_temporales("2025-06-14"),
+        "features.vector_365": lambda: calcular_features_temporales_vector(fechas_anio),
+        "features.calendario_5": lambda: main.CALENDARIO.rango("2025-06-12", 5),
+        "dataframe.5_filas": lambda: main.construir_datos_modelo(evento, ventana),
+        "predict.pipeline.1_fila": lambda: main.modelo.predict(una_fila),
+        "predict.pipeline.1000_filas": lambda: main.modelo.predict(lotes[1000]),
+        f"predict.{main.predictor.nombre}.1_fila": lambda: main.predictor.predict(una_fila),
+        f"predict.{main.predictor.nombre}.5_filas": lambda: main.predictor.predict(lotes[5]),
+        f"predict.{main.predictor.nombre}.1000_filas": lambda: main.predictor.predict(lotes[1000]),
+        "render.resultado": lambda: main.renderizar_resultado(**FORMULARIO),
+    }
+    resultados = {}
+    for nombre, funcion in casos.items():
+        mediana, p95 = medir(funcion, repeticiones, calentamiento=max(3, repeticiones // 20))
+        resultados[nombre] = {"mediana_ms": mediana, "p95_ms": p95}
+        print(f"{nombre:>32}: mediana {mediana:8.3f} ms | p95 {p95:8.3f} ms", file=sys.stderr)
+    return resultados
+
+
+def carga(main, peticiones):
+    async def home(cliente):
+        return await cliente.get("/")
+
+    async def predecir(cliente):
+        return await cliente.post("/predecir", data=FORMULARIO)
+
+    async def api(cliente):
+        return await cliente.post("/api/v1/predict", json=FORMULARIO)
+
+    resultados = []
+    # Hilos de sobra para que la cola de admisión no rechace peticiones a la concurrencia más alta
+    main.EJECUTOR = main.EjecutorInferencia(main.INFERENCIA_HILOS, max(CONCURRENCIAS))
+    for ruta, peticion in [("GET /", home), ("POST /predecir", predecir), ("POST /api/v1/predict", api)]:
+        carga_asgi(main.app, peticion, min(50, peticiones), 4)
+        for concurrencia in CONCURRENCIAS:
+            r = carga_asgi(main.app, peticion, peticiones, concurrencia)
+            r["ruta"] = ruta
+            resultados.append(r)
+            print(
+                f"{ruta:>22} c={concurrencia:<3}: {r['req_s']:8.0f} req/s | p50 {r['p50_ms']:7.2f} | "
+                f"p95 {r['p95_ms']:7.2f} | p99 {r['p99_ms']:7.2f} ms | {r['estados']}",
+                file=sys.stderr,
+            )
+    return resultados
+
+
+def comparar(ruta_base, ruta_nueva):
+    """Imprime la variación de cada métrica entre dos resultados (negativo = más rápido)."""
+    with open(ruta_base) as f:
+        base = json.load(f)
+    with open(ruta_nueva) as f:
+        nueva = json.load(f)
+    print(f"base {base['meta']['commit']} -> nueva {nueva['meta']['commit']}")
+    for nombre, valores in nueva["micro"].items():
+        if nombre in base["micro"]:
+            antes, despues = base["micro"][nombre]["mediana_ms"], valores["mediana_ms"]
+            print(f"{nombre:>32}: {antes:8.3f} -> {despues:8.3f} ms ({(despues / antes - 1) * 100:+6.1f} %)")
+    previas = {(r["ruta"], r["concurrencia"]): r for r in base["carga"]}
+    for r in nueva["carga"]:
+        previa = previas.get((r["ruta"], r["concurrencia"]))
+        if previa is not None:
+            print(
+                f"{r['ruta']:>22} c={r['concurrencia']:<3}: {previa['req_s']:7.0f} -> {r['req_s']:7.0f} req/s "
+                f"({(r['req_s'] / previa['req_s'] - 1) * 100:+6.1f} %) | p99 {previa['p99_ms']:.2f} -> {r['p99_ms']:.2f} ms"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--salida", help="archivo JSON de resultados (por defecto, salida estándar)")
+    parser.add_argument("--rapido", action="store_true", help="menos repeticiones, para verificar que todo corre")
+    parser.add_argument("--comparar", nargs=2, metavar=("BASE", "NUEVO"))
+    args = parser.parse_args()
+
+    if args.comparar:
+        comparar(*args.comparar)
+        sys.exit()
+
+    from _comun import importar_main
+
+    main = importar_main()
+    repeticiones, peticiones = (30, 100) if args.rapido else (300, 1000)
+    resultados = {
+        "meta": dict(metadatos(), backend=main.predictor.nombre, repeticiones=repeticiones, peticiones=peticiones),
+        "micro": micro(main, repeticiones),
+        "carga": carga(main, peticiones),
+    }
+    texto = json.dumps(resultados, indent=2, ensure_ascii=False)
+    if args.salida:
+        with open(args.salida, "w") as f:
+            f.write(texto + "\n")
+    else:
+        print(texto)
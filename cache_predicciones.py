@@ -0,0 +1,98 @@
+"""Caché LRU con TTL de predicciones por fila de entrada del modelo."""
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from codificacion import LoteCodificado
+
+
+def claves_filas(datos):
+    """Clave canónica (tupla de valores Python) de cada fila de ``datos``."""
+    if isinstance(datos, LoteCodificado):
+        return datos.claves()
+    return list(zip(*(datos[columna].tolist() for columna in datos.columns)))
+
+
+class CachePredicciones:
+    """Guarda la predicción de cada fila durante ``ttl`` segundos, hasta ``capacidad`` filas.
+
+    La clave incluye la versión del modelo: durante y después de una recarga
+    conviven entradas de varias versiones (peticiones en vuelo, reversiones) sin
+    pisarse, y las de versiones que ya no se usan salen por LRU/TTL o con
+    ``descartar_version``.
+    """
+
+    def __init__(self, capacidad, ttl):
+        self.capacidad = capacidad
+        self.ttl = ttl
+        self._entradas = OrderedDict()
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+        self.expiradas = 0
+        self.invalidaciones = 0
+
+    @property
+    def activa(self):
+        return self.capacidad > 0
+
+    def obtener(self, claves, version_modelo):
+        """Devuelve (predicciones, faltantes): NaN y ``True`` en las filas sin entrada vigente."""
+        preds = np.full(len(claves), np.nan)
+        faltantes = np.ones(len(claves), dtype=bool)
+        ahora = time.monotonic()
+        with self._lock:
+            for i, clave in enumerate(claves):
+                clave = (version_modelo, clave)
+                entrada = self._entradas.get(clave)
+                if entrada is None:
+                    continue
+                valor, expira = entrada
+                if expira < ahora:
+                    del self._entradas[clave]
+                    self.expiradas += 1
+                    continue
+                self._entradas.move_to_end(clave)
+                preds[i] = valor
+                faltantes[i] = False
+            self.fallos += int(faltantes.sum())
+            self.aciertos += len(claves) - int(faltantes.sum())
+        return preds, faltantes
+
+    def guardar(self, claves, valores, version_modelo):
+        expira = time.monotonic() + self.ttl
+        with self._lock:
+            for clave, valor in zip(claves, valores):
+                clave = (version_modelo, clave)
+                self._entradas[clave] = (float(valor), expira)
+                self._entradas.move_to_end(clave)
+            while len(self._entradas) > self.capacidad:
+                self._entradas.popitem(last=False)
+                self.desalojos += 1
+
+    def descartar_version(self, version_modelo):
+        """Elimina las entradas de ``version_modelo`` (una versión que ya no se va a usar)."""
+        with self._lock:
+            claves = [clave for clave in self._entradas if clave[0] == version_modelo]
+            for clave in claves:
+                del self._entradas[clave]
+            if claves:
+                self.invalidaciones += 1
+
+    def metricas(self):
+        with self._lock:
+            consultas = self.aciertos + self.fallos
+            return {
+                "capacidad": self.capacidad,
+                "ttl_segundos": self.ttl,
+                "tamano": len(self._entradas),
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "tasa_aciertos": self.aciertos / consultas if consultas else 0.0,
+                "desalojos": self.desalojos,
+                "expiradas": self.expiradas,
+                "invalidaciones": self.invalidaciones,
+            }
@@ -0,0 +1,172 @@
+"""Índice de codificación categórica extraído del modelo cargado.
+
+Al cargar el modelo se leen los vocabularios ajustados de los codificadores
+(``OneHotEncoder`` / ``OrdinalEncoder``) del ``ColumnTransformer`` y se arma, por
+columna, un diccionario valor -> código (la posición en ``categories_``). Con él:
+
+- ``desconocidas`` comprueba con una búsqueda por campo si un evento trae valores
+  que el modelo no vio al entrenar, antes de armar ninguna fila;
+- ``lote`` convierte las columnas de entrada en un ``LoteCodificado``: códigos
+  int32 para las categóricas (un entero si el valor es el mismo en todas las
+  filas) y arrays numéricos para el resto, que ``PredictorCompilado`` lleva a su
+  matriz sin pasar por columnas ``object`` de pandas.
+"""
+import warnings
+
+import numpy as np
+import pandas as pd
+from sklearn.compose import ColumnTransformer
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder, OrdinalEncoder
+
+DESCONOCIDO = -1
+
+
+def transformadores_ajustados(preprocesamiento):
+    """``(nombre, transformador, columnas)`` del ``ColumnTransformer`` con las columnas por nombre."""
+    nombres = list(preprocesamiento.feature_names_in_)
+    with warnings.catch_warnings():
+        # Aviso de sklearn sobre el formato futuro de las columnas del remainder
+        warnings.simplefilter("ignore", FutureWarning)
+        transformadores = preprocesamiento.transformers_
+    return [
+        (nombre, transformador, [nombres[c] if isinstance(c, (int, np.integer)) else c for c in columnas])
+        for nombre, transformador, columnas in transformadores
+    ]
+
+
+class LoteCodificado:
+    """Filas de entrada del modelo por columnas, con las categóricas ya codificadas.
+
+    Cada columna es un escalar (igual en todas las filas) o un array de ``n``
+    valores. ``originales`` guarda las columnas sin codificar para los
+    transformadores que necesitan el DataFrame.
+    """
+
+    def __init__(self, columnas, n, originales):
+        self.columnas = columnas
+        self.n = n
+        self.originales = originales
+
+    def __len__(self):
+        return self.n
+
+    def __getitem__(self, columna):
+        return self.columnas[columna]
+
+    def _filas(self, funcion, n):
+        def aplicar(valor):
+            return valor if np.ndim(valor) == 0 else funcion(valor)
+
+        return LoteCodificado(
+            {columna: aplicar(valor) for columna, valor in self.columnas.items()},
+            n,
+            {columna: aplicar(valor) for columna, valor in self.originales.items()},
+        )
+
+    def filas(self, inicio, fin):
+        fin = min(fin, self.n)
+        return self._filas(lambda valor: valor[inicio:fin], fin - inicio)
+
+    def seleccionar(self, mascara):
+        return self._filas(lambda valor: valor[mascara], int(np.count_nonzero(mascara)))
+
+    def claves(self):
+        """Clave de cada fila a partir de los valores sin codificar (como ``claves_filas``)."""
+        return list(zip(*(np.broadcast_to(valor, self.n).tolist() for valor in self.originales.values())))
+
+    def a_dataframe(self):
+        return pd.DataFrame(self.originales, index=pd.RangeIndex(self.n))
+
+
+def concatenar(lotes):
+    """Une ``LoteCodificado`` o DataFrames (si hay alguno, el resultado es un DataFrame)."""
+    if not all(isinstance(lote, LoteCodificado) for lote in lotes):
+        return pd.concat(
+            [lote.a_dataframe() if isinstance(lote, LoteCodificado) else lote for lote in lotes], ignore_index=True
+        )
+
+    def unir(columna, atributo):
+        valores = [getattr(lote, atributo)[columna] for lote in lotes]
+        if all(np.ndim(v) == 0 for v in valores) and all(v == valores[0] for v in valores):
+            return valores[0]
+        return np.concatenate([np.broadcast_to(v, len(lote)) for v, lote in zip(valores, lotes)])
+
+    primero = lotes[0]
+    return LoteCodificado(
+        {columna: unir(columna, "columnas") for columna in primero.columnas},
+        sum(len(lote) for lote in lotes),
+        {columna: unir(columna, "originales") for columna in primero.originales},
+    )
+
+
+class IndiceCategorias:
+    def __init__(self, vocabularios, aceptan_desconocidas):
+        self.vocabularios = {columna: tuple(categorias) for columna, categorias in vocabularios.items()}
+        self.codigos = {
+            columna: {valor: i for i, valor in enumerate(categorias)} for columna, categorias in vocabularios.items()
+        }
+        self.aceptan_desconocidas = aceptan_desconocidas
+
+    @classmethod
+    def desde_modelo(cls, modelo):
+        """Índice de los codificadores del pipeline; ``None`` si el artefacto no tiene esa forma."""
+        if not isinstance(modelo, Pipeline) or not isinstance(modelo.steps[0][1], ColumnTransformer):
+            return None
+        vocabularios, aceptan = {}, {}
+        for _, transformador, columnas in transformadores_ajustados(modelo.steps[0][1]):
+            if isinstance(transformador, OneHotEncoder):
+                if transformador._infrequent_enabled:
+                    return None
+                acepta = transformador.handle_unknown != "error"
+            elif isinstance(transformador, OrdinalEncoder):
+                acepta = transformador.handle_unknown == "use_encoded_value"
+            else:
+                continue
+            for columna, categorias in zip(columnas, transformador.categories_):
+                categorias = categorias.tolist()
+                if vocabularios.setdefault(columna, categorias) != categorias:
+                    # La misma columna con dos vocabularios: los códigos serían ambiguos
+                    return None
+                aceptan[columna] = aceptan.get(columna, True) and acepta
+        return cls(vocabularios, aceptan)
+
+    def codificar(self, columna, valores):
+        """Códigos de ``valores`` (``DESCONOCIDO`` fuera del vocabulario): un entero
+        para un escalar, un array int32 para una secuencia."""
+        codigos = self.codigos[columna]
+        if np.ndim(valores) == 0:
+            return codigos.get(valores, DESCONOCIDO)
+        # Un acceso al diccionario por valor distinto, no por fila
+        posiciones, unicos = pd.factorize(np.asarray(valores, dtype=object), use_na_sentinel=False)
+        return np.fromiter((codigos.get(v, DESCONOCIDO) for v in unicos), np.int32, len(unicos))[posiciones]
+
+    def lote(self, columnas, n):
+        """``LoteCodificado`` de ``n`` filas a partir de las columnas de entrada del modelo."""
+        codificadas = {
+            columna: self.codificar(columna, valor) if columna in self.codigos else valor
+            for columna, valor in columnas.items()
+        }
+        return LoteCodificado(codificadas, n, columnas)
+
+    def desconocidas(self, evento, columnas=()):
+        """Campos de ``evento`` con valores que el modelo no conoce.
+
+        Revisa los campos de ``columnas`` y, siempre, los de codificadores que no
+        admiten categorías desconocidas (con esos el modelo fallaría al predecir).
+        Devuelve ``{campo: valor}`` (el primer valor desconocido si el campo es una secuencia).
+        """
+        resultado = {}
+        for columna, codigos in self.codigos.items():
+            if columna not in evento or (columna not in columnas and self.aceptan_desconocidas[columna]):
+                continue
+            valor = evento[columna]
+            if np.ndim(valor) == 0:
+                if valor not in codigos:
+                    resultado[columna] = valor
+            else:
+                for unico in pd.unique(np.asarray(valor, dtype=object)):
+                    if unico not in codigos:
+                        resultado[columna] = unico
+                        break
+        return resultado
@@ -0,0 +1,152 @@
+"""Descarga del artefacto del modelo en streaming, con verificación SHA-256 y reintentos."""
+import hashlib
+import os
+import stat
+import tempfile
+import time
+from urllib.parse import urlparse
+from urllib.request import url2pathname
+
+import requests
+
+TAMANO_BLOQUE = 1024 * 1024
+
+
+class ErrorDescargaModelo(RuntimeError):
+    pass
+
+
+def sha256_archivo(ruta, tamano_bloque=TAMANO_BLOQUE):
+    digest = hashlib.sha256()
+    with open(ruta, "rb") as f:
+        for bloque in iter(lambda: f.read(tamano_bloque), b""):
+            digest.update(bloque)
+    return digest.hexdigest()
+
+
+def _umask():
+    """Umask del proceso sin cambiarla (en Linux se lee de /proc, que no la altera)."""
+    try:
+        with open("/proc/self/status") as f:
+            for linea in f:
+                if linea.startswith("Umask:"):
+                    return int(linea.split()[1], 8)
+    except OSError:
+        pass
+    umask = os.umask(0o022)
+    os.umask(umask)
+    return umask
+
+
+def _modo_destino(destino):
+    """Permisos del archivo final: los del destino si ya existe; si no, 0644 menos la umask
+    (``mkstemp`` crea el temporal con 0600 y otros usuarios o sidecars no podrían leerlo)."""
+    try:
+        return stat.S_IMODE(os.stat(destino).st_mode)
+    except FileNotFoundError:
+        return 0o644 & ~_umask()
+
+
+def _abrir_origen(url, timeout):
+    """Iterador de bloques de bytes del origen: HTTP(S), ``file://`` o una ruta local."""
+    esquema = urlparse(url).scheme
+    if esquema in ("http", "https"):
+        resp = requests.get(url, stream=True, timeout=timeout)
+        resp.raise_for_status()
+        return resp.iter_content(chunk_size=TAMANO_BLOQUE), resp.close
+
+    ruta = url2pathname(urlparse(url).path) if esquema == "file" else url
+    f = open(ruta, "rb")
+    return iter(lambda: f.read(TAMANO_BLOQUE), b""), f.close
+
+
+def _descargar_temporal(url, directorio, sha256, timeout):
+    """Descarga ``url`` a un temporal de ``directorio`` y devuelve ``(temporal, sha256 obtenido)``."""
+    fd, temporal = tempfile.mkstemp(prefix=".descarga-", suffix=".tmp", dir=directorio)
+    try:
+        digest = hashlib.sha256()
+        bloques, cerrar = _abrir_origen(url, timeout)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for bloque in bloques:
+                    f.write(bloque)
+                    digest.update(bloque)
+                f.flush()
+                os.fsync(f.fileno())
+        finally:
+            cerrar()
+
+        obtenido = digest.hexdigest()
+        if sha256 and obtenido != sha256.lower():
+            raise ErrorDescargaModelo(f"SHA-256 inesperado: {obtenido} (se esperaba {sha256})")
+    except BaseException:
+        os.remove(temporal)
+        raise
+    return temporal, obtenido
+
+
+def _descargar_una_vez(url, destino, sha256, timeout):
+    temporal, _ = _descargar_temporal(url, os.path.dirname(os.path.abspath(destino)), sha256, timeout)
+    try:
+        os.chmod(temporal, _modo_destino(destino))
+        # El reemplazo es atómico: el destino nunca queda a medio escribir
+        os.replace(temporal, destino)
+    except BaseException:
+        os.remove(temporal)
+        raise
+    return destino
+
+
+def _descargar_version_una_vez(url, directorio, sha256, timeout):
+    temporal, obtenido = _descargar_temporal(url, directorio, sha256, timeout)
+    destino = os.path.join(directorio, f"modelo-{obtenido[:16]}.pkl")
+    try:
+        os.chmod(temporal, _modo_destino(destino))
+        # link no pisa un archivo existente: con el mismo nombre ya está el mismo contenido
+        os.link(temporal, destino)
+    except FileExistsError:
+        pass
+    finally:
+        os.remove(temporal)
+    return destino
+
+
+def _con_reintentos(descargar, url, intentos, espera_inicial):
+    print(f"📥 Descargando modelo desde {url}...")
+    espera = espera_inicial
+    for intento in range(1, intentos + 1):
+        try:
+            return descargar()
+        except (requests.RequestException, OSError, ErrorDescargaModelo) as error:
+            if intento == intentos:
+                raise ErrorDescargaModelo(f"No se pudo descargar el modelo tras {intentos} intentos: {error}") from error
+            print(f"⚠️ Intento {intento} de descarga fallido ({error}); reintentando en {espera:.0f} s")
+            time.sleep(espera)
+            espera *= 2
+
+
+def asegurar_modelo(url, destino, sha256=None, intentos=4, espera_inicial=1.0, timeout=(10, 60)):
+    """Garantiza que ``destino`` exista (y tenga el SHA-256 indicado, si se da).
+
+    Si falta o no coincide el checksum, lo descarga desde ``url`` reintentando con
+    espera exponencial. Devuelve ``True`` si hubo descarga.
+    """
+    if os.path.exists(destino):
+        if not sha256 or sha256_archivo(destino) == sha256.lower():
+            return False
+        print("⚠️ El modelo local no coincide con el SHA-256 configurado, se descargará de nuevo")
+
+    _con_reintentos(lambda: _descargar_una_vez(url, destino, sha256, timeout), url, intentos, espera_inicial)
+    return True
+
+
+def descargar_version(url, directorio, sha256=None, intentos=4, espera_inicial=1.0, timeout=(10, 60)):
+    """Descarga ``url`` a ``directorio`` con un nombre nuevo derivado de su SHA-256
+    (``modelo-<16 hex>.pkl``) y devuelve la ruta.
+
+    Nunca reemplaza otro archivo: si ese nombre ya existe, tiene el mismo contenido y se
+    reutiliza. Así una descarga no puede pisar el artefacto de una versión en uso.
+    """
+    return _con_reintentos(
+        lambda: _descargar_version_una_vez(url, directorio, sha256, timeout), url, intentos, espera_inicial
+    )
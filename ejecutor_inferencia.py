@@ -0,0 +1,83 @@
+"""Ejecutor acotado para el trabajo de inferencia, con cola de admisión y descarte de carga."""
+import asyncio
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class ColaLlena(RuntimeError):
+    """La cola de admisión está llena: la petición debe rechazarse de inmediato."""
+
+
+def _cronometrado(inicio, funcion, args, kwargs):
+    # Se anota al empezar, para medir la espera aunque la función falle
+    inicio.append(time.perf_counter())
+    return funcion(*args, **kwargs)
+
+
+class EjecutorInferencia:
+    """Corre funciones bloqueantes en un pool de ``trabajadores`` hilos.
+
+    Admite como máximo ``trabajadores + max_cola`` trabajos a la vez; por encima de
+    eso ``ejecutar`` lanza ``ColaLlena`` sin esperar. La función corre con una copia
+    del contexto (``contextvars``) del llamador, como ``asyncio.to_thread``.
+
+    Un trabajo cuenta en ``en_vuelo`` hasta que termina en el pool, no hasta que su
+    llamador deja de esperarlo: si la petición se cancela (el cliente se desconecta),
+    el hilo sigue ocupado y la admisión lo sigue contando.
+    """
+
+    def __init__(self, trabajadores, max_cola):
+        self.trabajadores = trabajadores
+        self.max_cola = max_cola
+        self._pool = ThreadPoolExecutor(max_workers=trabajadores, thread_name_prefix="inferencia")
+        self._lock = threading.Lock()
+        self.en_vuelo = 0
+        self.aceptadas = 0
+        self.rechazadas = 0
+        # Espera en cola de los trabajos terminados (con éxito o con error) y cuántos son
+        self.terminadas = 0
+        self.espera_total = 0.0
+        self.espera_max = 0.0
+
+    @property
+    def en_cola(self):
+        return max(0, self.en_vuelo - self.trabajadores)
+
+    async def ejecutar(self, funcion, *args, **kwargs):
+        with self._lock:
+            if self.en_vuelo >= self.trabajadores + self.max_cola:
+                self.rechazadas += 1
+                raise ColaLlena(f"{self.en_cola} trabajos en cola")
+            self.en_vuelo += 1
+            self.aceptadas += 1
+        encolado = time.perf_counter()
+        inicio = []
+        contexto = contextvars.copy_context()
+        futuro = self._pool.submit(contexto.run, _cronometrado, inicio, funcion, args, kwargs)
+        futuro.add_done_callback(lambda _: self._terminado(encolado, inicio))
+        return await asyncio.wrap_future(futuro)
+
+    def _terminado(self, encolado, inicio):
+        # Corre en el hilo del pool (o en el del llamador si el trabajo se canceló en la cola)
+        with self._lock:
+            self.en_vuelo -= 1
+            if inicio:
+                espera = inicio[0] - encolado
+                self.terminadas += 1
+                self.espera_total += espera
+                self.espera_max = max(self.espera_max, espera)
+
+    def metricas(self):
+        return {
+            "trabajadores": self.trabajadores,
+            "max_cola": self.max_cola,
+            "en_cola": self.en_cola,
+            "en_ejecucion": min(self.en_vuelo, self.trabajadores),
+            "aceptadas": self.aceptadas,
+            "rechazadas": self.rechazadas,
+            "terminadas": self.terminadas,
+            "espera_media_ms": self.espera_total / self.terminadas * 1000 if self.terminadas else 0.0,
+            "espera_max_ms": self.espera_max * 1000,
+        }
@@ -0,0 +1,118 @@
+"""Respuestas precalculadas para contenido que no cambia entre peticiones."""
+import gzip
+import hashlib
+import os
+import time
+from email.utils import formatdate, parsedate_to_datetime
+
+from fastapi import Request
+from fastapi.responses import Response
+
+try:
+    import brotli
+except ImportError:  # está en requirements.txt; si falta, solo se ofrece gzip
+    brotli = None
+
+
+def calidades_codificacion(cabecera):
+    """``{codificación: q}`` de una cabecera Accept-Encoding; un q inválido cuenta como 0."""
+    calidades = {}
+    for parte in cabecera.split(","):
+        nombre, *parametros = [p.strip() for p in parte.split(";")]
+        if not nombre:
+            continue
+        q = 1.0
+        for parametro in parametros:
+            clave, _, valor = parametro.partition("=")
+            if clave.strip().lower() == "q":
+                try:
+                    q = float(valor)
+                except ValueError:
+                    q = 0.0
+        calidades[nombre.lower()] = q
+    return calidades
+
+
+class RecursoEstatico:
+    """Contenido fijo con variantes comprimidas, ETag y Last-Modified calculados una vez."""
+
+    def __init__(self, contenido, media_type, cache_control="no-cache"):
+        if isinstance(contenido, str):
+            contenido = contenido.encode("utf-8")
+        self.media_type = media_type
+        self.cache_control = cache_control
+        self.etag = f'"{hashlib.sha256(contenido).hexdigest()[:20]}"'
+        self.modificado = int(time.time())
+        self.last_modified = formatdate(self.modificado, usegmt=True)
+        self.variantes = {"identity": contenido, "gzip": gzip.compress(contenido, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            self.variantes["br"] = brotli.compress(contenido, quality=11)
+
+    def _no_modificado(self, request):
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            etiquetas = [e.strip().removeprefix("W/") for e in if_none_match.split(",")]
+            return "*" in etiquetas or self.etag in etiquetas
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since:
+            try:
+                return parsedate_to_datetime(if_modified_since).timestamp() >= self.modificado
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def _codificacion(self, request):
+        """La variante comprimida con mayor q (br ante un empate); q=0 la excluye y ``*``
+        cubre las que no se nombran."""
+        calidades = calidades_codificacion(request.headers.get("accept-encoding", ""))
+        mejor, mejor_q = "identity", 0.0
+        for codificacion in ("br", "gzip"):
+            q = calidades.get(codificacion, calidades.get("*", 0.0))
+            if codificacion in self.variantes and q > mejor_q:
+                mejor, mejor_q = codificacion, q
+        return mejor
+
+    def responder(self, request: Request):
+        cabeceras = {
+            "ETag": self.etag,
+            "Last-Modified": self.last_modified,
+            "Cache-Control": self.cache_control,
+            "Vary": "Accept-Encoding",
+        }
+        if self._no_modificado(request):
+            return Response(status_code=304, headers=cabeceras)
+        codificacion = self._codificacion(request)
+        if codificacion != "identity":
+            cabeceras["Content-Encoding"] = codificacion
+        return Response(self.variantes[codificacion], media_type=self.media_type, headers=cabeceras)
+
+
+class RecursosVersionados:
+    """Recursos estáticos servidos bajo un nombre con huella del contenido (``app.3f9c2a1b0d.css``).
+
+    Como el nombre cambia cuando cambia el contenido, se pueden cachear sin expiración.
+    """
+
+    CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+    def __init__(self, prefijo="/static"):
+        self.prefijo = prefijo
+        self._urls = {}
+        self._recursos = {}
+
+    def registrar(self, nombre, contenido, media_type):
+        recurso = RecursoEstatico(contenido, media_type, cache_control=self.CACHE_CONTROL)
+        base, punto, extension = nombre.rpartition(".")
+        versionado = f"{base}.{recurso.etag.strip(chr(34))[:10]}.{extension}"
+        self._recursos[versionado] = recurso
+        self._urls[nombre] = f"{self.prefijo}/{versionado}"
+
+    def registrar_archivo(self, ruta, media_type):
+        with open(ruta, "rb") as f:
+            self.registrar(os.path.basename(ruta), f.read(), media_type)
+
+    def url(self, nombre):
+        return self._urls[nombre]
+
+    def obtener(self, versionado):
+        return self._recursos.get(versionado)
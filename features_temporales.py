@@ -0,0 +1,110 @@
+"""Features temporales del modelo (año, día de la semana, semana y día del año cíclicos)."""
+import numpy as np
+
+DIAS_SEMANA = np.array(["Lunes", "Martes", "Miércoles", "Jueves", "Viernes", "Sábado", "Domingo"], dtype=object)
+DIAS_SEMANA_CORTOS = np.array(["Lun", "Mar", "Mié", "Jue", "Vie", "Sáb", "Dom"], dtype=object)
+MESES = np.array(["Ene", "Feb", "Mar", "Abr", "May", "Jun", "Jul", "Ago", "Sep", "Oct", "Nov", "Dic"], dtype=object)
+
+# Etiquetas precalculadas: "15 Jun" indexada por (mes, día) y "Sáb 15 Jun" por (día semana, mes, día)
+_FECHAS_CORTAS = np.array(
+    [f"{dia} {mes}" for mes in MESES for dia in range(1, 32)], dtype=object
+)
+_FECHAS_FORMATEADAS = np.array(
+    [f"{corto} {corta}" for corto in DIAS_SEMANA_CORTOS for corta in _FECHAS_CORTAS], dtype=object
+)
+
+
+def calcular_features_temporales_vector(fechas):
+    """Calcula las features temporales de una secuencia de fechas.
+
+    ``fechas`` puede contener cadenas ``YYYY-MM-DD``, ``date``/``datetime`` o ser un
+    arreglo ``datetime64``. Devuelve un dict de arreglos NumPy, uno por feature, con
+    las mismas claves que ``calcular_features_temporales``.
+    """
+    dias = np.asarray(fechas, dtype="datetime64[D]").reshape(-1)
+    inicio_mes = dias.astype("datetime64[M]")
+    inicio_anio = dias.astype("datetime64[Y]")
+
+    # 1970-01-01 fue jueves; lunes = 0 como en datetime.weekday()
+    dia_semana = (dias.astype(np.int64) + 3) % 7
+    mes = inicio_mes.astype(np.int64) % 12
+    dia = (dias - inicio_mes).astype(np.int64)
+    dia_del_anio = (dias - inicio_anio).astype(np.int64) + 1
+
+    # Semana ISO: la semana pertenece al año de su jueves
+    jueves = dias - dia_semana + 3
+    semana_del_anio = (jueves - jueves.astype("datetime64[Y]")).astype(np.int64) // 7 + 1
+
+    idx_corta = mes * 31 + dia
+    return {
+        "anio": inicio_anio.astype(np.int64) + 1970,
+        "semana_sin": np.sin(2 * np.pi * semana_del_anio / 52),
+        "semana_cos": np.cos(2 * np.pi * semana_del_anio / 52),
+        "dia_sin": np.sin(2 * np.pi * dia_del_anio / 365),
+        "dia_cos": np.cos(2 * np.pi * dia_del_anio / 365),
+        "dia_semana": dia_semana,
+        "dia_semana_es": DIAS_SEMANA[dia_semana],
+        "dia_semana_corto": DIAS_SEMANA_CORTOS[dia_semana],
+        "fecha_formateada": _FECHAS_FORMATEADAS[dia_semana * len(_FECHAS_CORTAS) + idx_corta],
+        "fecha_corta": _FECHAS_CORTAS[idx_corta],
+    }
+
+
+def calcular_features_temporales(fecha_str):
+    """Versión escalar de ``calcular_features_temporales_vector`` para una sola fecha."""
+    columnas = calcular_features_temporales_vector([fecha_str])
+    return {clave: valores.tolist()[0] for clave, valores in columnas.items()}
+
+
+class CalendarioFeatures:
+    """Tabla precalculada de features temporales para un rango contiguo de días.
+
+    Cada columna es un arreglo indexado por el número de días desde ``inicio``, de
+    modo que consultar una fecha es un acceso O(1) y un rango contiguo es un slice.
+    Las fechas fuera del rango se calculan al vuelo.
+    """
+
+    def __init__(self, inicio, fin):
+        self.inicio = np.datetime64(inicio, "D")
+        self.fin = np.datetime64(fin, "D")
+        self.columnas = calcular_features_temporales_vector(
+            np.arange(self.inicio, self.fin + 1, dtype="datetime64[D]")
+        )
+        self.n_dias = len(self.columnas["anio"])
+
+    @classmethod
+    def alrededor_de(cls, centro, anios):
+        """Calendario que cubre ``anios`` años antes y después de ``centro``."""
+        centro = np.datetime64(centro, "D")
+        margen = np.timedelta64(366 * anios, "D")
+        return cls(centro - margen, centro + margen)
+
+    @property
+    def nbytes(self):
+        return sum(valores.nbytes for valores in self.columnas.values())
+
+    def rango(self, inicio, n_dias):
+        """Features de ``n_dias`` días consecutivos desde ``inicio`` (vistas si caben en la tabla)."""
+        desde = int((np.datetime64(inicio, "D") - self.inicio).astype(np.int64))
+        if desde < 0 or desde + n_dias > self.n_dias:
+            return calcular_features_temporales_vector(
+                np.arange(n_dias) + np.datetime64(inicio, "D")
+            )
+        return {clave: valores[desde:desde + n_dias] for clave, valores in self.columnas.items()}
+
+    def consultar(self, fechas):
+        """Features de una secuencia arbitraria de fechas, con el mismo formato que
+        ``calcular_features_temporales_vector``."""
+        dias = np.asarray(fechas, dtype="datetime64[D]").reshape(-1)
+        idx = (dias - self.inicio).astype(np.int64)
+        dentro = (idx >= 0) & (idx < self.n_dias)
+        if dentro.all():
+            return {clave: valores[idx] for clave, valores in self.columnas.items()}
+
+        resultado = {clave: valores[np.where(dentro, idx, 0)] for clave, valores in self.columnas.items()}
+        if not dentro.any():
+            return calcular_features_temporales_vector(dias)
+        fuera = calcular_features_temporales_vector(dias[~dentro])
+        for clave, valores in resultado.items():
+            valores[~dentro] = fuera[clave]
+        return resultado
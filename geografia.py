@@ -0,0 +1,141 @@
+"""Índice de la geografía del formulario y búsqueda por prefijo para autocompletar.
+
+``IndiceGeografia`` se arma una vez a partir de la tabla departamento ->
+municipios y la lista de capitales: capitales en un ``frozenset`` de pares
+(departamento, municipio), índice inverso municipio -> departamentos y nombres
+canónicos por clave normalizada (sin tildes ni mayúsculas), así que derivar
+``EsCapital`` o corregir "medellin" a "Medellín" es una búsqueda en diccionario.
+
+``ubicar_columnas`` aplica lo mismo a columnas enteras (puntuación por lotes) con
+una búsqueda por par distinto.
+
+``BuscadorPrefijos`` es un trie cuyos nodos guardan ya sus primeros
+``max_resultados`` candidatos en orden de relevancia: una consulta cuesta lo que
+mide el prefijo, no el número de entradas.
+"""
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+
+def normalizar(texto):
+    """Minúsculas, sin tildes y con los espacios colapsados: ``" Bogotá  D.C."`` -> ``"bogota d.c."``."""
+    descompuesto = unicodedata.normalize("NFKD", texto.casefold())
+    return " ".join("".join(c for c in descompuesto if not unicodedata.combining(c)).split())
+
+
+class _Nodo:
+    __slots__ = ("hijos", "candidatos")
+
+    def __init__(self):
+        self.hijos = {}
+        self.candidatos = []
+
+
+class BuscadorPrefijos:
+    """Autocompletado sin tildes ni mayúsculas sobre ``textos``.
+
+    Primero van los textos que empiezan por el prefijo y después los que tienen
+    alguna otra palabra que empieza por él ("marta" encuentra "Santa Marta"); cada
+    grupo en orden alfabético.
+    """
+
+    def __init__(self, textos, max_resultados=50):
+        normalizados = {texto: normalizar(texto) for texto in textos}
+        self.textos = sorted(normalizados, key=lambda texto: (normalizados[texto], texto))
+        self.max_resultados = max_resultados
+        self._raiz = _Nodo()
+        claves = [normalizados[texto] for texto in self.textos]
+        # Todas las claves completas antes que las palabras interiores: así el orden en
+        # que llegan los candidatos a cada nodo ya es el de relevancia
+        for i, clave in enumerate(claves):
+            self._insertar(clave, i)
+        for i, clave in enumerate(claves):
+            palabras = clave.split(" ")
+            for k in range(1, len(palabras)):
+                self._insertar(" ".join(palabras[k:]), i)
+
+    def _insertar(self, clave, i):
+        nodo = self._raiz
+        for caracter in clave:
+            nodo = nodo.hijos.setdefault(caracter, _Nodo())
+            if len(nodo.candidatos) < self.max_resultados and i not in nodo.candidatos:
+                nodo.candidatos.append(i)
+
+    def buscar(self, prefijo, limite=10):
+        """Hasta ``limite`` (como mucho ``max_resultados``) textos para ``prefijo``; sin prefijo, los primeros."""
+        clave = normalizar(prefijo)
+        if not clave:
+            return self.textos[:limite]
+        nodo = self._raiz
+        for caracter in clave:
+            nodo = nodo.hijos.get(caracter)
+            if nodo is None:
+                return []
+        return [self.textos[i] for i in nodo.candidatos[:limite]]
+
+
+class IndiceGeografia:
+    def __init__(self, departamentos_municipios, capitales, max_resultados=50):
+        capitales = frozenset(capitales)
+        self.departamentos = tuple(sorted(departamentos_municipios))
+        self.municipios = {departamento: tuple(m) for departamento, m in departamentos_municipios.items()}
+        pares = [(d, m) for d, municipios in departamentos_municipios.items() for m in municipios]
+        self.capitales = frozenset((d, m) for d, m in pares if m in capitales)
+
+        self.departamentos_de = {}
+        for departamento, municipio in pares:
+            self.departamentos_de.setdefault(municipio, ())
+            self.departamentos_de[municipio] += (departamento,)
+
+        self._exactos = {par: par + ("1" if par in self.capitales else "0",) for par in pares}
+        self._normalizados = {(normalizar(d), normalizar(m)): lugar for (d, m), lugar in self._exactos.items()}
+        self.buscador = BuscadorPrefijos(self.departamentos_de, max_resultados)
+        self._buscadores = {
+            departamento: BuscadorPrefijos(municipios, max_resultados)
+            for departamento, municipios in departamentos_municipios.items()
+        }
+        self._departamentos_normalizados = {normalizar(d): d for d in self.departamentos}
+
+    def ubicar(self, departamento, municipio):
+        """``(departamento, municipio, es_capital)`` canónicos del par, con ``es_capital``
+        "1" o "0"; ``None`` si el par no está en la tabla."""
+        lugar = self._exactos.get((departamento, municipio))
+        if lugar is None:
+            lugar = self._normalizados.get((normalizar(departamento), normalizar(municipio)))
+        return lugar
+
+    def ubicar_columnas(self, departamentos, municipios):
+        """``ubicar`` fila a fila sobre dos columnas, con una búsqueda por par distinto.
+
+        Devuelve ``(departamentos, municipios, es_capital, ubicadas)``: arrays con los
+        valores canónicos y la máscara de filas cuyo par está en la tabla. Las demás
+        conservan los nombres recibidos y tienen ``es_capital`` "0".
+        """
+        codigos_d, unicos_d = pd.factorize(np.asarray(departamentos, dtype=object), use_na_sentinel=False)
+        codigos_m, unicos_m = pd.factorize(np.asarray(municipios, dtype=object), use_na_sentinel=False)
+        pares, codigos = np.unique(codigos_d.astype(np.int64) * len(unicos_m) + codigos_m, return_inverse=True)
+        lugares = np.empty((len(pares), 3), dtype=object)
+        ubicados = np.zeros(len(pares), dtype=bool)
+        for i, par in enumerate(pares.tolist()):
+            departamento, municipio = unicos_d[par // len(unicos_m)], unicos_m[par % len(unicos_m)]
+            lugar = None
+            if isinstance(departamento, str) and isinstance(municipio, str):
+                lugar = self.ubicar(departamento, municipio)
+            ubicados[i] = lugar is not None
+            lugares[i] = lugar if lugar is not None else (departamento, municipio, "0")
+        filas = lugares[codigos]
+        return filas[:, 0], filas[:, 1], filas[:, 2], ubicados[codigos]
+
+    def departamento(self, nombre):
+        """Nombre canónico del departamento (sin distinguir tildes ni mayúsculas); ``None`` si no existe."""
+        return nombre if nombre in self.municipios else self._departamentos_normalizados.get(normalizar(nombre))
+
+    def buscar_municipios(self, prefijo, limite=10, departamento=None):
+        """Hasta ``limite`` ``(departamento, municipio, es_capital)`` cuyo municipio coincide con ``prefijo``."""
+        if departamento is None:
+            municipios = self.buscador.buscar(prefijo, limite)
+            lugares = [self._exactos[(d, m)] for m in municipios for d in self.departamentos_de[m]]
+            return lugares[:limite]
+        return [self._exactos[(departamento, m)] for m in self._buscadores[departamento].buscar(prefijo, limite)]
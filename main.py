@@ -1,28 +1,230 @@
-from fastapi import FastAPI, Form
-from fastapi.responses import HTMLResponse
+from fastapi import Depends, FastAPI, Form, Header, HTTPException, Request
+from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse, Response
+from pydantic import BaseModel, field_validator
+from contextlib import asynccontextmanager
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+import asyncio
+import contextvars
+import gc
+import hmac
 import joblib
+import signal
+import threading
 import pandas as pd
-import requests
 import os
 import numpy as np
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 import json
+import time
+from urllib.parse import urlparse
 
-app = FastAPI()
+from cache_predicciones import CachePredicciones, claves_filas
+from codificacion import IndiceCategorias, LoteCodificado
+from descarga_modelo import asegurar_modelo, descargar_version
+from ejecutor_inferencia import ColaLlena, EjecutorInferencia
+from estaticos import RecursoEstatico, RecursosVersionados
+from features_temporales import CalendarioFeatures
+from geografia import BuscadorPrefijos, IndiceGeografia
+from metricas import (
+    LIMITES_FILAS,
+    SIN_MEDICION,
+    Contador,
+    Histograma,
+    Medidor,
+    MiddlewareMetricas,
+    RegistroMetricas,
+    rss_bytes,
+)
+from microlotes import PlanificadorMicrolotes
+from optimizacion_precios import optimizar_precios
+from perfilado import MODOS, Perfilador, SesionActiva
+from pool_procesos import PredictorProcesos, firma_artefacto
+from predictores import PredictorCompilado, crear_predictor
+from registro_modelos import RecargaEnCurso, RegistroModelos, VersionModelo
 
-MODEL_URL = "https://drive.google.com/uc?id=198OGyKHW7IOrxC79IqaZnvaNPe2ll0Cv"
-MODEL_PATH = "mejor_modelo_optimizado_gb.pkl"
+_INICIO_PROCESO = time.perf_counter()
+DIRECTORIO_BASE = os.path.dirname(os.path.abspath(__file__))
 
-# Descargar modelo si no existe
-if not os.path.exists(MODEL_PATH):
-    print("📥 Descargando modelo desde Google Drive...")
-    resp = requests.get(MODEL_URL)
-    with open(MODEL_PATH, "wb") as f:
-        f.write(resp.content)
-    print("✅ Modelo descargado correctamente")
+# MODEL_URL acepta también file:// o una ruta local (p. ej. un modelo sustituto en pruebas)
+MODEL_URL = os.environ.get("EVENTIA_MODEL_URL", "https://drive.google.com/uc?id=198OGyKHW7IOrxC79IqaZnvaNPe2ll0Cv")
+MODEL_PATH = os.environ.get("EVENTIA_MODEL_PATH", "mejor_modelo_optimizado_gb.pkl")
+MODEL_SHA256 = os.environ.get("EVENTIA_MODEL_SHA256")
+# Cargar los arreglos NumPy del artefacto como memoria mapeada (solo aplica a pickles sin comprimir)
+MODEL_MMAP = os.environ.get("EVENTIA_MODEL_MMAP") == "1"
+# Cargar el modelo al importar el módulo, para compartirlo por copy-on-write entre workers
+# creados con fork después de la importación (p. ej. gunicorn --preload -k uvicorn.workers.UvicornWorker)
+PRECARGAR_MODELO = os.environ.get("EVENTIA_PRECARGAR_MODELO") == "1"
+# Intentos de la carga inicial del modelo (con espera exponencial de 1 s a 60 s entre ellos);
+# agotados, el proceso termina para que el supervisor lo reinicie. 0 = reintentar siempre.
+CARGA_INTENTOS = int(os.environ.get("EVENTIA_CARGA_INTENTOS", "5"))
+# Backend de inferencia: "pipeline" (modelo.predict), "compilado" o "auto" (compilado si es compatible)
+BACKEND_PREDICTOR = os.environ.get("EVENTIA_BACKEND", "auto")
 
-# Cargar modelo
-modelo = joblib.load(MODEL_PATH)
+# Desplazamientos (en días) alrededor de la fecha elegida que se evalúan en /predecir
+DESPLAZAMIENTOS_VENTANA = range(-2, 3)
+
+# Filas máximas por llamada a modelo.predict y escenarios máximos por petición masiva
+TAMANO_LOTE = int(os.environ.get("EVENTIA_TAMANO_LOTE", "5000"))
+MAX_ESCENARIOS = int(os.environ.get("EVENTIA_MAX_ESCENARIOS", "20000"))
+
+# Días máximos de un barrido de fechas (/api/v1/predict/range)
+MAX_DIAS_BARRIDO = int(os.environ.get("EVENTIA_MAX_DIAS_BARRIDO", "1096"))
+
+# Celdas máximas (precios mínimos x máximos x funciones) de una optimización de precios
+MAX_CELDAS_PRECIOS = int(os.environ.get("EVENTIA_MAX_CELDAS_PRECIOS", "200000"))
+
+# Años antes y después de hoy cubiertos por el calendario precalculado de features
+ANIOS_CALENDARIO = int(os.environ.get("EVENTIA_ANIOS_CALENDARIO", "5"))
+
+# Caché de predicciones por fila (tamaño 0 la desactiva) y vigencia en segundos
+CACHE_TAMANO = int(os.environ.get("EVENTIA_CACHE_TAMANO", "10000"))
+CACHE_TTL = float(os.environ.get("EVENTIA_CACHE_TTL", "3600"))
+
+# Hilos dedicados a la inferencia y peticiones que pueden esperar turno antes de responder 429
+INFERENCIA_HILOS = int(os.environ.get("EVENTIA_INFERENCIA_HILOS", str(min(4, os.cpu_count() or 1))))
+INFERENCIA_COLA = int(os.environ.get("EVENTIA_INFERENCIA_COLA", "32"))
+
+# Procesos trabajadores de inferencia, cada uno con su copia del modelo (0 = inferencia en proceso).
+# Requiere el backend compilado; conviene EVENTIA_INFERENCIA_HILOS >= procesos. Como en todo
+# multiprocessing sin fork, un script que importe main debe protegerse con if __name__ == "__main__".
+INFERENCIA_PROCESOS = int(os.environ.get("EVENTIA_INFERENCIA_PROCESOS", "0"))
+
+# Microlotes: agrupar filas de peticiones concurrentes hasta N filas o M ms (0 filas lo desactiva).
+# Conviene subir EVENTIA_INFERENCIA_HILOS: cada petición en espera ocupa un hilo del ejecutor.
+MICROLOTES_FILAS = int(os.environ.get("EVENTIA_MICROLOTES_FILAS", "0"))
+MICROLOTES_ESPERA_MS = float(os.environ.get("EVENTIA_MICROLOTES_ESPERA_MS", "2"))
+
+# Métricas de Prometheus en /metrics (0 las desactiva, incluido el middleware)
+METRICAS = os.environ.get("EVENTIA_METRICAS", "1") != "0"
+
+# Perfilado bajo demanda de /predecir en /admin/perfilado, con "Authorization: Bearer <token>".
+# Sin token las rutas responden 404 y /predecir no comprueba nada más.
+PERFILADO_TOKEN = os.environ.get("EVENTIA_PERFILADO_TOKEN", "")
+PERFILADO_MAX_SEGUNDOS = float(os.environ.get("EVENTIA_PERFILADO_MAX_SEGUNDOS", "300"))
+
+# Recarga del modelo sin reiniciar en /admin/modelo, con "Authorization: Bearer <token>" (sin
+# token, 404). Se guardan N versiones anteriores en memoria para revertir al instante. Solo se
+# cargan (o descargan) artefactos por nombre dentro de EVENTIA_DIRECTORIO_MODELOS (por defecto,
+# el directorio de EVENTIA_MODEL_PATH).
+ADMIN_TOKEN = os.environ.get("EVENTIA_ADMIN_TOKEN", "")
+DIRECTORIO_MODELOS = os.path.abspath(
+    os.environ.get("EVENTIA_DIRECTORIO_MODELOS") or os.path.dirname(os.path.abspath(MODEL_PATH))
+)
+MODELOS_ANTERIORES = int(os.environ.get("EVENTIA_MODELOS_ANTERIORES", "1"))
+
+# Calentamiento antes de declarar listo el modelo (y de publicar una recarga): lotes sintéticos
+# de estos tamaños por el predictor y páginas completas de /predecir, N veces cada paso.
+# Con 0 repeticiones solo se hace la predicción de verificación.
+CALENTAMIENTO_FILAS = tuple(
+    int(n) for n in os.environ.get("EVENTIA_CALENTAMIENTO_FILAS", "1,5,365,5000").split(",") if n.strip()
+)
+CALENTAMIENTO_REPETICIONES = int(os.environ.get("EVENTIA_CALENTAMIENTO_REPETICIONES", "3"))
+
+# Artistas y géneros que el modelo no vio al entrenar: "ignorar" (el codificador los deja en
+# cero, como siempre) o "rechazar" (422 antes de evaluar). Con codificadores que no admiten
+# categorías desconocidas se rechazan siempre.
+CATEGORIAS_DESCONOCIDAS = os.environ.get("EVENTIA_CATEGORIAS_DESCONOCIDAS", "ignorar")
+COLUMNAS_VALIDADAS = ("artista", "genero")
+
+# Autocompletado: máximo de resultados por consulta y rutas de los vocabularios del modelo
+MAX_AUTOCOMPLETADO = 50
+CAMPOS_AUTOCOMPLETADO = {"artistas": "artista", "generos": "genero"}
+
+# Caché de predicciones; el modelo se carga en segundo plano al arrancar (ver lifespan).
+# modelo, predictor, etc. son alias de la versión activa de MODELOS para scripts y
+# benchmarks; las peticiones usan modelo_en_uso().
+modelo = None
+predictor = None
+INDICE_CATEGORIAS = None
+AUTOCOMPLETADO = {}
+VERSION_MODELO = None
+ERROR_CARGA = None
+CACHE = CachePredicciones(CACHE_TAMANO, CACHE_TTL)
+EJECUTOR = EjecutorInferencia(INFERENCIA_HILOS, INFERENCIA_COLA)
+PLANIFICADOR = (
+    # predecir_modelo se define más abajo: se resuelve al predecir, no al importar. Con
+    # procesos trabajadores, un hilo de microlotes por proceso para que todos tengan trabajo
+    PlanificadorMicrolotes(
+        lambda datos, version=None: predecir_modelo(datos, version),
+        MICROLOTES_FILAS,
+        MICROLOTES_ESPERA_MS / 1000,
+        hilos=max(1, INFERENCIA_PROCESOS),
+    )
+    if MICROLOTES_FILAS > 0
+    else None
+)
+PERFILADOR = Perfilador() if PERFILADO_TOKEN else None
+RETRY_AFTER_SEGUNDOS = 5
+
+REGISTRO = RegistroMetricas()
+PETICIONES = REGISTRO.registrar(
+    Contador("eventia_peticiones_total", "Peticiones HTTP atendidas", ("metodo", "ruta", "estado"))
+)
+LATENCIA_PETICIONES = REGISTRO.registrar(
+    Histograma("eventia_peticion_segundos", "Latencia de las peticiones HTTP", ("metodo", "ruta"))
+)
+ETAPAS = REGISTRO.registrar(
+    Histograma("eventia_etapa_segundos", "Duración de cada etapa de la inferencia", ("etapa",))
+)
+FILAS_POR_LOTE = REGISTRO.registrar(
+    Histograma("eventia_modelo_lote_filas", "Filas por llamada al modelo", limites=LIMITES_FILAS)
+)
+DESCONOCIDAS = REGISTRO.registrar(
+    Contador("eventia_categorias_desconocidas_total", "Valores fuera del vocabulario del modelo", ("campo", "accion"))
+)
+RECARGAS = REGISTRO.registrar(
+    Contador("eventia_modelo_recargas_total", "Recargas y reversiones del modelo", ("resultado",))
+)
+MODELO_INFO = REGISTRO.registrar(Medidor("eventia_modelo_info", "Modelo publicado", ("version", "backend")))
+MODELO_DESCARGA = REGISTRO.registrar(
+    Medidor("eventia_modelo_descarga_segundos", "Duración de la última descarga del modelo")
+)
+MODELO_CARGA = REGISTRO.registrar(
+    Medidor("eventia_modelo_carga_segundos", "Duración de la última carga del modelo, descarga incluida")
+)
+MODELO_LISTO = REGISTRO.registrar(
+    Medidor("eventia_modelo_listo_desde_arranque_segundos", "Segundos desde el arranque hasta el modelo listo")
+)
+REGISTRO.registrar(Medidor("eventia_proceso_rss_bytes", "Memoria residente del proceso", funcion=rss_bytes))
+REGISTRO.registrar(
+    Medidor("eventia_inferencia_en_vuelo", "Trabajos en el ejecutor de inferencia", funcion=lambda: EJECUTOR.en_vuelo)
+)
+
+
+# Verdadero mientras se calienta una versión: sin caché, microlotes ni métricas (ver calentar)
+_CALENTANDO = contextvars.ContextVar("calentando", default=False)
+
+
+def medir_metricas():
+    return METRICAS and not _CALENTANDO.get()
+
+
+def etapa(nombre):
+    """Context manager que mide una etapa de la inferencia en ``eventia_etapa_segundos``."""
+    return ETAPAS.medir(nombre) if medir_metricas() else SIN_MEDICION
+
+# Precalcular features temporales
+_inicio = time.perf_counter()
+CALENDARIO = CalendarioFeatures.alrededor_de(date.today(), ANIOS_CALENDARIO)
+print(
+    f"📅 Calendario de features: {CALENDARIO.n_dias} días ({CALENDARIO.inicio} a {CALENDARIO.fin}), "
+    f"{CALENDARIO.nbytes / 1024:.0f} KB, construido en {(time.perf_counter() - _inicio) * 1000:.1f} ms"
+)
+
+# Evento de ejemplo con el que se calienta el modelo antes de declararlo listo
+EVENTO_CALENTAMIENTO = {
+    "Departamento": "Antioquia",
+    "Municipio": "Medellín",
+    "CategoriaFunciones": "Unica",
+    "EsCapital": "1",
+    "artista": "Karol G",
+    "genero": "Reggaeton",
+    "tipo": "Nacional",
+    "NumeroFunciones": 1,
+    "PrecioMinimo": 100000.0,
+    "PrecioMaximo": 300000.0,
+    "cantidad_artistas_evento": 1,
+}
 
 # Departamentos y municipios de Colombia
 DEPARTAMENTOS_MUNICIPIOS = {
@@ -69,44 +271,427 @@ CAPITALES = [
     "Sincelejo", "Ibagué", "Cali", "Mitú", "Puerto Carreño"
 ]
 
+# Capitales, índice inverso y búsqueda por prefijo sobre las dos tablas anteriores
+GEO = IndiceGeografia(DEPARTAMENTOS_MUNICIPIOS, CAPITALES, MAX_AUTOCOMPLETADO)
+
+# Tabla plana de municipios (departamento, municipio, EsCapital) para evaluar giras en lote
+GEOGRAFIA = {
+    "departamento": np.array([d for d, municipios in DEPARTAMENTOS_MUNICIPIOS.items() for _ in municipios], dtype=object),
+    "municipio": np.array([m for municipios in DEPARTAMENTOS_MUNICIPIOS.values() for m in municipios], dtype=object),
+}
+GEOGRAFIA["es_capital"] = np.array(
+    [GEO.ubicar(d, m)[2] for d, m in zip(GEOGRAFIA["departamento"], GEOGRAFIA["municipio"])], dtype=object
+)
+
+
+def ubicar(departamento, municipio, es_capital=None):
+    """``(departamento, municipio, EsCapital)`` que se le pasan al modelo.
+
+    Para los municipios de la tabla los nombres se llevan a su forma canónica y
+    EsCapital se deriva del índice, sin importar lo que envió el cliente; fuera de
+    la tabla se conservan los valores recibidos (EsCapital "0" si no vino).
+    """
+    lugar = GEO.ubicar(departamento, municipio)
+    if lugar is None:
+        return departamento, municipio, es_capital or "0"
+    return lugar
+
 
-def calcular_features_temporales(fecha_str):
-    fecha = datetime.strptime(fecha_str, "%Y-%m-%d")
-    
-    dias_semana = ["Lunes", "Martes", "Miércoles", "Jueves", "Viernes", "Sábado", "Domingo"]
-    dias_semana_cortos = ["Lun", "Mar", "Mié", "Jue", "Vie", "Sáb", "Dom"]
-    meses = ["", "Ene", "Feb", "Mar", "Abr", "May", "Jun", "Jul", "Ago", "Sep", "Oct", "Nov", "Dic"]
-    
-    dia_semana_num = fecha.weekday()
-    dia_semana_nombre = dias_semana[dia_semana_num]
-    dia_semana_corto = dias_semana_cortos[dia_semana_num]
-    
-    semana_del_anio = fecha.isocalendar()[1]
-    dia_del_anio = fecha.timetuple().tm_yday
-    
-    semana_sin = np.sin(2 * np.pi * semana_del_anio / 52)
-    semana_cos = np.cos(2 * np.pi * semana_del_anio / 52)
-    dia_sin = np.sin(2 * np.pi * dia_del_anio / 365)
-    dia_cos = np.cos(2 * np.pi * dia_del_anio / 365)
-    
-    fecha_formateada = f"{dia_semana_corto} {fecha.day} {meses[fecha.month]}"
-    
+def construir_datos_modelo(evento, temporales):
+    """Arma el DataFrame de entrada del modelo en un solo bloque columnar.
+
+    ``evento`` contiene los campos del evento (escalares o secuencias por fila) y
+    ``temporales`` las columnas devueltas por ``calcular_features_temporales_vector``.
+    """
+    with etapa("dataframe"):
+        return _construir_datos_modelo(evento, temporales)
+
+
+def _construir_datos_modelo(evento, temporales):
+    return pd.DataFrame(columnas_modelo(evento, temporales), index=pd.RangeIndex(len(temporales["anio"])))
+
+
+def columnas_modelo(evento, temporales):
+    """Columnas de entrada del modelo, en su orden, a partir del evento y las features temporales."""
     return {
-        "anio": fecha.year,
-        "semana_sin": semana_sin,
-        "semana_cos": semana_cos,
-        "dia_sin": dia_sin,
-        "dia_cos": dia_cos,
-        "dia_semana": dia_semana_num,
-        "dia_semana_es": dia_semana_nombre,
-        "dia_semana_corto": dia_semana_corto,
-        "fecha_formateada": fecha_formateada,
-        "fecha_corta": f"{fecha.day} {meses[fecha.month]}",
+        "Departamento": evento["Departamento"],
+        "Municipio": evento["Municipio"],
+        "DiaSemana": temporales["dia_semana"],
+        "CategoriaFunciones": evento["CategoriaFunciones"],
+        "EsCapital": evento["EsCapital"],
+        "artista": evento["artista"],
+        "genero": evento["genero"],
+        "tipo": evento["tipo"],
+        "Año": temporales["anio"],
+        "SemanaDelAño_sin": temporales["semana_sin"],
+        "SemanaDelAño_cos": temporales["semana_cos"],
+        "DiaDelAño_sin": temporales["dia_sin"],
+        "DiaDelAño_cos": temporales["dia_cos"],
+        "NumeroFunciones": evento["NumeroFunciones"],
+        "PrecioMinimo": evento["PrecioMinimo"],
+        "PrecioMaximo": evento["PrecioMaximo"],
+        "cantidad_artistas_evento": evento["cantidad_artistas_evento"],
     }
 
 
-@app.get("/", response_class=HTMLResponse)
-def home():
+def construir_lote(evento, temporales):
+    """Entrada del predictor activo para ``evento`` y ``temporales``.
+
+    Si el backend acepta lotes codificados, las categóricas se convierten a códigos
+    con el índice de la versión en uso (un acceso a diccionario por valor distinto) y no se
+    arma el DataFrame; si no, es ``construir_datos_modelo``.
+    """
+    version = modelo_en_uso()
+    if version is None or version.indice is None or not version.predictor.acepta_lotes:
+        return construir_datos_modelo(evento, temporales)
+    with etapa("codificacion"):
+        return version.indice.lote(columnas_modelo(evento, temporales), len(temporales["anio"]))
+
+
+def preparar_version(ruta):
+    """Carga el artefacto de ``ruta``, arma su predictor e índices y lo calienta.
+
+    No toca la versión activa: el resultado se publica con ``MODELOS.publicar``.
+    """
+    inicio = marca = time.perf_counter()
+    tiempos = {}
+
+    def registrar(paso):
+        nonlocal marca
+        ahora = time.perf_counter()
+        tiempos[paso] = round((ahora - marca) * 1000, 1)
+        marca = ahora
+
+    cargado = joblib.load(ruta, mmap_mode="r" if MODEL_MMAP else None)
+    registrar("carga")
+    # Identifica el artefacto cargado; la caché se invalida cuando cambia
+    firma = firma_artefacto(ruta)
+    version = "-".join(map(str, firma))
+
+    temporales_muestra = CALENDARIO.rango(date.today(), len(DESPLAZAMIENTOS_VENTANA))
+    muestra = construir_datos_modelo(EVENTO_CALENTAMIENTO, temporales_muestra)
+    nuevo_predictor = crear_predictor(cargado, BACKEND_PREDICTOR, muestra=muestra)
+    if INFERENCIA_PROCESOS > 0:
+        if isinstance(nuevo_predictor, PredictorCompilado):
+            nuevo_predictor = PredictorProcesos(
+                nuevo_predictor, ruta, INFERENCIA_PROCESOS, mmap=MODEL_MMAP, firma=firma
+            )
+        else:
+            print("⚠️ La inferencia en procesos requiere el backend compilado; se usa inferencia en proceso")
+    registrar("predictor")
+    esperado = nuevo_predictor.predict(muestra)
+    registrar("primera_prediccion")
+    indice = IndiceCategorias.desde_modelo(cargado)
+    if indice is None:
+        print("⚠️ No se encontraron los vocabularios del modelo; sin validación ni lotes codificados")
+    elif nuevo_predictor.acepta_lotes:
+        lote = indice.lote(columnas_modelo(EVENTO_CALENTAMIENTO, temporales_muestra), len(muestra))
+        if not np.allclose(nuevo_predictor.predict(lote), esperado, rtol=1e-9, atol=0):
+            print("⚠️ Los lotes codificados no coinciden con el DataFrame; se desactiva el índice de categorías")
+            indice = None
+    # Autocompletado de artistas y géneros con los vocabularios del modelo
+    autocompletado = {
+        campo: BuscadorPrefijos(
+            [valor for valor in indice.vocabularios[campo] if isinstance(valor, str)], MAX_AUTOCOMPLETADO
+        )
+        for campo in COLUMNAS_VALIDADAS
+        if indice is not None and campo in indice.vocabularios
+    }
+    registrar("indices")
+    nueva = VersionModelo(version, ruta, cargado, nuevo_predictor, indice, autocompletado, 0.0)
+    tiempos["calentamiento"] = calentar(nueva)
+    nueva.segundos_carga = time.perf_counter() - inicio
+    nueva.tiempos_ms = tiempos
+    print(
+        f"🔥 Modelo {version} preparado en {nueva.segundos_carga * 1000:.0f} ms: "
+        + ", ".join(f"{paso} {ms:.1f}" for paso, ms in tiempos.items() if paso != "calentamiento")
+        + "".join(
+            f" | {paso} {ms['primera']:.1f} -> {ms['ultima']:.1f}" for paso, ms in tiempos["calentamiento"].items()
+        )
+        + " (ms; calentamiento: primera -> última repetición)"
+    )
+    return nueva
+
+
+def _lote_calentamiento(version, n):
+    """``n`` filas sintéticas para ``version``: el evento de ejemplo en todas las ciudades y
+    en fechas sucesivas, con el mismo formato de entrada que usan las peticiones."""
+    temporales = CALENDARIO.consultar(np.datetime64(date.today()) + np.arange(n) % 365)
+    ciudades = np.arange(n) % len(GEOGRAFIA["municipio"])
+    evento = dict(
+        EVENTO_CALENTAMIENTO,
+        Departamento=GEOGRAFIA["departamento"][ciudades],
+        Municipio=GEOGRAFIA["municipio"][ciudades],
+        EsCapital=GEOGRAFIA["es_capital"][ciudades],
+    )
+    if version.indice is not None and version.predictor.acepta_lotes:
+        return version.indice.lote(columnas_modelo(evento, temporales), n)
+    return construir_datos_modelo(evento, temporales)
+
+
+def _pagina_calentamiento(version, fecha):
+    """La página de /predecir del evento de ejemplo para ``fecha``, atendida con ``version``."""
+    _VERSION_PETICION.set(version)
+    evento = EVENTO_CALENTAMIENTO
+    Departamento, Municipio, EsCapital = ubicar(evento["Departamento"], evento["Municipio"])
+    return renderizar_resultado(
+        fecha=fecha.isoformat(),
+        Departamento=Departamento,
+        Municipio=Municipio,
+        EsCapital=EsCapital,
+        artista="Concierto",
+        artista_nombre=evento["artista"],
+        genero=evento["genero"],
+        tipo=evento["tipo"],
+        CategoriaFunciones=evento["CategoriaFunciones"],
+        NumeroFunciones=evento["NumeroFunciones"],
+        PrecioMinimo=evento["PrecioMinimo"],
+        PrecioMaximo=evento["PrecioMaximo"],
+        cantidad_artistas_evento=evento["cantidad_artistas_evento"],
+    )
+
+
+def calentar(version):
+    """Calienta ``version`` antes de publicarla.
+
+    La primera llamada paga importaciones perezosas de sklearn/xgboost, la reserva
+    de memoria y las cachés de primera llamada del booster; aquí las paga un lote
+    sintético en vez de la primera petición. Pasa por el predictor lotes de
+    ``CALENTAMIENTO_FILAS`` filas y renderiza la página de /predecir completa
+    ``CALENTAMIENTO_REPETICIONES`` veces cada uno. Lo sintético no toca la caché
+    compartida (en una recarga vaciaría la de la versión activa) ni los microlotes
+    y no se registra en las métricas. Devuelve los ms de la primera y la última repetición de cada paso.
+    """
+    if CALENTAMIENTO_REPETICIONES <= 0:
+        return {}
+    pasos = {}
+
+    def repetir(paso, funcion):
+        tiempos = []
+        for i in range(CALENTAMIENTO_REPETICIONES):
+            inicio = time.perf_counter()
+            funcion(i)
+            tiempos.append((time.perf_counter() - inicio) * 1000)
+        pasos[paso] = {"primera": round(tiempos[0], 2), "ultima": round(tiempos[-1], 2)}
+
+    for n in CALENTAMIENTO_FILAS:
+        lote = _lote_calentamiento(version, n)
+        repetir(f"predict_{n}", lambda i: version.predictor.predict(lote))
+    # En un contexto aparte, como una petición: la versión aún no es la activa
+    contexto = contextvars.copy_context()
+    contexto.run(_CALENTANDO.set, True)
+    repetir("predecir", lambda i: contexto.run(_pagina_calentamiento, version, date.today()))
+    return pasos
+
+
+def _al_publicar(version):
+    """Actualiza los alias de módulo y las métricas cuando cambia la versión activa."""
+    global modelo, predictor, INDICE_CATEGORIAS, AUTOCOMPLETADO, VERSION_MODELO
+    modelo, predictor, VERSION_MODELO = version.modelo, version.predictor, version.version
+    INDICE_CATEGORIAS, AUTOCOMPLETADO = version.indice, version.autocompletado
+    MODELO_INFO.limpiar()
+    MODELO_INFO.fijar(1, version.version, version.predictor.nombre)
+
+
+def _al_descartar(version):
+    """Libera de la caché las predicciones de una versión que sale del historial (salvo que
+    otra versión en memoria sea el mismo artefacto)."""
+    if all(viva.version != version.version for viva in MODELOS.vivas()):
+        CACHE.descartar_version(version.version)
+
+
+MODELOS = RegistroModelos(MODELOS_ANTERIORES, al_publicar=_al_publicar, al_descartar=_al_descartar)
+_VERSION_PETICION = contextvars.ContextVar("version_modelo", default=None)
+
+
+def modelo_en_uso():
+    """Versión del modelo de la petición en curso (la fija ``modelo_listo``); fuera de
+    una petición, la activa."""
+    return _VERSION_PETICION.get() or MODELOS.activa
+
+
+def cargar_modelo():
+    """Descarga (si hace falta), carga y calienta el modelo; lo publica solo cuando está listo."""
+    global ERROR_CARGA
+    try:
+        inicio = time.perf_counter()
+        # Descargar modelo si no existe (o si no coincide con el SHA-256 configurado)
+        if asegurar_modelo(MODEL_URL, MODEL_PATH, MODEL_SHA256):
+            MODELO_DESCARGA.fijar(time.perf_counter() - inicio)
+            print(f"✅ Modelo descargado correctamente en {time.perf_counter() - inicio:.1f} s")
+
+        version = MODELOS.publicar(preparar_version(MODEL_PATH))
+        ERROR_CARGA = None
+        MODELO_CARGA.fijar(time.perf_counter() - inicio)
+        MODELO_LISTO.fijar(time.perf_counter() - _INICIO_PROCESO)
+        print(
+            f"✅ Modelo listo (backend {version.predictor.nombre}) en {time.perf_counter() - inicio:.1f} s "
+            f"({time.perf_counter() - _INICIO_PROCESO:.1f} s desde el arranque)"
+        )
+    except Exception as error:
+        ERROR_CARGA = repr(error)
+        print(f"❌ Error cargando el modelo: {error}")
+
+
+def cargar_modelo_con_reintentos(detener, espera_inicial=1.0, espera_maxima=60.0):
+    """``cargar_modelo`` hasta que funcione, con espera exponencial entre intentos.
+
+    Tras ``CARGA_INTENTOS`` fallos envía SIGTERM al propio proceso: el servidor se
+    cierra de forma ordenada y el supervisor (gunicorn, la plataforma) lo reinicia,
+    en vez de quedarse respondiendo 503 para siempre. ``detener`` corta la espera
+    al apagar el servidor.
+    """
+    espera, intento = espera_inicial, 1
+    while True:
+        if MODELOS.activa is None:
+            cargar_modelo()
+        if MODELOS.activa is not None or detener.is_set():
+            return
+        if CARGA_INTENTOS and intento >= CARGA_INTENTOS:
+            print(f"❌ El modelo no cargó tras {intento} intentos; se termina el proceso")
+            os.kill(os.getpid(), signal.SIGTERM)
+            return
+        print(f"⚠️ Intento {intento} de carga fallido; reintentando en {espera:.0f} s")
+        if detener.wait(espera):
+            return
+        espera, intento = min(espera * 2, espera_maxima), intento + 1
+
+
+async def modelo_listo():
+    """Dependencia de las rutas que usan el modelo: 503 rápido mientras no esté cargado.
+
+    Fija la versión activa para el resto de la petición: aunque se publique otra
+    mientras tanto, la petición termina con la misma (el ejecutor de inferencia
+    copia el contexto al hilo que la atiende).
+    """
+    version = MODELOS.activa
+    if version is None:
+        raise HTTPException(
+            status_code=503,
+            detail="El modelo se está cargando" if ERROR_CARGA is None else "El modelo no pudo cargarse",
+            headers={"Retry-After": str(RETRY_AFTER_SEGUNDOS)},
+        )
+    _VERSION_PETICION.set(version)
+
+
+if PRECARGAR_MODELO:
+    cargar_modelo()
+    # Saca los objetos ya creados del recolector para que no toque (y copie) sus páginas tras el fork
+    gc.freeze()
+
+
+@asynccontextmanager
+async def lifespan(app):
+    # La carga corre en un hilo para que uvicorn abra el puerto sin esperarla
+    detener = threading.Event()
+    if MODELOS.activa is None:
+        app.state.carga_modelo = asyncio.create_task(asyncio.to_thread(cargar_modelo_con_reintentos, detener))
+    print(f"🚀 Aceptando conexiones {time.perf_counter() - _INICIO_PROCESO:.2f} s después del arranque")
+    yield
+    detener.set()
+
+
+app = FastAPI(lifespan=lifespan)
+if METRICAS:
+    app.add_middleware(MiddlewareMetricas, peticiones=PETICIONES, latencia=LATENCIA_PETICIONES)
+
+
+def predecir_modelo(datos, version=None):
+    """Llamada directa al predictor de ``version`` (por defecto, la de la petición),
+    medida como etapa "predict" y por tamaño de lote."""
+    predictor_en_uso = (version or modelo_en_uso()).predictor
+    if not medir_metricas():
+        return predictor_en_uso.predict(datos)
+    FILAS_POR_LOTE.observar(len(datos))
+    with ETAPAS.medir("predict"):
+        return predictor_en_uso.predict(datos)
+
+
+def _consultar_cache(datos):
+    """``(preds, faltantes, claves)`` de las filas de ``datos`` en la caché; ``None`` si
+    la caché no se usa."""
+    if not CACHE.activa or _CALENTANDO.get():
+        return None
+    with etapa("cache"):
+        claves = claves_filas(datos)
+        preds, faltantes = CACHE.obtener(claves, modelo_en_uso().version)
+    return preds, faltantes, claves
+
+
+def _completar_cache(en_cache, nuevas):
+    """Completa las predicciones de ``en_cache`` con ``nuevas`` (las de las filas que
+    faltaban) y las guarda."""
+    preds, faltantes, claves = en_cache
+    preds[faltantes] = nuevas
+    CACHE.guardar([c for c, f in zip(claves, faltantes) if f], nuevas, modelo_en_uso().version)
+    return preds
+
+
+def _filas_faltantes(datos, faltantes):
+    return datos.seleccionar(faltantes) if isinstance(datos, LoteCodificado) else datos[faltantes]
+
+
+def predecir_filas(datos):
+    """Predice cada fila de ``datos``; solo las filas que no están en la caché van al modelo."""
+    en_cache = _consultar_cache(datos)
+    if en_cache is None:
+        return predecir_modelo(datos)
+    preds, faltantes, _ = en_cache
+    if not faltantes.any():
+        return preds
+    return _completar_cache(en_cache, predecir_modelo(_filas_faltantes(datos, faltantes)))
+
+
+async def predecir_filas_en_microlotes(construir):
+    """Como ``predecir_filas(construir())``, pero el modelo se evalúa en un microlote.
+
+    ``construir`` arma las filas y se consultan en la caché en el ejecutor de inferencia;
+    las que faltan se encolan en ``PLANIFICADOR`` y la petición espera el resultado en el
+    event loop, sin ocupar un hilo del ejecutor (solo se agrupan filas de la misma versión).
+    """
+
+    def preparar():
+        datos = construir()
+        return datos, _consultar_cache(datos)
+
+    datos, en_cache = await en_ejecutor(preparar)
+    if en_cache is not None:
+        preds, faltantes, _ = en_cache
+        if not faltantes.any():
+            return preds
+        datos_modelo = _filas_faltantes(datos, faltantes)
+    else:
+        datos_modelo = datos
+    if len(datos_modelo) < PLANIFICADOR.max_filas:
+        nuevas = await asyncio.wrap_future(PLANIFICADOR.encolar(datos_modelo, modelo_en_uso()))
+    else:
+        nuevas = await en_ejecutor(predecir_modelo, datos_modelo)
+    return nuevas if en_cache is None else _completar_cache(en_cache, nuevas)
+
+
+def ventana_representable(fecha):
+    """Verdadero si todas las fechas de la ventana de ±2 días de ``fecha`` existen
+    (entre ``date.min`` y ``date.max``)."""
+    return (
+        (fecha - date.min).days >= -DESPLAZAMIENTOS_VENTANA[0]
+        and (date.max - fecha).days >= DESPLAZAMIENTOS_VENTANA[-1]
+    )
+
+
+def resumir_ventanas(preds):
+    """Resume una matriz de predicciones (escenarios x días de la ventana).
+
+    Los índices corresponden a la primera aparición del máximo y del mínimo, igual
+    que el recorrido fila a fila original.
+    """
+    return {
+        "idx_max": np.argmax(preds, axis=1),
+        "idx_min": np.argmin(preds, axis=1),
+        "promedio": preds.mean(axis=1),
+    }
+
+
+def renderizar_home():
     opciones_departamentos = ""
     for dept in sorted(DEPARTAMENTOS_MUNICIPIOS.keys()):
         opciones_departamentos += f'<option value="{dept}">{dept}</option>\n'
@@ -287,7 +872,7 @@ def home():
         </style>
         <script>
             const municipiosPorDepartamento = {json.dumps(DEPARTAMENTOS_MUNICIPIOS)};
-            const capitales = {json.dumps(CAPITALES)};
+            const capitales = new Set({json.dumps(CAPITALES)});
             
             function cargarMunicipios() {{
                 const deptSelect = document.getElementById('Departamento');
@@ -314,7 +899,7 @@ def home():
                 const esCapitalSelect = document.getElementById('EsCapital');
                 const municipio = munSelect.value;
                 
-                if (capitales.includes(municipio)) {{
+                if (capitales.has(municipio)) {{
                     esCapitalSelect.value = '1';
                 }} else {{
                     esCapitalSelect.value = '0';
@@ -452,12 +1037,108 @@ def home():
     </html>
     """
 
-@app.post("/predecir", response_class=HTMLResponse)
-def predecir(
+
+# La página de inicio no depende de la petición: se renderiza y comprime una sola vez
+PAGINA_HOME = RecursoEstatico(renderizar_home(), "text/html; charset=utf-8")
+
+# Recursos de la página de resultados, con huella de contenido en el nombre
+ESTATICOS = RecursosVersionados()
+ESTATICOS.registrar_archivo(os.path.join(DIRECTORIO_BASE, "static", "resultado.css"), "text/css; charset=utf-8")
+ESTATICOS.registrar_archivo(os.path.join(DIRECTORIO_BASE, "static", "resultado.js"), "text/javascript; charset=utf-8")
+ESTATICOS.registrar(
+    "geografia.js",
+    f"const municipiosPorDepartamento = {json.dumps(DEPARTAMENTOS_MUNICIPIOS)};\n"
+    f"const capitales = new Set({json.dumps(CAPITALES)});\n",
+    "text/javascript; charset=utf-8",
+)
+
+DEPARTAMENTOS_ORDENADOS = sorted(DEPARTAMENTOS_MUNICIPIOS)
+PLANTILLAS = Environment(
+    loader=FileSystemLoader(os.path.join(DIRECTORIO_BASE, "templates")),
+    autoescape=select_autoescape(["html"]),
+)
+PLANTILLAS.globals["url_estatico"] = ESTATICOS.url
+PLANTILLA_RESULTADO = PLANTILLAS.get_template("resultado.html")
+
+
+@app.get("/", response_class=HTMLResponse)
+async def home(request: Request):
+    # Sin trabajo bloqueante: se atiende en el event loop, sin pasar por el threadpool
+    return PAGINA_HOME.responder(request)
+
+
+@app.get("/static/{archivo}")
+async def estatico(archivo: str, request: Request):
+    recurso = ESTATICOS.obtener(archivo)
+    if recurso is None:
+        raise HTTPException(status_code=404)
+    return recurso.responder(request)
+
+
+@app.get("/healthz")
+def healthz():
+    return {"estado": "vivo"}
+
+
+@app.get("/readyz")
+def readyz():
+    version = MODELOS.activa
+    if version is None:
+        return JSONResponse(
+            {"estado": "cargando" if ERROR_CARGA is None else "error", "error": ERROR_CARGA},
+            status_code=503,
+            headers={"Retry-After": str(RETRY_AFTER_SEGUNDOS)},
+        )
+    respuesta = {"estado": "listo", "version_modelo": version.version, "backend": version.predictor.nombre}
+    if isinstance(version.predictor, PredictorProcesos):
+        respuesta["trabajadores"] = trabajadores = version.predictor.estado()
+        if trabajadores["disponibles"] == 0:
+            return JSONResponse(dict(respuesta, estado="sin_trabajadores"), status_code=503)
+    return respuesta
+
+
+async def en_ejecutor(funcion, *args, **kwargs):
+    """Corre ``funcion`` en el ejecutor de inferencia; 429 inmediato si la cola está llena."""
+    try:
+        return await EJECUTOR.ejecutar(funcion, *args, **kwargs)
+    except ColaLlena:
+        raise HTTPException(
+            status_code=429,
+            detail="Servidor saturado, intente de nuevo en unos segundos",
+            headers={"Retry-After": "1"},
+        )
+
+
+def validar_categorias(evento):
+    """422 antes de evaluar si ``evento`` trae valores que el modelo no puede usar (ver
+    ``CATEGORIAS_DESCONOCIDAS``); cuenta los desconocidos aceptados en las métricas."""
+    indice = modelo_en_uso().indice
+    if indice is None:
+        return
+    rechazar = CATEGORIAS_DESCONOCIDAS == "rechazar"
+    desconocidas = indice.desconocidas(evento, COLUMNAS_VALIDADAS)
+    rechazadas = {
+        campo: valor
+        for campo, valor in desconocidas.items()
+        if rechazar or not indice.aceptan_desconocidas[campo]
+    }
+    if METRICAS:
+        for campo in desconocidas:
+            DESCONOCIDAS.inc(campo, "rechazada" if campo in rechazadas else "ignorada")
+    if rechazadas:
+        raise HTTPException(
+            status_code=422,
+            detail="Valores desconocidos para el modelo: "
+            + ", ".join(f"{campo}={valor!r}" for campo, valor in rechazadas.items()),
+        )
+
+
+@app.post("/predecir", response_class=HTMLResponse, dependencies=[Depends(modelo_listo)])
+async def predecir(
     fecha: str = Form(...),
     Departamento: str = Form(...),
     Municipio: str = Form(...),
-    EsCapital: str = Form(...),
+    EsCapital: str | None = Form(None),
     artista: str = Form(...),
     artista_nombre: str = Form(...),
     genero: str = Form(...),
@@ -468,636 +1149,842 @@ def predecir(
     PrecioMaximo: float = Form(...),
     cantidad_artistas_evento: int = Form(...),
 ):
-    fecha_base = datetime.strptime(fecha, "%Y-%m-%d")
-    fechas = [fecha_base + timedelta(days=i) for i in range(-2, 3)]
-
-    predicciones = []
-    max_pred = 0.0
-    min_pred = float("inf")
-    fecha_max = ""
-    fecha_min = ""
-
-    for fecha_pred in fechas:
-        f_str = fecha_pred.strftime("%Y-%m-%d")
-        features = calcular_features_temporales(f_str)
-        datos = pd.DataFrame(
-            [
-                {
-                    "Departamento": Departamento,
-                    "Municipio": Municipio,
-                    "DiaSemana": features["dia_semana"],
-                    "CategoriaFunciones": CategoriaFunciones,
-                    "EsCapital": EsCapital,
-                    "artista": artista_nombre,
-                    "genero": genero,
-                    "tipo": tipo,
-                    "Año": features["anio"],
-                    "SemanaDelAño_sin": features["semana_sin"],
-                    "SemanaDelAño_cos": features["semana_cos"],
-                    "DiaDelAño_sin": features["dia_sin"],
-                    "DiaDelAño_cos": features["dia_cos"],
-                    "NumeroFunciones": NumeroFunciones,
-                    "PrecioMinimo": PrecioMinimo,
-                    "PrecioMaximo": PrecioMaximo,
-                    "cantidad_artistas_evento": cantidad_artistas_evento,
-                }
-            ]
-        )
+    try:
+        fecha_valida = ventana_representable(datetime.strptime(fecha, "%Y-%m-%d").date())
+    except ValueError:
+        fecha_valida = False
+    if not fecha_valida:
+        raise HTTPException(status_code=422, detail=f"Fecha inválida o fuera de rango: {fecha!r}")
+    Departamento, Municipio, EsCapital = ubicar(Departamento, Municipio, EsCapital)
+    evento = evento_resultado(
+        Departamento,
+        Municipio,
+        EsCapital,
+        artista_nombre,
+        genero,
+        tipo,
+        CategoriaFunciones,
+        NumeroFunciones,
+        PrecioMinimo,
+        PrecioMaximo,
+        cantidad_artistas_evento,
+    )
+    validar_categorias(evento)
+    preds = None
+    if PLANIFICADOR is not None:
+        preds = await predecir_filas_en_microlotes(lambda: construir_lote(evento, ventana_resultado(fecha)[2]))
+    funcion = renderizar_resultado
+    if PERFILADOR is not None and PERFILADOR.activo:
+        funcion = PERFILADOR.envolver(funcion)
+    return await en_ejecutor(
+        funcion,
+        preds=preds,
+        fecha=fecha,
+        Departamento=Departamento,
+        Municipio=Municipio,
+        EsCapital=EsCapital,
+        artista=artista,
+        artista_nombre=artista_nombre,
+        genero=genero,
+        tipo=tipo,
+        CategoriaFunciones=CategoriaFunciones,
+        NumeroFunciones=NumeroFunciones,
+        PrecioMinimo=PrecioMinimo,
+        PrecioMaximo=PrecioMaximo,
+        cantidad_artistas_evento=cantidad_artistas_evento,
+    )
+
+
+def evento_resultado(
+    Departamento,
+    Municipio,
+    EsCapital,
+    artista_nombre,
+    genero,
+    tipo,
+    CategoriaFunciones,
+    NumeroFunciones,
+    PrecioMinimo,
+    PrecioMaximo,
+    cantidad_artistas_evento,
+):
+    """Evento del formulario de /predecir con los nombres de columna del modelo."""
+    return {
+        "Departamento": Departamento,
+        "Municipio": Municipio,
+        "CategoriaFunciones": CategoriaFunciones,
+        "EsCapital": EsCapital,
+        "artista": artista_nombre,
+        "genero": genero,
+        "tipo": tipo,
+        "NumeroFunciones": NumeroFunciones,
+        "PrecioMinimo": PrecioMinimo,
+        "PrecioMaximo": PrecioMaximo,
+        "cantidad_artistas_evento": cantidad_artistas_evento,
+    }
 
-        pred = modelo.predict(datos)
-        pred_val = float(pred[0])
 
-        if pred_val > max_pred:
-            max_pred = pred_val
-            fecha_max = features["fecha_corta"]
-        if pred_val < min_pred:
-            min_pred = pred_val
-            fecha_min = features["fecha_corta"]
+def ventana_resultado(fecha):
+    """``(fecha elegida, fechas de la ventana de ±2 días, sus features temporales)``."""
+    with etapa("features"):
+        fecha_base = datetime.strptime(fecha, "%Y-%m-%d")
+        fechas = [fecha_base + timedelta(days=i) for i in DESPLAZAMIENTOS_VENTANA]
+        temporales = CALENDARIO.rango(fechas[0], len(fechas))
+    return fecha_base, fechas, temporales
 
-        predicciones.append(
-            {
-                "fecha": features["fecha_formateada"],
-                "fecha_corta": features["fecha_corta"],
-                "dia_semana": features["dia_semana_es"],
-                "prediccion": pred_val,
-                "es_fecha_seleccionada": fecha_pred.date() == fecha_base.date(),
-            }
+
+def renderizar_resultado(
+    fecha,
+    Departamento,
+    Municipio,
+    EsCapital,
+    artista,
+    artista_nombre,
+    genero,
+    tipo,
+    CategoriaFunciones,
+    NumeroFunciones,
+    PrecioMinimo,
+    PrecioMaximo,
+    cantidad_artistas_evento,
+    preds=None,
+):
+    """Predice la ventana de ±2 días y renderiza la página de resultados (bloqueante).
+
+    Con ``preds`` (las predicciones de la ventana, ya calculadas en un microlote) solo renderiza.
+    """
+    fecha_base, fechas, temporales = ventana_resultado(fecha)
+    if preds is None:
+        evento = evento_resultado(
+            Departamento,
+            Municipio,
+            EsCapital,
+            artista_nombre,
+            genero,
+            tipo,
+            CategoriaFunciones,
+            NumeroFunciones,
+            PrecioMinimo,
+            PrecioMaximo,
+            cantidad_artistas_evento,
         )
+        # Una sola llamada al modelo para toda la ventana (solo con las filas fuera de la caché)
+        preds = predecir_filas(construir_lote(evento, temporales))
+    resumen = resumir_ventanas(preds.reshape(1, -1))
 
-    promedio = sum(p["prediccion"] for p in predicciones) / len(predicciones)
+    # Mismas reglas que el recorrido fila a fila original (máximo con piso en 0)
+    idx_max = int(resumen["idx_max"][0])
+    idx_min = int(resumen["idx_min"][0])
+    max_pred = max(float(preds[idx_max]), 0.0)
+    min_pred = float(preds[idx_min])
+    fecha_max = temporales["fecha_corta"][idx_max] if preds[idx_max] > 0 else ""
+    fecha_min = temporales["fecha_corta"][idx_min]
+
+    predicciones = [
+        {
+            "fecha": temporales["fecha_formateada"][i],
+            "fecha_corta": temporales["fecha_corta"][i],
+            "dia_semana": temporales["dia_semana_es"][i],
+            "prediccion": float(preds[i]),
+            "es_fecha_seleccionada": fecha_pred.date() == fecha_base.date(),
+        }
+        for i, fecha_pred in enumerate(fechas)
+    ]
+
+    promedio = float(resumen["promedio"][0])
     precio_promedio = (PrecioMinimo + PrecioMaximo) / 2
     ingresos_estimados = int(promedio * precio_promedio)
 
     max_valor = max(p["prediccion"] for p in predicciones) if predicciones else 1
     min_valor = min(p["prediccion"] for p in predicciones) if predicciones else 0
     rango = max_valor - min_valor if max_valor > min_valor else 1
-    datos_grafico = ""
-    etiquetas_grafico = ""
-    for p in predicciones:
-        pred = float(p["prediccion"])
-        altura_normalizada = ((pred - min_valor) / rango) if rango > 0 else 0.5
-        altura = 30 + (altura_normalizada * 70)
-        color = "#7e57c2" if p["es_fecha_seleccionada"] else "#b39ddb"
-        valor = int(pred)
-        datos_grafico += f"""
-            <div class="bar-wrapper">
-                <div class="bar-value">{valor}</div>
-                <div class="bar" style="height: {altura}%; background: {color};"></div>
-            </div>
-        """
+    barras = [
+        {
+            "valor": int(p["prediccion"]),
+            "altura": 30 + (((p["prediccion"] - min_valor) / rango) if rango > 0 else 0.5) * 70,
+            "color": "#7e57c2" if p["es_fecha_seleccionada"] else "#b39ddb",
+            "dia_semana": p["dia_semana"],
+            "fecha_corta": p["fecha_corta"],
+        }
+        for p in predicciones
+    ]
 
-        etiquetas_grafico += f"""
-            <div class="bar-label">
-                <strong>{p["dia_semana"][:3]}</strong><br>
-                {p["fecha_corta"]}
-            </div>
-        """
+    # Solo datos dinámicos: CSS, JS y geografía se sirven aparte como recursos versionados
+    with etapa("render"):
+        return PLANTILLA_RESULTADO.render(
+            fecha=fecha,
+            Departamento=Departamento,
+            Municipio=Municipio,
+            EsCapital=EsCapital,
+            artista=artista,
+            artista_nombre=artista_nombre,
+            genero=genero,
+            tipo=tipo,
+            CategoriaFunciones=CategoriaFunciones,
+            NumeroFunciones=NumeroFunciones,
+            PrecioMinimo=PrecioMinimo,
+            PrecioMaximo=PrecioMaximo,
+            cantidad_artistas_evento=cantidad_artistas_evento,
+            departamentos=DEPARTAMENTOS_ORDENADOS,
+            municipios=DEPARTAMENTOS_MUNICIPIOS.get(Departamento, []),
+            promedio=promedio,
+            max_pred=max_pred,
+            min_pred=min_pred,
+            fecha_max=fecha_max,
+            fecha_min=fecha_min,
+            ingresos_estimados=ingresos_estimados,
+            barras=barras,
+        )
 
-    opciones_departamentos = ""
-    for dept in sorted(DEPARTAMENTOS_MUNICIPIOS.keys()):
-        selected = 'selected' if dept == Departamento else ''
-        opciones_departamentos += f'<option value="{dept}" {selected}>{dept}</option>\n'
 
-    opciones_municipios = ""
-    if Departamento in DEPARTAMENTOS_MUNICIPIOS:
-        for mun in DEPARTAMENTOS_MUNICIPIOS[Departamento]:
-            selected = 'selected' if mun == Municipio else ''
-            opciones_municipios += f'<option value="{mun}" {selected}>{mun}</option>\n'
+# ---------------------------------------------------------------------------
+# API JSON
+# ---------------------------------------------------------------------------
 
-    return f"""
-    <!DOCTYPE html>
-    <html lang="es">
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>EventIA - {artista}</title>
-        <style>
-            * {{
-                margin: 0;
-                padding: 0;
-                box-sizing: border-box;
-            }}
-            
-            body {{
-                font-family: 'Inter', -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif;
-                background: linear-gradient(135deg, #e8eaf6 0%, #f3e5f5 100%);
-                min-height: 100vh;
-                padding: 20px;
-            }}
-            
-            .header {{
-                text-align: center;
-                margin-bottom: 30px;
-            }}
-            
-            .header h1 {{
-                font-size: 3em;
-                font-weight: 700;
-                color: #1a237e;
-                margin-bottom: 5px;
-            }}
-            
-            .header p {{
-                color: #5e35b1;
-                font-size: 1.1em;
-            }}
-            
-            .main-container {{
-                max-width: 1400px;
-                margin: 0 auto;
-                display: grid;
-                grid-template-columns: 500px 1fr;
-                gap: 20px;
-            }}
-            
-            .form-panel {{
-                background: white;
-                border-radius: 16px;
-                box-shadow: 0 4px 20px rgba(0,0,0,0.08);
-                overflow: hidden;
-            }}
-            
-            .form-header {{
-                background: linear-gradient(135deg, #5e35b1 0%, #7e57c2 100%);
-                color: white;
-                padding: 20px 30px;
-                font-size: 1.2em;
-                font-weight: 600;
-                display: flex;
-                align-items: center;
-                gap: 10px;
-            }}
-            
-            .form-body {{
-                padding: 30px;
-                max-height: calc(100vh - 200px);
-                overflow-y: auto;
-            }}
-            
-            .form-group {{
-                margin-bottom: 20px;
-            }}
-            
-            .form-group label {{
-                display: block;
-                font-weight: 600;
-                color: #424242;
-                margin-bottom: 8px;
-                font-size: 0.9em;
-            }}
-            
-            .form-group input,
-            .form-group select {{
-                width: 100%;
-                padding: 12px 14px;
-                border: 2px solid #e0e0e0;
-                border-radius: 8px;
-                font-size: 1em;
-                transition: all 0.3s;
-                background: white;
-            }}
-            
-            .form-group input:focus,
-            .form-group select:focus {{
-                outline: none;
-                border-color: #5e35b1;
-                box-shadow: 0 0 0 3px rgba(94, 53, 177, 0.1);
-            }}
-            
-            .form-row {{
-                display: grid;
-                grid-template-columns: 1fr 1fr;
-                gap: 15px;
-            }}
-            
-            .section-title {{
-                font-size: 0.85em;
-                font-weight: 700;
-                color: #5e35b1;
-                text-transform: uppercase;
-                letter-spacing: 0.5px;
-                margin: 25px 0 15px 0;
-                padding-bottom: 8px;
-                border-bottom: 2px solid #e8eaf6;
-            }}
-            
-            .submit-btn {{
-                width: 100%;
-                padding: 16px;
-                background: linear-gradient(135deg, #43a047 0%, #66bb6a 100%);
-                color: white;
-                border: none;
-                border-radius: 10px;
-                font-size: 1.1em;
-                font-weight: 600;
-                cursor: pointer;
-                transition: all 0.3s;
-                margin-top: 20px;
-                display: flex;
-                align-items: center;
-                justify-content: center;
-                gap: 10px;
-            }}
-            
-            .submit-btn:hover {{
-                transform: translateY(-2px);
-                box-shadow: 0 8px 20px rgba(67, 160, 71, 0.3);
-            }}
-            
-            .results-panel {{
-                background: white;
-                border-radius: 16px;
-                box-shadow: 0 4px 20px rgba(0,0,0,0.08);
-                overflow: hidden;
-            }}
-            
-            .results-header {{
-                background: linear-gradient(135deg, #7e57c2 0%, #9575cd 100%);
-                color: white;
-                padding: 20px 30px;
-                display: flex;
-                justify-content: space-between;
-                align-items: center;
-            }}
-            
-            .results-header h2 {{
-                font-size: 1.3em;
-                font-weight: 600;
-            }}
-            
-            .results-body {{
-                padding: 30px;
-            }}
-            
-            .metrics-grid {{
-                display: grid;
-                grid-template-columns: repeat(5, 1fr);
-                gap: 15px;
-                margin-bottom: 30px;
-            }}
-            
-            .metric-card {{
-                text-align: center;
-                padding: 20px 10px;
-            }}
-            
-            .metric-icon {{
-                font-size: 2em;
-                margin-bottom: 10px;
-            }}
-            
-            .metric-value {{
-                font-size: 2em;
-                font-weight: 700;
-                color: #1a237e;
-                line-height: 1;
-                margin-bottom: 5px;
-            }}
-            
-            .metric-label {{
-                font-size: 0.75em;
-                color: #757575;
-                font-weight: 500;
-            }}
-            
-            .metric-sublabel {{
-                font-size: 0.7em;
-                color: #9e9e9e;
-            }}
-            
-            .chart-section {{
-                background: #fafafa;
-                border-radius: 12px;
-                padding: 25px;
-            }}
+class ConfiguracionEvento(BaseModel):
+    """Campos del formulario de /predecir que no dependen del lugar ni de la fecha."""
 
-            .chart-header {{
-                display: flex;
-                justify-content: space-between;
-                align-items: center;
-                margin-bottom: 20px;
-            }}
+    artista: str = ""
+    artista_nombre: str
+    genero: str
+    tipo: str
+    CategoriaFunciones: str
+    NumeroFunciones: int
+    PrecioMinimo: float
+    PrecioMaximo: float
+    cantidad_artistas_evento: int
 
-            .chart-title {{
-                font-size: 1.1em;
-                font-weight: 600;
-                color: #424242;
-            }}
+    def a_evento(self):
+        return {
+            "CategoriaFunciones": self.CategoriaFunciones,
+            "artista": self.artista_nombre,
+            "genero": self.genero,
+            "tipo": self.tipo,
+            "NumeroFunciones": self.NumeroFunciones,
+            "PrecioMinimo": self.PrecioMinimo,
+            "PrecioMaximo": self.PrecioMaximo,
+            "cantidad_artistas_evento": self.cantidad_artistas_evento,
+        }
 
-            .chart-dates {{
-                display: flex;
-                gap: 15px;
-                font-size: 0.85em;
-            }}
 
-            .date-badge {{
-                padding: 6px 12px;
-                border-radius: 6px;
-                font-weight: 500;
-            }}
+class ParametrosEvento(ConfiguracionEvento):
+    """Campos del formulario de /predecir que describen el evento (todos salvo la fecha)."""
 
-            .date-badge.max {{
-                background: #e8f5e9;
-                color: #2e7d32;
-            }}
+    Departamento: str
+    Municipio: str
+    # Solo se usa para municipios fuera de la tabla de geografía (ver ``ubicar``)
+    EsCapital: str | None = None
 
-            .date-badge.min {{
-                background: #ffebee;
-                color: #c62828;
-            }}
+    def a_evento(self):
+        departamento, municipio, es_capital = ubicar(self.Departamento, self.Municipio, self.EsCapital)
+        return {
+            "Departamento": departamento,
+            "Municipio": municipio,
+            "EsCapital": es_capital,
+            **super().a_evento(),
+        }
 
-            .chart-container {{
-                height: 250px;
-                display: flex;
-                align-items: flex-end;
-                justify-content: space-around;
-                gap: 10px;
-                margin-bottom: 15px;
-                padding: 20px;
-                background: white;
-                border-radius: 8px;
-            }}
 
-            .bar-wrapper {{
-                flex: 1;
-                max-width: 80px;
-                height: 100%;
-                display: flex;
-                flex-direction: column;
-                align-items: center;
-                justify-content: flex-end;
-                gap: 6px;
-            }}
+class EscenarioEvento(ParametrosEvento):
+    """Mismos campos que el formulario de /predecir."""
 
-            .bar-value {{
-                font-size: 0.8em;
-                color: #424242;
-                font-weight: 600;
-            }}
+    fecha: date
 
-            .bar {{
-                width: 100%;
-                border-radius: 8px 8px 0 0;
-                transition: all 0.3s;
-                cursor: pointer;
-            }}
+    @field_validator("fecha")
+    @classmethod
+    def _ventana_en_rango(cls, fecha):
+        if not ventana_representable(fecha):
+            raise ValueError("la ventana de ±2 días se sale del rango de fechas")
+        return fecha
 
-            .bar:hover {{
-                opacity: 0.85;
-                transform: translateY(-4px);
-            }}
 
-            .chart-labels {{
-                display: flex;
-                justify-content: space-around;
-                gap: 10px;
-                padding: 0 20px;
-            }}
+class BarridoFechas(ParametrosEvento):
+    """Evento a evaluar en cada día de ``fecha_inicio`` a ``fecha_fin`` (ambas incluidas)."""
 
-            .bar-label {{
-                flex: 1;
-                max-width: 80px;
-                text-align: center;
-                font-size: 0.75em;
-                color: #757575;
-                font-weight: 400;
-                line-height: 1.3;
-            }}
+    fecha_inicio: date
+    fecha_fin: date
+    top_k: int = 10
 
-            .bar-label strong {{
-                color: #424242;
-                font-weight: 600;
-                font-size: 1.1em;
-            }}
-            
-            @media (max-width: 1200px) {{
-                .main-container {{
-                    grid-template-columns: 1fr;
-                }}
-                
-                .metrics-grid {{
-                    grid-template-columns: repeat(3, 1fr);
-                }}
-            }}
-            
-            @media (max-width: 768px) {{
-                .metrics-grid {{
-                    grid-template-columns: repeat(2, 1fr);
-                }}
-            }}
-        </style>
-        <script>
-            const municipiosPorDepartamento = {json.dumps(DEPARTAMENTOS_MUNICIPIOS)};
-            const capitales = {json.dumps(CAPITALES)};
-            
-            function cargarMunicipios() {{
-                const deptSelect = document.getElementById('Departamento');
-                const munSelect = document.getElementById('Municipio');
-                const departamento = deptSelect.value;
-                
-                munSelect.innerHTML = '<option value="">Seleccionar municipio</option>';
-                
-                if (departamento && municipiosPorDepartamento[departamento]) {{
-                    municipiosPorDepartamento[departamento].forEach(mun => {{
-                        const option = document.createElement('option');
-                        option.value = mun;
-                        option.textContent = mun;
-                        munSelect.appendChild(option);
-                    }});
-                }}
-            }}
-            
-            function verificarCapital() {{
-                const munSelect = document.getElementById('Municipio');
-                const esCapitalSelect = document.getElementById('EsCapital');
-                const municipio = munSelect.value;
-                
-                if (capitales.includes(municipio)) {{
-                    esCapitalSelect.value = '1';
-                }} else {{
-                    esCapitalSelect.value = '0';
-                }}
-            }}
-            
-            window.onload = function() {{
-                cargarMunicipios();
-                document.getElementById('Municipio').value = '{Municipio}';
-            }};
-        </script>
-    </head>
-    <body>
-        <div class="header">
-            <h1>EventIA</h1>
-            <p>Sistema de Gestión y Análisis de Eventos</p>
-        </div>
-        
-        <div class="main-container">
-            <div class="form-panel">
-                <div class="form-header">
-                    🎵 Configuración del Evento
-                </div>
-                <div class="form-body">
-                    <form action="/predecir" method="post">
-                        <div class="form-group">
-                            <label for="artista">Evento</label>
-                            <input type="text" id="artista" name="artista" value="{artista}" required>
-                        </div>
-                        
-                        <div class="section-title">📍 Lugar</div>
-                        
-                        <div class="form-row">
-                            <div class="form-group">
-                                <label for="Departamento">Departamento</label>
-                                <select id="Departamento" name="Departamento" onchange="cargarMunicipios()" required>
-                                    <option value="">Seleccionar departamento</option>
-                                    {opciones_departamentos}
-                                </select>
-                            </div>
-                            <div class="form-group">
-                                <label for="Municipio">Municipio</label>
-                                <select id="Municipio" name="Municipio" onchange="verificarCapital()" required>
-                                    <option value="">Seleccionar municipio</option>
-                                    {opciones_municipios}
-                                </select>
-                            </div>
-                        </div>
-                        
-                        <div class="form-group">
-                            <label for="EsCapital">¿Es Capital?</label>
-                            <select id="EsCapital" name="EsCapital" required>
-                                <option value="">Seleccione...</option>
-                                <option value="1" {"selected" if EsCapital == "1" else ""}>Sí</option>
-                                <option value="0" {"selected" if EsCapital == "0" else ""}>No</option>
-                            </select>
-                        </div>
-                        
-                        <div class="section-title">📅 Fecha</div>
-                        
-                        <div class="form-group">
-                            <label for="fecha">Fecha del Evento</label>
-                            <input type="date" id="fecha" name="fecha" value="{fecha}" required>
-                        </div>
-                        
-                        <div class="section-title">🎤 Artistas</div>
-                        
-                        <div class="form-row">
-                            <div class="form-group">
-                                <label for="artista_nombre">Artista Principal</label>
-                                <input type="text" id="artista_nombre" name="artista_nombre" value="{artista_nombre}" required>
-                            </div>
-                            <div class="form-group">
-                                <label for="cantidad_artistas_evento">Cantidad de Artistas</label>
-                                <input type="number" id="cantidad_artistas_evento" name="cantidad_artistas_evento" min="1" value="{cantidad_artistas_evento}" required>
-                            </div>
-                        </div>
-                        
-                        <div class="section-title">🏷️ Géneros</div>
-                        
-                        <div class="form-row">
-                            <div class="form-group">
-                                <label for="genero">Género Musical</label>
-                                <input type="text" id="genero" name="genero" value="{genero}" required>
-                            </div>
-                            <div class="form-group">
-                                <label for="tipo">Tipo</label>
-                                <select id="tipo" name="tipo" required>
-                                    <option value="">Seleccione...</option>
-                                    <option value="Mixto" {"selected" if tipo == "Mixto" else ""}>Mixto</option>
-                                    <option value="Nacional" {"selected" if tipo == "Nacional" else ""}>Nacional</option>
-                                    <option value="Internacional" {"selected" if tipo == "Internacional" else ""}>Internacional</option>
-                                </select>
-                            </div>
-                        </div>
-                        
-                        <div class="section-title">🎟️ Secciones y Precios (COP)</div>
-                        
-                        <div class="form-group">
-                            <label for="CategoriaFunciones">Categoría de Funciones</label>
-                            <select id="CategoriaFunciones" name="CategoriaFunciones" required>
-                                <option value="">Seleccione...</option>
-                                <option value="Unica" {"selected" if CategoriaFunciones == "Unica" else ""}>Única</option>
-                                <option value="Pocas" {"selected" if CategoriaFunciones == "Pocas" else ""}>Pocas</option>
-                                <option value="Varias" {"selected" if CategoriaFunciones == "Varias" else ""}>Varias</option>
-                                <option value="Muchas" {"selected" if CategoriaFunciones == "Muchas" else ""}>Muchas</option>
-                            </select>
-                        </div>
-                        
-                        <div class="form-group">
-                            <label for="NumeroFunciones">Número de Funciones</label>
-                            <input type="number" id="NumeroFunciones" name="NumeroFunciones" min="1" value="{NumeroFunciones}" required>
-                        </div>
-                        
-                        <div class="form-row">
-                            <div class="form-group">
-                                <label for="PrecioMinimo">Precio Mínimo</label>
-                                <input type="number" id="PrecioMinimo" name="PrecioMinimo" step="1000" min="0" value="{int(PrecioMinimo)}" required>
-                            </div>
-                            <div class="form-group">
-                                <label for="PrecioMaximo">Precio Máximo</label>
-                                <input type="number" id="PrecioMaximo" name="PrecioMaximo" step="1000" min="0" value="{int(PrecioMaximo)}" required>
-                            </div>
-                        </div>
-                        
-                        <button type="submit" class="submit-btn">
-                            ▶ Simular Evento
-                        </button>
-                    </form>
-                </div>
-            </div>
-            
-            <div class="results-panel">
-                <div class="results-header">
-                    <h2>{artista}</h2>
-                    <div style="display: flex; gap: 10px;">
-                        <button style="padding: 8px 16px; background: rgba(255,255,255,0.2); border: 1px solid white; border-radius: 6px; color: white; cursor: pointer; font-weight: 500;">Simulación IA</button>
-                    </div>
-                </div>
-                <div class="results-body">
-                    <div class="metrics-grid" style="grid-template-columns: repeat(4, 1fr);">
-                        <div class="metric-card">
-                            <div class="metric-icon">👥</div>
-                            <div class="metric-value">{int(promedio)}</div>
-                            <div class="metric-label">Asistentes</div>
-                            <div class="metric-sublabel">Proyectados</div>
-                        </div>
-                        <div class="metric-card">
-                            <div class="metric-icon">📈</div>
-                            <div class="metric-value">{int(max_pred)}</div>
-                            <div class="metric-label">Mejor Día</div>
-                            <div class="metric-sublabel">{fecha_max}</div>
-                        </div>
-                        <div class="metric-card">
-                            <div class="metric-icon">📉</div>
-                            <div class="metric-value">{int(min_pred)}</div>
-                            <div class="metric-label">Menor Día</div>
-                            <div class="metric-sublabel">{fecha_min}</div>
-                        </div>
-                        <div class="metric-card">
-                            <div class="metric-icon">💵</div>
-                            <div class="metric-value">${int(ingresos_estimados/1000000)}M</div>
-                            <div class="metric-label">Ingresos</div>
-                            <div class="metric-sublabel">(COP)</div>
-                        </div>
-                    </div>
-                    
-                    <div class="chart-section">
-                        <div class="chart-header">
-                            <div class="chart-title">📊 Análisis de Ventas y Factores Externos</div>
-                            <div class="chart-dates">
-                                <div class="date-badge max">Pico: {fecha_max}</div>
-                                <div class="date-badge min">Mínimo: {fecha_min}</div>
-                            </div>
-                        </div>
-                        <div class="chart-container">
-                            {datos_grafico}
-                        </div>
-                        <div class="chart-labels">
-                            {etiquetas_grafico}
-                        </div>
-                    </div>
-                </div>
-            </div>
-        </div>
-    </body>
-    </html>
-    """
\ No newline at end of file
+
+class PlanGira(ConfiguracionEvento):
+    """Evento a evaluar en todos los municipios (o los de ``departamentos``) y fechas del rango."""
+
+    fecha_inicio: date
+    fecha_fin: date
+    departamentos: list[str] | None = None
+    top_k: int = 20
+
+
+class OptimizacionPrecios(ParametrosEvento):
+    """Grilla de precios (y opcionalmente de funciones) a evaluar para ``fecha``.
+
+    ``PrecioMinimo``/``PrecioMaximo``/``NumeroFunciones`` del evento son la
+    configuración actual con la que se compara la óptima.
+    """
+
+    fecha: date
+    precio_minimo_desde: float
+    precio_minimo_hasta: float
+    precio_maximo_desde: float
+    precio_maximo_hasta: float
+    pasos: int = 41
+    numero_funciones: list[int] | None = None
+    refinar: bool = True
+
+
+def lotes_ventanas(escenarios):
+    """Filas de la ventana de ±2 días de cada escenario, en lotes de como máximo
+    ``TAMANO_LOTE`` filas: genera ``(inicio, fin, datos)`` por rango de escenarios.
+
+    Antes del primer lote valida las categorías de todos los escenarios, una vez por
+    columna (``validar_categorias``; 422 si alguno trae valores que el modelo no admite).
+    """
+    n_ventana = len(DESPLAZAMIENTOS_VENTANA)
+    escenarios_por_lote = max(1, TAMANO_LOTE // n_ventana)
+    eventos = [e.a_evento() for e in escenarios]
+    columnas = {clave: pd.Series([ev[clave] for ev in eventos]).to_numpy() for clave in eventos[0]}
+    validar_categorias(columnas)
+    fechas_base = np.array([e.fecha for e in escenarios], dtype="datetime64[D]")
+
+    for inicio in range(0, len(escenarios), escenarios_por_lote):
+        fin = inicio + escenarios_por_lote
+        fechas = (fechas_base[inicio:fin, None] + np.asarray(DESPLAZAMIENTOS_VENTANA)).ravel()
+        evento = {clave: np.repeat(valores[inicio:fin], n_ventana) for clave, valores in columnas.items()}
+        with etapa("features"):
+            temporales = CALENDARIO.consultar(fechas)
+        yield inicio, fin, construir_lote(evento, temporales)
+
+
+def evaluar_ventanas(escenarios, usar_cache=True):
+    """Predice la ventana de ±2 días de cada escenario (ver ``lotes_ventanas``).
+
+    Devuelve una matriz (escenarios x días de la ventana). Con ``usar_cache=False``
+    (peticiones masivas) no pasa por la caché (ver ``barrer_fechas``).
+    """
+    predecir = predecir_filas if usar_cache else predecir_modelo
+    n_ventana = len(DESPLAZAMIENTOS_VENTANA)
+    preds = np.empty((len(escenarios), n_ventana))
+    for inicio, fin, datos in lotes_ventanas(escenarios):
+        preds[inicio:fin] = predecir(datos).reshape(-1, n_ventana)
+    return preds
+
+
+@app.post("/api/v1/predict", dependencies=[Depends(modelo_listo)])
+async def api_predecir(escenario: EscenarioEvento):
+    if PLANIFICADOR is not None:
+        preds = await predecir_filas_en_microlotes(lambda: next(lotes_ventanas([escenario]))[2])
+        preds = preds.reshape(1, -1)
+    else:
+        preds = await en_ejecutor(evaluar_ventanas, [escenario])
+    resumen = resumir_ventanas(preds)
+    fechas = [escenario.fecha + timedelta(days=i) for i in DESPLAZAMIENTOS_VENTANA]
+    temporales = CALENDARIO.rango(fechas[0], len(fechas))
+    promedio = float(resumen["promedio"][0])
+
+    return {
+        "fecha": escenario.fecha.isoformat(),
+        "predicciones": [
+            {
+                "fecha": f.isoformat(),
+                "dia_semana": temporales["dia_semana_es"][i],
+                "prediccion": float(preds[0, i]),
+            }
+            for i, f in enumerate(fechas)
+        ],
+        "promedio": promedio,
+        "maximo": float(preds[0, resumen["idx_max"][0]]),
+        "fecha_maximo": fechas[resumen["idx_max"][0]].isoformat(),
+        "minimo": float(preds[0, resumen["idx_min"][0]]),
+        "fecha_minimo": fechas[resumen["idx_min"][0]].isoformat(),
+        "ingresos_estimados": int(promedio * (escenario.PrecioMinimo + escenario.PrecioMaximo) / 2),
+    }
+
+
+@app.post("/api/v1/predict/bulk", dependencies=[Depends(modelo_listo)])
+async def api_predecir_masivo(escenarios: list[EscenarioEvento]):
+    """Evalúa muchos escenarios y responde en formato columnar (una lista por campo)."""
+    if not escenarios:
+        return {"n": 0}
+    if len(escenarios) > MAX_ESCENARIOS:
+        raise HTTPException(status_code=413, detail=f"Máximo {MAX_ESCENARIOS} escenarios por petición")
+
+    preds = await en_ejecutor(evaluar_ventanas, escenarios, usar_cache=False)
+    resumen = resumir_ventanas(preds)
+    filas = np.arange(len(escenarios))
+    idx_max = resumen["idx_max"]
+    idx_min = resumen["idx_min"]
+    desplazamientos = np.asarray(DESPLAZAMIENTOS_VENTANA)
+    fechas_base = np.array([e.fecha for e in escenarios], dtype="datetime64[D]")
+    precio_promedio = np.array([(e.PrecioMinimo + e.PrecioMaximo) / 2 for e in escenarios])
+
+    return {
+        "n": len(escenarios),
+        "desplazamientos": desplazamientos.tolist(),
+        "promedio": resumen["promedio"].tolist(),
+        "maximo": preds[filas, idx_max].tolist(),
+        "fecha_maximo": (fechas_base + desplazamientos[idx_max]).astype(str).tolist(),
+        "minimo": preds[filas, idx_min].tolist(),
+        "fecha_minimo": (fechas_base + desplazamientos[idx_min]).astype(str).tolist(),
+        "ingresos_estimados": (resumen["promedio"] * precio_promedio).astype(np.int64).tolist(),
+        "predicciones": preds.tolist(),
+    }
+
+
+def barrer_fechas(evento, inicio, n_dias):
+    """Predice ``evento`` en ``n_dias`` días consecutivos desde ``inicio``.
+
+    Las features temporales salen del calendario precalculado y cada lote de hasta
+    ``TAMANO_LOTE`` días es una sola llamada al modelo. No pasa por la caché: un
+    barrido largo desalojaría las entradas de las consultas interactivas.
+    """
+    preds = np.empty(n_dias)
+    for desde in range(0, n_dias, TAMANO_LOTE):
+        n = min(TAMANO_LOTE, n_dias - desde)
+        temporales = CALENDARIO.rango(np.datetime64(inicio, "D") + desde, n)
+        preds[desde:desde + n] = predecir_modelo(construir_lote(evento, temporales))
+    return preds
+
+
+@app.post("/api/v1/predict/range", dependencies=[Depends(modelo_listo)])
+async def api_barrer_fechas(barrido: BarridoFechas):
+    """Evalúa el evento en todos los días del rango y devuelve los mejores y la curva completa."""
+    if barrido.fecha_fin < barrido.fecha_inicio:
+        raise HTTPException(status_code=422, detail="fecha_fin debe ser igual o posterior a fecha_inicio")
+    if barrido.top_k < 1:
+        raise HTTPException(status_code=422, detail="top_k debe ser al menos 1")
+    n_dias = (barrido.fecha_fin - barrido.fecha_inicio).days + 1
+    if n_dias > MAX_DIAS_BARRIDO:
+        raise HTTPException(status_code=413, detail=f"Máximo {MAX_DIAS_BARRIDO} días por barrido")
+    validar_categorias(barrido.a_evento())
+
+    preds = await en_ejecutor(barrer_fechas, barrido.a_evento(), barrido.fecha_inicio, n_dias)
+    fechas = np.arange(n_dias) + np.datetime64(barrido.fecha_inicio, "D")
+    dias_semana = CALENDARIO.rango(barrido.fecha_inicio, n_dias)["dia_semana_es"]
+
+    # Top-K sin ordenar todo el rango; empates en orden cronológico
+    k = min(barrido.top_k, n_dias)
+    candidatos = np.argpartition(-preds, k - 1)[:k] if k < n_dias else np.arange(n_dias)
+    mejores = candidatos[np.lexsort((candidatos, -preds[candidatos]))]
+    promedio = float(preds.mean())
+
+    return {
+        "fecha_inicio": barrido.fecha_inicio.isoformat(),
+        "fecha_fin": barrido.fecha_fin.isoformat(),
+        "n_dias": n_dias,
+        "mejores": [
+            {
+                "fecha": str(fechas[i]),
+                "dia_semana": dias_semana[i],
+                "prediccion": float(preds[i]),
+            }
+            for i in mejores
+        ],
+        "promedio": promedio,
+        "ingresos_estimados": int(promedio * (barrido.PrecioMinimo + barrido.PrecioMaximo) / 2),
+        "curva": {"fechas": fechas.astype(str).tolist(), "predicciones": preds.tolist()},
+    }
+
+
+def evaluar_configuraciones(evento, fecha, precios_min, precios_max, funciones):
+    """Asistencia promedio de la ventana de ±2 días para cada configuración de precios.
+
+    Arma una fila por configuración y día; cada lote de hasta ``TAMANO_LOTE`` filas es
+    una sola llamada al modelo. No pasa por la caché (ver ``barrer_fechas``).
+    """
+    n_ventana = len(DESPLAZAMIENTOS_VENTANA)
+    ventana = CALENDARIO.rango(np.datetime64(fecha, "D") + DESPLAZAMIENTOS_VENTANA[0], n_ventana)
+    configuraciones_por_lote = max(1, TAMANO_LOTE // n_ventana)
+    asistentes = np.empty(len(precios_min))
+
+    for inicio in range(0, len(precios_min), configuraciones_por_lote):
+        fin = inicio + configuraciones_por_lote
+        n = len(precios_min[inicio:fin])
+        temporales = {clave: np.tile(valores, n) for clave, valores in ventana.items()}
+        datos = construir_lote(
+            dict(
+                evento,
+                PrecioMinimo=np.repeat(precios_min[inicio:fin], n_ventana),
+                PrecioMaximo=np.repeat(precios_max[inicio:fin], n_ventana),
+                NumeroFunciones=np.repeat(funciones[inicio:fin], n_ventana),
+            ),
+            temporales,
+        )
+        asistentes[inicio:fin] = predecir_modelo(datos).reshape(n, n_ventana).mean(axis=1)
+
+    return asistentes
+
+
+def evaluar_gira(evento, ciudades, inicio, n_dias):
+    """Predice ``evento`` en cada ciudad (índices de ``GEOGRAFIA``) y día del rango.
+
+    Devuelve una matriz ciudades x días. Las filas ciudad-día se arman por tramos de
+    ``TAMANO_LOTE``, así que la memoria pico no crece con el tamaño de la gira.
+    No pasa por la caché (ver ``barrer_fechas``).
+    """
+    dias = CALENDARIO.rango(inicio, n_dias)
+    preds = np.empty(len(ciudades) * n_dias)
+    for desde in range(0, len(preds), TAMANO_LOTE):
+        fila = np.arange(desde, min(desde + TAMANO_LOTE, len(preds)))
+        ciudad = ciudades[fila // n_dias]
+        temporales = {clave: valores[fila % n_dias] for clave, valores in dias.items()}
+        datos = construir_lote(
+            dict(
+                evento,
+                Departamento=GEOGRAFIA["departamento"][ciudad],
+                Municipio=GEOGRAFIA["municipio"][ciudad],
+                EsCapital=GEOGRAFIA["es_capital"][ciudad],
+            ),
+            temporales,
+        )
+        preds[fila] = predecir_modelo(datos)
+    return preds.reshape(len(ciudades), n_dias)
+
+
+@app.post("/api/v1/plan/tour", dependencies=[Depends(modelo_listo)])
+async def api_planear_gira(plan: PlanGira):
+    """Matriz ciudad x fecha de asistencia estimada, con ciudades y celdas ordenadas."""
+    if plan.fecha_fin < plan.fecha_inicio:
+        raise HTTPException(status_code=422, detail="fecha_fin debe ser igual o posterior a fecha_inicio")
+    if plan.top_k < 1:
+        raise HTTPException(status_code=422, detail="top_k debe ser al menos 1")
+    n_dias = (plan.fecha_fin - plan.fecha_inicio).days + 1
+    if n_dias > MAX_DIAS_BARRIDO:
+        raise HTTPException(status_code=413, detail=f"Máximo {MAX_DIAS_BARRIDO} días por gira")
+    if plan.departamentos is None:
+        ciudades = np.arange(len(GEOGRAFIA["municipio"]))
+    else:
+        departamentos = {nombre: GEO.departamento(nombre) for nombre in plan.departamentos}
+        desconocidos = sorted(nombre for nombre, canonico in departamentos.items() if canonico is None)
+        if desconocidos:
+            raise HTTPException(status_code=422, detail=f"Departamentos desconocidos: {', '.join(desconocidos)}")
+        ciudades = np.flatnonzero(np.isin(GEOGRAFIA["departamento"], list(departamentos.values())))
+    validar_categorias(plan.a_evento())
+
+    preds = await en_ejecutor(evaluar_gira, plan.a_evento(), ciudades, plan.fecha_inicio, n_dias)
+    fechas = (np.arange(n_dias) + np.datetime64(plan.fecha_inicio, "D")).astype(str)
+    municipios = GEOGRAFIA["municipio"][ciudades]
+    departamentos = GEOGRAFIA["departamento"][ciudades]
+
+    # Ciudades por su mejor día; celdas ciudad-fecha por predicción (empates en orden de la matriz)
+    mejor_dia = np.argmax(preds, axis=1)
+    mejor_pred = preds[np.arange(len(ciudades)), mejor_dia]
+    orden_ciudades = np.lexsort((np.arange(len(ciudades)), -mejor_pred))
+    planas = preds.ravel()
+    k = min(plan.top_k, len(planas))
+    candidatos = np.argpartition(-planas, k - 1)[:k] if k < len(planas) else np.arange(len(planas))
+    mejores = candidatos[np.lexsort((candidatos, -planas[candidatos]))]
+
+    return {
+        "fecha_inicio": plan.fecha_inicio.isoformat(),
+        "fecha_fin": plan.fecha_fin.isoformat(),
+        "ciudades": [
+            {
+                "Departamento": departamentos[c],
+                "Municipio": municipios[c],
+                "EsCapital": GEOGRAFIA["es_capital"][ciudades[c]],
+                "mejor_fecha": fechas[mejor_dia[c]],
+                "mejor_prediccion": float(mejor_pred[c]),
+                "promedio": float(preds[c].mean()),
+            }
+            for c in orden_ciudades
+        ],
+        "mejores": [
+            {
+                "Departamento": departamentos[c],
+                "Municipio": municipios[c],
+                "fecha": fechas[d],
+                "prediccion": float(planas[i]),
+            }
+            for i in mejores
+            for c, d in [divmod(int(i), n_dias)]
+        ],
+        "matriz": {
+            "municipios": municipios.tolist(),
+            "fechas": fechas.tolist(),
+            "predicciones": preds.tolist(),
+        },
+    }
+
+
+def _superficie(valores):
+    """Lista anidada con ``None`` en las celdas no evaluadas (NaN no es JSON válido)."""
+    return np.where(np.isnan(valores), None, valores).tolist()
+
+
+@app.post("/api/v1/optimize/prices", dependencies=[Depends(modelo_listo)])
+async def api_optimizar_precios(optimizacion: OptimizacionPrecios):
+    """Busca el precio mínimo, máximo y número de funciones que maximizan los ingresos estimados."""
+    o = optimizacion
+    if o.precio_minimo_hasta < o.precio_minimo_desde or o.precio_maximo_hasta < o.precio_maximo_desde:
+        raise HTTPException(status_code=422, detail="Cada rango de precios debe ir de menor a mayor")
+    if o.pasos < 2:
+        raise HTTPException(status_code=422, detail="pasos debe ser al menos 2")
+    funciones = np.array(sorted(set(o.numero_funciones or [o.NumeroFunciones])), dtype=np.int64)
+    if (funciones < 1).any():
+        raise HTTPException(status_code=422, detail="numero_funciones debe contener enteros positivos")
+    if o.pasos * o.pasos * len(funciones) > MAX_CELDAS_PRECIOS:
+        raise HTTPException(status_code=413, detail=f"Máximo {MAX_CELDAS_PRECIOS} celdas por optimización")
+
+    evento = o.a_evento()
+    validar_categorias(evento)
+    precios_min = np.linspace(o.precio_minimo_desde, o.precio_minimo_hasta, o.pasos)
+    precios_max = np.linspace(o.precio_maximo_desde, o.precio_maximo_hasta, o.pasos)
+
+    def optimizar():
+        resultado = optimizar_precios(
+            lambda pmin, pmax, f: evaluar_configuraciones(evento, o.fecha, pmin, pmax, f),
+            precios_min,
+            precios_max,
+            funciones,
+            refinar=o.refinar,
+        )
+        actual = evaluar_configuraciones(
+            evento, o.fecha, np.array([o.PrecioMinimo]), np.array([o.PrecioMaximo]), np.array([o.NumeroFunciones])
+        )[0]
+        return resultado, actual
+
+    resultado, actual = await en_ejecutor(optimizar)
+    if resultado["mejor"] is None:
+        raise HTTPException(status_code=422, detail="Ningún precio mínimo del rango es menor o igual a un precio máximo")
+
+    f, i, j = resultado["mejor"]
+    gruesos_min, gruesos_max = resultado["gruesos_min"], resultado["gruesos_max"]
+    ingresos_actuales = int(actual * (o.PrecioMinimo + o.PrecioMaximo) / 2)
+    ingresos_mejor = int(resultado["ingresos"][f, i, j])
+
+    return {
+        "fecha": o.fecha.isoformat(),
+        "mejor": {
+            "PrecioMinimo": float(precios_min[i]),
+            "PrecioMaximo": float(precios_max[j]),
+            "NumeroFunciones": int(funciones[f]),
+            "asistentes_promedio": float(resultado["asistentes"][f, i, j]),
+            "ingresos_estimados": ingresos_mejor,
+        },
+        "actual": {
+            "PrecioMinimo": o.PrecioMinimo,
+            "PrecioMaximo": o.PrecioMaximo,
+            "NumeroFunciones": o.NumeroFunciones,
+            "asistentes_promedio": float(actual),
+            "ingresos_estimados": ingresos_actuales,
+        },
+        "mejora": ingresos_mejor - ingresos_actuales,
+        "modo": "refinado" if o.refinar else "exhaustivo",
+        "celdas_evaluadas": resultado["evaluadas"],
+        "celdas_validas": resultado["validas"],
+        "superficie": {
+            "precios_minimos": precios_min[gruesos_min].tolist(),
+            "precios_maximos": precios_max[gruesos_max].tolist(),
+            "numero_funciones": funciones.tolist(),
+            "ingresos": _superficie(resultado["ingresos"][:, gruesos_min[:, None], gruesos_max[None, :]]),
+        },
+    }
+
+
+def _limite_autocompletado(limite):
+    if not 1 <= limite <= MAX_AUTOCOMPLETADO:
+        raise HTTPException(status_code=422, detail=f"limite debe estar entre 1 y {MAX_AUTOCOMPLETADO}")
+
+
+@app.get("/api/v1/autocomplete/municipios")
+async def autocompletar_municipios(q: str = "", departamento: str | None = None, limite: int = 10):
+    """Municipios cuyo nombre (o alguna de sus palabras) empieza por ``q``, sin distinguir tildes."""
+    _limite_autocompletado(limite)
+    if departamento is not None:
+        canonico = GEO.departamento(departamento)
+        if canonico is None:
+            raise HTTPException(status_code=422, detail=f"Departamento desconocido: {departamento}")
+        departamento = canonico
+    return [
+        {"Departamento": d, "Municipio": m, "EsCapital": es_capital}
+        for d, m, es_capital in GEO.buscar_municipios(q, limite, departamento)
+    ]
+
+
+@app.get("/api/v1/autocomplete/{campo}", dependencies=[Depends(modelo_listo)])
+async def autocompletar_vocabulario(campo: str, q: str = "", limite: int = 10):
+    """Artistas o géneros que el modelo conoce (los vistos al entrenar) que coinciden con ``q``."""
+    _limite_autocompletado(limite)
+    buscador = modelo_en_uso().autocompletado.get(CAMPOS_AUTOCOMPLETADO.get(campo))
+    if buscador is None:
+        raise HTTPException(status_code=404, detail=f"Sin vocabulario para autocompletar {campo}")
+    return buscador.buscar(q, limite)
+
+
+@app.get("/metrics")
+async def metrics():
+    """Métricas en formato de texto de Prometheus."""
+    if not METRICAS:
+        raise HTTPException(status_code=404)
+    return PlainTextResponse(REGISTRO.exponer(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+def _verificar_token(token, authorization):
+    """404 si la ruta no está habilitada (sin token configurado), 401 sin el token correcto."""
+    if not token:
+        raise HTTPException(status_code=404)
+    esperado = f"Bearer {token}".encode()
+    if not hmac.compare_digest((authorization or "").encode(), esperado):
+        raise HTTPException(status_code=401, headers={"WWW-Authenticate": "Bearer"})
+
+
+def perfilado_autorizado(authorization: str | None = Header(None)):
+    """Dependencia de /admin/perfilado."""
+    _verificar_token(PERFILADO_TOKEN, authorization)
+
+
+def admin_autorizado(authorization: str | None = Header(None)):
+    """Dependencia de /admin/modelo."""
+    _verificar_token(ADMIN_TOKEN, authorization)
+
+
+class SolicitudPerfilado(BaseModel):
+    """Perfila las próximas ``peticiones`` a /predecir o, sin ese campo, todas las de ``segundos``."""
+
+    modo: str = "muestreo"
+    peticiones: int | None = None
+    segundos: float = 30.0
+    intervalo_ms: float = 5.0
+
+
+@app.post("/admin/perfilado", dependencies=[Depends(perfilado_autorizado)])
+def iniciar_perfilado(solicitud: SolicitudPerfilado):
+    if solicitud.modo not in MODOS:
+        raise HTTPException(status_code=422, detail=f"modo debe ser uno de: {', '.join(MODOS)}")
+    if solicitud.peticiones is not None and solicitud.peticiones < 1:
+        raise HTTPException(status_code=422, detail="peticiones debe ser al menos 1")
+    if not 0 < solicitud.segundos <= PERFILADO_MAX_SEGUNDOS:
+        raise HTTPException(status_code=422, detail=f"segundos debe estar entre 0 y {PERFILADO_MAX_SEGUNDOS:g}")
+    if solicitud.intervalo_ms < 1:
+        raise HTTPException(status_code=422, detail="intervalo_ms debe ser al menos 1")
+    try:
+        return PERFILADOR.iniciar(
+            solicitud.modo, solicitud.peticiones, solicitud.segundos, solicitud.intervalo_ms / 1000
+        )
+    except SesionActiva as error:
+        raise HTTPException(status_code=409, detail=str(error))
+
+
+@app.get("/admin/perfilado", dependencies=[Depends(perfilado_autorizado)])
+def resultado_perfilado(formato: str | None = None):
+    """Estado de la sesión o, con ``formato`` y la sesión terminada, su resultado (202 si sigue en curso)."""
+    estado = PERFILADOR.estado()
+    if estado is None:
+        raise HTTPException(status_code=404, detail="No hay sesión de perfilado")
+    if formato is None:
+        return estado
+    try:
+        resultado = PERFILADOR.resultado(formato)
+    except ValueError as error:
+        raise HTTPException(status_code=422, detail=str(error))
+    if resultado is None:
+        return JSONResponse(estado, status_code=202, headers={"Retry-After": "1"})
+    contenido, media_type = resultado
+    return Response(contenido, media_type=media_type)
+
+
+@app.delete("/admin/perfilado", dependencies=[Depends(perfilado_autorizado)])
+def detener_perfilado():
+    PERFILADOR.detener()
+    return PERFILADOR.estado()
+
+
+class RecargaModelo(BaseModel):
+    """Artefacto a cargar: ``archivo``, un nombre dentro de ``DIRECTORIO_MODELOS`` (por
+    defecto EVENTIA_MODEL_PATH), o ``url`` (HTTP/HTTPS), que se descarga a un archivo nuevo
+    de ese directorio (``modelo-<sha256>.pkl``) verificando ``sha256`` si se da."""
+
+    archivo: str | None = None
+    url: str | None = None
+    sha256: str | None = None
+
+
+class ReversionModelo(BaseModel):
+    """Versión anterior a reactivar (por defecto, la más reciente)."""
+
+    numero: int | None = None
+
+
+def ruta_artefacto(archivo):
+    """Ruta de ``archivo`` en ``DIRECTORIO_MODELOS``; ``None`` si no es un nombre de archivo
+    simple de ese directorio (rutas absolutas, ``..``, subdirectorios, ocultos o enlaces que
+    apuntan fuera)."""
+    if not archivo or archivo.startswith(".") or os.path.basename(archivo) != archivo:
+        return None
+    if os.altsep and os.altsep in archivo:
+        return None
+    ruta = os.path.join(DIRECTORIO_MODELOS, archivo)
+    if os.path.dirname(os.path.realpath(ruta)) != os.path.realpath(DIRECTORIO_MODELOS):
+        return None
+    return ruta
+
+
+@app.get("/admin/modelo", dependencies=[Depends(admin_autorizado)])
+def estado_modelo():
+    return MODELOS.estado()
+
+
+@app.post("/admin/modelo/recargar", status_code=202, dependencies=[Depends(admin_autorizado)])
+def recargar_modelo(solicitud: RecargaModelo | None = None):
+    """Carga y calienta el artefacto en segundo plano y lo publica al terminar (ver GET /admin/modelo).
+
+    La versión activa sigue atendiendo durante la carga y también si esta falla.
+    """
+    solicitud = solicitud or RecargaModelo()
+    if solicitud.archivo is not None and solicitud.url is not None:
+        raise HTTPException(status_code=422, detail="Indique archivo o url, no ambos")
+    if solicitud.archivo is None:
+        ruta = MODEL_PATH
+    else:
+        ruta = ruta_artefacto(solicitud.archivo)
+        if ruta is None:
+            raise HTTPException(
+                status_code=422, detail=f"archivo debe ser un nombre de archivo dentro de {DIRECTORIO_MODELOS}"
+            )
+    if solicitud.url is not None and urlparse(solicitud.url).scheme not in ("http", "https"):
+        raise HTTPException(status_code=422, detail="url debe ser HTTP o HTTPS")
+    if solicitud.url is None and not os.path.isfile(ruta):
+        raise HTTPException(status_code=422, detail=f"No existe el artefacto {solicitud.archivo or ruta}")
+
+    def preparar():
+        print(f"🔄 Recargando el modelo desde {solicitud.url or ruta}")
+        try:
+            # Una descarga nunca pisa MODEL_PATH ni el artefacto de otra versión: si falla la
+            # carga, el siguiente arranque sigue encontrando el modelo anterior intacto
+            destino = ruta if solicitud.url is None else descargar_version(
+                solicitud.url, DIRECTORIO_MODELOS, solicitud.sha256
+            )
+            version = preparar_version(destino)
+        except Exception as error:
+            RECARGAS.inc("error")
+            print(f"❌ Error recargando el modelo: {error}")
+            raise
+        RECARGAS.inc("publicada")
+        print(f"✅ Modelo {version.version} listo en {version.segundos_carga:.1f} s; se publica")
+        return version
+
+    try:
+        return MODELOS.recargar(preparar)
+    except RecargaEnCurso as error:
+        raise HTTPException(status_code=409, detail=str(error))
+
+
+@app.post("/admin/modelo/revertir", dependencies=[Depends(admin_autorizado)])
+def revertir_modelo(solicitud: ReversionModelo | None = None):
+    """Reactiva al instante una versión anterior que sigue en memoria."""
+    try:
+        version = MODELOS.revertir(None if solicitud is None else solicitud.numero)
+    except LookupError as error:
+        raise HTTPException(status_code=409, detail=str(error))
+    RECARGAS.inc("revertida")
+    print(f"↩️ Modelo revertido a la versión {version.numero} ({version.version})")
+    return MODELOS.estado()
+
+
+@app.get("/api/v1/metricas")
+def api_metricas():
+    return {
+        "cache": CACHE.metricas(),
+        "inferencia": EJECUTOR.metricas(),
+        "microlotes": PLANIFICADOR.metricas() if PLANIFICADOR is not None else None,
+    }
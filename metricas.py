@@ -0,0 +1,197 @@
+"""Métricas en proceso con exposición en formato de texto de Prometheus.
+
+Contadores, histogramas y medidores mínimos (sin dependencias) más un middleware
+ASGI que cuenta peticiones y mide su latencia por ruta. Cada observación es una
+suma bajo un lock; el texto se arma solo cuando se consulta /metrics.
+"""
+import bisect
+import os
+import threading
+import time
+
+LIMITES_LATENCIA = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+LIMITES_FILAS = (1, 5, 10, 50, 100, 500, 1000, 5000, 10000, 50000)
+_TAMANO_PAGINA = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def _escapar(valor):
+    return str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _etiquetas(nombres, valores):
+    if not nombres:
+        return ""
+    return "{" + ",".join(f'{nombre}="{_escapar(valor)}"' for nombre, valor in zip(nombres, valores)) + "}"
+
+
+class _Metrica:
+    tipo = None
+
+    def __init__(self, nombre, ayuda, etiquetas=()):
+        self.nombre = nombre
+        self.ayuda = ayuda
+        self.etiquetas = tuple(etiquetas)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def limpiar(self):
+        with self._lock:
+            self._series.clear()
+
+    def exponer(self):
+        lineas = [f"# HELP {self.nombre} {self.ayuda}", f"# TYPE {self.nombre} {self.tipo}"]
+        with self._lock:
+            series = list(self._series.items())
+        for valores, serie in sorted(series, key=lambda par: tuple(map(str, par[0]))):
+            lineas.extend(self._lineas(valores, serie))
+        return lineas
+
+
+class Contador(_Metrica):
+    tipo = "counter"
+
+    def inc(self, *valores, cantidad=1):
+        with self._lock:
+            self._series[valores] = self._series.get(valores, 0) + cantidad
+
+    def _lineas(self, valores, total):
+        return [f"{self.nombre}{_etiquetas(self.etiquetas, valores)} {total}"]
+
+
+class Medidor(_Metrica):
+    """Valor puntual; ``funcion`` (opcional) lo calcula en el momento de exponerlo."""
+
+    tipo = "gauge"
+
+    def __init__(self, nombre, ayuda, etiquetas=(), funcion=None):
+        super().__init__(nombre, ayuda, etiquetas)
+        self.funcion = funcion
+
+    def fijar(self, valor, *valores):
+        with self._lock:
+            self._series[valores] = valor
+
+    def exponer(self):
+        if self.funcion is not None:
+            valor = self.funcion()
+            if valor is not None:
+                self.fijar(valor)
+        return super().exponer()
+
+    def _lineas(self, valores, valor):
+        return [f"{self.nombre}{_etiquetas(self.etiquetas, valores)} {valor}"]
+
+
+class Histograma(_Metrica):
+    tipo = "histogram"
+
+    def __init__(self, nombre, ayuda, etiquetas=(), limites=LIMITES_LATENCIA):
+        super().__init__(nombre, ayuda, etiquetas)
+        self.limites = tuple(limites)
+
+    def observar(self, valor, *valores):
+        i = bisect.bisect_left(self.limites, valor)
+        with self._lock:
+            serie = self._series.get(valores)
+            if serie is None:
+                serie = self._series[valores] = [[0] * (len(self.limites) + 1), 0.0]
+            serie[0][i] += 1
+            serie[1] += valor
+
+    def medir(self, *valores):
+        """Context manager que observa la duración (en segundos) del bloque."""
+        return _Cronometro(self, valores)
+
+    def _lineas(self, valores, serie):
+        cubetas, suma = serie
+        nombres = self.etiquetas + ("le",)
+        lineas = []
+        acumulado = 0
+        for limite, cuenta in zip(self.limites + ("+Inf",), cubetas):
+            acumulado += cuenta
+            lineas.append(f"{self.nombre}_bucket{_etiquetas(nombres, valores + (limite,))} {acumulado}")
+        lineas.append(f"{self.nombre}_sum{_etiquetas(self.etiquetas, valores)} {suma}")
+        lineas.append(f"{self.nombre}_count{_etiquetas(self.etiquetas, valores)} {acumulado}")
+        return lineas
+
+
+class _Cronometro:
+    __slots__ = ("histograma", "valores", "inicio")
+
+    def __init__(self, histograma, valores):
+        self.histograma = histograma
+        self.valores = valores
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.histograma.observar(time.perf_counter() - self.inicio, *self.valores)
+
+
+class _SinMedicion:
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *exc):
+        pass
+
+
+SIN_MEDICION = _SinMedicion()
+
+
+class RegistroMetricas:
+    def __init__(self):
+        self._metricas = []
+
+    def registrar(self, metrica):
+        self._metricas.append(metrica)
+        return metrica
+
+    def exponer(self):
+        lineas = []
+        for metrica in self._metricas:
+            lineas.extend(metrica.exponer())
+        return "\n".join(lineas) + "\n"
+
+
+def rss_bytes():
+    """Memoria residente actual del proceso (Linux); ``None`` si no se puede leer."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * _TAMANO_PAGINA
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class MiddlewareMetricas:
+    """Middleware ASGI que cuenta peticiones y mide su latencia por ruta y estado.
+
+    La ruta es la plantilla registrada (``/static/{archivo}``), no la URL concreta,
+    para que la cardinalidad quede acotada.
+    """
+
+    def __init__(self, app, peticiones, latencia):
+        self.app = app
+        self.peticiones = peticiones
+        self.latencia = latencia
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        inicio = time.perf_counter()
+        estado = [500]
+
+        async def enviar(mensaje):
+            if mensaje["type"] == "http.response.start":
+                estado[0] = mensaje["status"]
+            await send(mensaje)
+
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            ruta = scope.get("route")
+            plantilla = getattr(ruta, "path", "sin_ruta")
+            self.peticiones.inc(scope["method"], plantilla, estado[0])
+            self.latencia.observar(time.perf_counter() - inicio, scope["method"], plantilla)
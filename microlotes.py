@@ -0,0 +1,133 @@
+"""Planificador que agrupa las filas de peticiones concurrentes en un solo ``predict``."""
+import os
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+from codificacion import concatenar
+
+
+class PlanificadorMicrolotes:
+    """Junta filas de varias peticiones durante hasta ``max_espera`` segundos o hasta
+    ``max_filas`` filas, las evalúa con una sola llamada a ``funcion_prediccion`` y
+    reparte los resultados.
+
+    ``encolar`` no bloquea: devuelve un ``Future`` que el servidor espera desde el
+    event loop (``asyncio.wrap_future``), así las peticiones en espera no ocupan hilos
+    del ejecutor de inferencia y su número no acota el tamaño de los lotes.
+    ``predecir`` es la versión bloqueante.
+
+    ``hilos`` hilos arman y evalúan lotes a la vez (uno por proceso trabajador con
+    ``PredictorProcesos``, para que todos tengan trabajo). Se arrancan con la primera
+    petición de cada proceso: un worker creado con fork después de importar
+    (``gunicorn --preload``) no hereda hilos, así que arranca los suyos.
+    """
+
+    def __init__(self, funcion_prediccion, max_filas, max_espera, hilos=1):
+        self.funcion_prediccion = funcion_prediccion
+        self.max_filas = max_filas
+        self.max_espera = max_espera
+        self.hilos = hilos
+        self._pendientes = []
+        self._filas_pendientes = 0
+        self._condicion = threading.Condition()
+        self._arranque = threading.Lock()
+        self.lotes = 0
+        self.filas = 0
+        self.peticiones = 0
+        self._pid = None
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._reiniciar_en_hijo)
+
+    def _reiniciar_en_hijo(self):
+        # Los locks y la cola pueden venir copiados a medio usar por otro hilo del padre
+        self._pendientes = []
+        self._filas_pendientes = 0
+        self._condicion = threading.Condition()
+        self._arranque = threading.Lock()
+        self._pid = None
+
+    def _asegurar_hilo(self):
+        if self._pid == os.getpid():
+            return
+        with self._arranque:
+            if self._pid != os.getpid():
+                for i in range(self.hilos):
+                    threading.Thread(target=self._bucle, name=f"microlotes-{i}", daemon=True).start()
+                self._pid = os.getpid()
+
+    def encolar(self, datos, *contexto):
+        """``Future`` con las predicciones de ``datos``; ``contexto`` se pasa a
+        ``funcion_prediccion`` y solo se agrupan filas con el mismo contexto."""
+        self._asegurar_hilo()
+        futuro = Future()
+        with self._condicion:
+            self._pendientes.append((datos, contexto, futuro))
+            self._filas_pendientes += len(datos)
+            self._condicion.notify()
+        return futuro
+
+    def predecir(self, datos, *contexto):
+        return self.encolar(datos, *contexto).result()
+
+    def _tomar_lote(self):
+        with self._condicion:
+            while True:
+                while not self._pendientes:
+                    self._condicion.wait()
+                limite = time.monotonic() + self.max_espera
+                while self._filas_pendientes < self.max_filas:
+                    restante = limite - time.monotonic()
+                    if restante <= 0:
+                        break
+                    self._condicion.wait(restante)
+                # Otro hilo pudo llevarse las pendientes mientras este esperaba
+                if self._pendientes:
+                    break
+
+            # Siempre entra al menos una petición, aunque sola supere max_filas
+            lote, filas = [self._pendientes[0]], len(self._pendientes[0][0])
+            contexto = self._pendientes[0][1]
+            for datos, contexto_datos, futuro in self._pendientes[1:]:
+                if filas + len(datos) > self.max_filas or contexto_datos != contexto:
+                    break
+                lote.append((datos, contexto_datos, futuro))
+                filas += len(datos)
+            del self._pendientes[:len(lote)]
+            self._filas_pendientes -= filas
+            self.lotes += 1
+            self.filas += filas
+            self.peticiones += len(lote)
+            if self._pendientes:
+                # Lo que no entró en este lote no espera a que termine de evaluarse
+                self._condicion.notify()
+            return lote
+
+    def _bucle(self):
+        while True:
+            lote = self._tomar_lote()
+            try:
+                datos = lote[0][0] if len(lote) == 1 else concatenar([d for d, _, _ in lote])
+                preds = np.asarray(self.funcion_prediccion(datos, *lote[0][1]), dtype=float)
+            except Exception as error:
+                for _, _, futuro in lote:
+                    futuro.set_exception(error)
+                continue
+            inicio = 0
+            for datos, _, futuro in lote:
+                futuro.set_result(preds[inicio:inicio + len(datos)])
+                inicio += len(datos)
+
+    def metricas(self):
+        return {
+            "max_filas": self.max_filas,
+            "max_espera_ms": self.max_espera * 1000,
+            "hilos": self.hilos,
+            "lotes": self.lotes,
+            "filas": self.filas,
+            "peticiones": self.peticiones,
+            "filas_por_lote": self.filas / self.lotes if self.lotes else 0.0,
+            "peticiones_por_lote": self.peticiones / self.lotes if self.lotes else 0.0,
+        }
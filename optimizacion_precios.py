@@ -0,0 +1,73 @@
+"""Búsqueda de la configuración de precios que maximiza los ingresos estimados.
+
+La grilla es el producto de precios mínimos x precios máximos x número de
+funciones. Los ingresos de una celda son la asistencia estimada por el precio
+promedio, igual que ``ingresos_estimados`` en /predecir. Las celdas con precio
+mínimo mayor que el máximo se descartan sin llegar al modelo.
+"""
+import numpy as np
+
+
+def indices_gruesos(n, pasos_gruesos):
+    """Índices de un eje fino de ``n`` puntos que forman el eje grueso (con ambos extremos)."""
+    return np.unique(np.linspace(0, n - 1, min(n, pasos_gruesos)).round().astype(np.int64))
+
+
+def optimizar_precios(evaluar, precios_min, precios_max, funciones, refinar=True, pasos_gruesos=11, candidatos=3):
+    """Busca la celda de mayores ingresos de la grilla.
+
+    ``evaluar(precio_min, precio_max, funciones)`` recibe arreglos paralelos de
+    configuraciones y devuelve la asistencia estimada de cada una. Con ``refinar``
+    se evalúa primero la grilla gruesa y después, en la grilla fina, la vecindad de
+    ± un paso grueso de las ``candidatos`` mejores celdas gruesas; sin ``refinar``
+    se evalúa la grilla completa.
+
+    Devuelve un diccionario con la asistencia y los ingresos por celda (NaN en las
+    no evaluadas), el índice ``(funciones, min, max)`` de la mejor celda (``None``
+    si ninguna es válida), los índices de los ejes gruesos y las celdas evaluadas.
+    """
+    precios_min = np.asarray(precios_min, dtype=float)
+    precios_max = np.asarray(precios_max, dtype=float)
+    funciones = np.asarray(funciones, dtype=np.int64)
+    forma = (len(funciones), len(precios_min), len(precios_max))
+    asistentes = np.full(forma, np.nan)
+    validas = np.broadcast_to(precios_min[:, None] <= precios_max[None, :], forma)
+
+    def evaluar_celdas(mascara):
+        f, i, j = np.nonzero(mascara & validas & np.isnan(asistentes))
+        if len(f):
+            asistentes[f, i, j] = evaluar(precios_min[i], precios_max[j], funciones[f])
+
+    gruesos_min = indices_gruesos(len(precios_min), pasos_gruesos)
+    gruesos_max = indices_gruesos(len(precios_max), pasos_gruesos)
+    precio_promedio = (precios_min[:, None] + precios_max[None, :]) / 2
+
+    if refinar:
+        mascara = np.zeros(forma, dtype=bool)
+        mascara[:, gruesos_min[:, None], gruesos_max[None, :]] = True
+        evaluar_celdas(mascara)
+
+        ingresos = np.nan_to_num(asistentes * precio_promedio, nan=-np.inf)
+        orden = np.argsort(ingresos, axis=None)[::-1][:candidatos]
+        salto_min = int(np.max(np.diff(gruesos_min), initial=1))
+        salto_max = int(np.max(np.diff(gruesos_max), initial=1))
+        mascara[:] = False
+        for f, i, j in zip(*np.unravel_index(orden, forma)):
+            if np.isfinite(ingresos[f, i, j]):
+                mascara[f, max(0, i - salto_min):i + salto_min + 1, max(0, j - salto_max):j + salto_max + 1] = True
+        evaluar_celdas(mascara)
+    else:
+        evaluar_celdas(np.ones(forma, dtype=bool))
+
+    ingresos = asistentes * precio_promedio
+    evaluadas = int(np.count_nonzero(~np.isnan(asistentes)))
+    mejor = np.unravel_index(np.nanargmax(ingresos), forma) if evaluadas else None
+    return {
+        "asistentes": asistentes,
+        "ingresos": ingresos,
+        "mejor": mejor,
+        "gruesos_min": gruesos_min,
+        "gruesos_max": gruesos_max,
+        "evaluadas": evaluadas,
+        "validas": int(np.count_nonzero(validas)),
+    }
@@ -0,0 +1,193 @@
+"""Perfilado bajo demanda de las peticiones en producción.
+
+Una sesión perfila las próximas ``peticiones`` llamadas envueltas con
+``Perfilador.envolver`` o todas las que ocurran durante ``segundos``, en uno de
+dos modos:
+
+- ``muestreo``: un hilo toma la pila de los hilos que están atendiendo una
+  llamada perfilada cada ``intervalo`` segundos y acumula pilas colapsadas
+  (``a;b;c cuenta``, el formato de entrada de flamegraph.pl y speedscope);
+- ``determinista``: cada llamada corre bajo ``cProfile`` y las estadísticas se
+  acumulan en un ``pstats.Stats`` (volcado marshal o resumen de texto).
+
+Sin sesión activa ``envolver`` no se usa: el llamador comprueba ``activo`` antes.
+"""
+import cProfile
+import io
+import marshal
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+
+MODOS = ("muestreo", "determinista")
+FORMATOS = {"muestreo": ("colapsado",), "determinista": ("pstats", "texto")}
+
+
+class SesionActiva(RuntimeError):
+    """Ya hay una sesión de perfilado en curso."""
+
+
+class _Sesion:
+    def __init__(self, modo, peticiones, segundos, intervalo):
+        self.modo = modo
+        self.peticiones = peticiones
+        self.segundos = segundos
+        self.intervalo = intervalo
+        self.inicio = time.time()
+        self.fin = time.monotonic() + segundos
+        self.restantes = peticiones
+        self.completadas = 0
+        self.terminada = threading.Event()
+        self.pilas = Counter()
+        self.muestras = 0
+        self.estadisticas = None
+        self.hilos = {}
+
+    def estado(self):
+        return {
+            "modo": self.modo,
+            "estado": "terminada" if self.terminada.is_set() else "en_curso",
+            "peticiones": self.peticiones,
+            "completadas": self.completadas,
+            "segundos": self.segundos,
+            "muestras": self.muestras,
+            "iniciada": self.inicio,
+        }
+
+
+def _etiqueta(codigo, modulo):
+    return f"{modulo}:{getattr(codigo, 'co_qualname', codigo.co_name)}"
+
+
+class Perfilador:
+    def __init__(self):
+        self._sesion = None
+        self._lock = threading.Lock()
+        self._un_perfil = threading.Lock()
+
+    @property
+    def activo(self):
+        sesion = self._sesion
+        return sesion is not None and not sesion.terminada.is_set()
+
+    def iniciar(self, modo, peticiones=None, segundos=30.0, intervalo=0.005):
+        """Abre una sesión nueva (descarta el resultado de la anterior)."""
+        if modo not in MODOS:
+            raise ValueError(f"Modo desconocido: {modo} (opciones: {', '.join(MODOS)})")
+        with self._lock:
+            if self.activo:
+                raise SesionActiva("Ya hay una sesión de perfilado en curso")
+            sesion = self._sesion = _Sesion(modo, peticiones, segundos, intervalo)
+        threading.Thread(target=self._vigilar, args=(sesion,), name="perfilado", daemon=True).start()
+        return sesion.estado()
+
+    def detener(self):
+        sesion = self._sesion
+        if sesion is not None:
+            sesion.terminada.set()
+
+    def estado(self):
+        sesion = self._sesion
+        return None if sesion is None else sesion.estado()
+
+    def envolver(self, funcion):
+        """Versión de ``funcion`` que se perfila si a la sesión le quedan peticiones."""
+        sesion = self._sesion
+
+        def perfilada(*args, **kwargs):
+            with self._lock:
+                if sesion.terminada.is_set() or sesion.restantes == 0:
+                    cupo = False
+                else:
+                    cupo = True
+                    if sesion.restantes is not None:
+                        sesion.restantes -= 1
+            if not cupo:
+                return funcion(*args, **kwargs)
+
+            try:
+                if sesion.modo == "determinista":
+                    # Una llamada perfilada a la vez: desde Python 3.12 cProfile no
+                    # admite dos perfiles activos en el intérprete
+                    with self._un_perfil:
+                        perfil = cProfile.Profile()
+                        resultado = perfil.runcall(funcion, *args, **kwargs)
+                        with self._lock:
+                            if sesion.estadisticas is None:
+                                sesion.estadisticas = pstats.Stats(perfil)
+                            else:
+                                sesion.estadisticas.add(perfil)
+                    return resultado
+                else:
+                    hilo = threading.get_ident()
+                    with self._lock:
+                        sesion.hilos[hilo] = perfilada.__code__
+                    try:
+                        return funcion(*args, **kwargs)
+                    finally:
+                        with self._lock:
+                            del sesion.hilos[hilo]
+            finally:
+                with self._lock:
+                    sesion.completadas += 1
+                    if sesion.peticiones is not None and sesion.completadas >= sesion.peticiones:
+                        sesion.terminada.set()
+
+        return perfilada
+
+    def _vigilar(self, sesion):
+        """Toma muestras (modo muestreo) y cierra la sesión al vencer su ventana."""
+        espera = sesion.intervalo if sesion.modo == "muestreo" else 0.1
+        while not sesion.terminada.wait(espera):
+            if time.monotonic() >= sesion.fin:
+                sesion.terminada.set()
+                break
+            if sesion.modo == "muestreo":
+                self._muestrear(sesion)
+
+    def _muestrear(self, sesion):
+        with self._lock:
+            hilos = dict(sesion.hilos)
+        if not hilos:
+            return
+        marcos = sys._current_frames()
+        for hilo, codigo_envoltura in hilos.items():
+            marco = marcos.get(hilo)
+            pila = []
+            while marco is not None and marco.f_code is not codigo_envoltura:
+                pila.append(_etiqueta(marco.f_code, marco.f_globals.get("__name__", "?")))
+                marco = marco.f_back
+            if pila:
+                sesion.pilas[";".join(reversed(pila))] += 1
+                sesion.muestras += 1
+
+    def resultado(self, formato):
+        """``(contenido, media_type)`` de la sesión terminada; ``None`` si sigue en curso.
+
+        Lanza ``LookupError`` si no hubo sesión y ``ValueError`` si el formato no
+        corresponde al modo.
+        """
+        sesion = self._sesion
+        if sesion is None:
+            raise LookupError("No hay sesión de perfilado")
+        if not sesion.terminada.is_set():
+            return None
+        if formato not in FORMATOS[sesion.modo]:
+            raise ValueError(f"El modo {sesion.modo} produce: {', '.join(FORMATOS[sesion.modo])}")
+
+        if formato == "colapsado":
+            lineas = [f"{pila} {cuenta}" for pila, cuenta in sesion.pilas.most_common()]
+            return "\n".join(lineas) + "\n", "text/plain; charset=utf-8"
+        if formato == "pstats":
+            # Mismo contenido que Stats.dump_stats: se abre con pstats.Stats(ruta) o snakeviz
+            estadisticas = {} if sesion.estadisticas is None else sesion.estadisticas.stats
+            return marshal.dumps(estadisticas), "application/octet-stream"
+        if sesion.estadisticas is None:
+            return "Sin peticiones perfiladas\n", "text/plain; charset=utf-8"
+        salida = io.StringIO()
+        informe = pstats.Stats(stream=salida)
+        informe.add(sesion.estadisticas)
+        informe.sort_stats("cumulative").print_stats(40)
+        return salida.getvalue(), "text/plain; charset=utf-8"
@@ -0,0 +1,231 @@
+"""Inferencia en procesos trabajadores que cargan el modelo una sola vez.
+
+El proceso web codifica las filas con ``PredictorCompilado.codificar`` directamente
+sobre un bloque de memoria compartida del trabajador; el trabajador evalúa el
+estimador sobre esa misma memoria y escribe las predicciones en otro bloque
+compartido. Por la tubería solo viaja el número de filas.
+
+Si un trabajador muere (memoria agotada, fallo de la librería nativa), la
+petición que lo estaba usando falla, y el trabajador se reinicia en segundo plano
+sobre los mismos bloques de memoria antes de volver a recibir lotes. Si no
+arranca, su ranura se descarta y el pool sigue con menos procesos (ver ``estado``).
+Cada trabajador comprueba antes de cargar que el artefacto sigue siendo el de la
+versión (mismo tamaño y fecha de modificación): si lo reemplazaron, no arranca,
+para no servir otro modelo bajo el nombre de esta versión.
+"""
+import atexit
+import multiprocessing as mp
+import os
+import queue
+import threading
+from multiprocessing.shared_memory import SharedMemory
+
+import joblib
+import numpy as np
+
+from codificacion import LoteCodificado
+from predictores import PredictorCompilado
+
+
+def firma_artefacto(ruta):
+    """Identidad del archivo en disco: ``(tamaño, st_mtime_ns)``."""
+    estado = os.stat(ruta)
+    return estado.st_size, estado.st_mtime_ns
+
+
+def _trabajador(ruta_modelo, firma, mmap, nombre_entrada, nombre_salida, max_filas, n_features, conexion):
+    if firma_artefacto(ruta_modelo) != firma:
+        conexion.send(f"El artefacto {ruta_modelo} cambió desde que se cargó esta versión")
+        return
+    compilado = PredictorCompilado(joblib.load(ruta_modelo, mmap_mode="r" if mmap else None))
+    if compilado.booster is not None:
+        # Un hilo por proceso: el paralelismo lo dan los procesos
+        compilado.booster.set_param({"nthread": 1})
+    entrada = SharedMemory(name=nombre_entrada)
+    salida = SharedMemory(name=nombre_salida)
+    matriz = np.ndarray((max_filas, n_features), dtype=np.float32, buffer=entrada.buf)
+    preds = np.ndarray((max_filas,), dtype=np.float64, buffer=salida.buf)
+    conexion.send(compilado.n_features)
+
+    while True:
+        n = conexion.recv()
+        if n is None:
+            break
+        try:
+            preds[:n] = compilado.predecir_matriz(matriz[:n])
+            conexion.send(None)
+        except Exception as error:
+            conexion.send(repr(error))
+    del matriz, preds
+    entrada.close()
+    salida.close()
+
+
+class _Ranura:
+    """Un proceso trabajador con sus bloques de entrada y salida."""
+
+    def __init__(self, contexto, ruta_modelo, firma, mmap, max_filas, n_features):
+        self.entrada = SharedMemory(create=True, size=max_filas * n_features * 4)
+        self.salida = SharedMemory(create=True, size=max_filas * 8)
+        self.matriz = np.ndarray((max_filas, n_features), dtype=np.float32, buffer=self.entrada.buf)
+        self.preds = np.ndarray((max_filas,), dtype=np.float64, buffer=self.salida.buf)
+        self._argumentos = (contexto, ruta_modelo, firma, mmap, max_filas, n_features)
+        self._arrancar()
+
+    def _arrancar(self):
+        contexto, ruta_modelo, firma, mmap, max_filas, n_features = self._argumentos
+        self.conexion, extremo = contexto.Pipe()
+        self.proceso = contexto.Process(
+            target=_trabajador,
+            args=(ruta_modelo, firma, mmap, self.entrada.name, self.salida.name, max_filas, n_features, extremo),
+            daemon=True,
+        )
+        self.proceso.start()
+        # Sin la copia del padre, recv ve EOF (en vez de esperar para siempre) si el trabajador muere
+        extremo.close()
+
+    def esperar_listo(self):
+        listo = self.conexion.recv()
+        if isinstance(listo, str):
+            raise RuntimeError(listo)
+        if listo != self._argumentos[-1]:
+            raise RuntimeError("El trabajador cargó un modelo con otro número de features")
+
+    def reiniciar(self):
+        """Reemplaza el proceso (muerto o con la tubería rota) por uno nuevo sobre los mismos bloques."""
+        self._detener(timeout=1)
+        self._arrancar()
+        self.esperar_listo()
+
+    def _detener(self, timeout):
+        try:
+            self.conexion.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.proceso.join(timeout=timeout)
+        if self.proceso.is_alive():
+            self.proceso.kill()
+            self.proceso.join()
+        self.conexion.close()
+
+    def cerrar(self):
+        self._detener(timeout=5)
+        del self.matriz, self.preds
+        for bloque in (self.entrada, self.salida):
+            bloque.close()
+            bloque.unlink()
+
+
+class PredictorProcesos:
+    """Predictor que reparte los lotes entre ``n_procesos`` trabajadores.
+
+    ``predict`` es bloqueante; hasta ``n_procesos`` llamadas concurrentes (desde
+    hilos distintos) se atienden en paralelo real, sin compartir el GIL. ``firma`` es la
+    de ``firma_artefacto`` cuando se cargó ``compilado`` (por defecto, la actual).
+    """
+
+    nombre = "procesos"
+    acepta_lotes = True
+
+    def __init__(self, compilado, ruta_modelo, n_procesos, max_filas=8192, mmap=False, firma=None):
+        self.compilado = compilado
+        firma = firma or firma_artefacto(ruta_modelo)
+        self.max_filas = max_filas
+        self.n_procesos = n_procesos
+        if "forkserver" in mp.get_all_start_methods():
+            # El servidor de forks precarga este módulo (numpy, sklearn) una sola vez
+            # y no hereda los hilos del proceso web.
+            contexto = mp.get_context("forkserver")
+            contexto.set_forkserver_preload([__name__])
+        else:
+            contexto = mp.get_context("spawn")
+        self._ranuras = [
+            _Ranura(contexto, ruta_modelo, firma, mmap, max_filas, compilado.n_features) for _ in range(n_procesos)
+        ]
+        self._libres = queue.Queue()
+        for ranura in self._ranuras:
+            ranura.esperar_listo()
+            self._libres.put(ranura)
+        self._lock = threading.Lock()
+        self.reiniciando = 0
+        self.reinicios = 0
+        self.descartadas = 0
+        atexit.register(self.cerrar)
+
+    def estado(self):
+        """``disponibles`` cuenta los trabajadores vivos y los que se están reiniciando."""
+        with self._lock:
+            return {
+                "procesos": self.n_procesos,
+                "disponibles": len(self._ranuras),
+                "reiniciando": self.reiniciando,
+                "reinicios": self.reinicios,
+                "descartadas": self.descartadas,
+            }
+
+    def _tomar_ranura(self):
+        while True:
+            if not self._ranuras:
+                raise RuntimeError("No quedan trabajadores de inferencia")
+            try:
+                return self._libres.get(timeout=1)
+            except queue.Empty:
+                continue
+
+    def _reponer(self, ranura):
+        """Reinicia el trabajador de ``ranura`` y la devuelve al pool; si no arranca, la descarta."""
+        try:
+            ranura.reiniciar()
+        except Exception as error:
+            print(f"❌ No se pudo reiniciar el trabajador de inferencia ({error!r}); el pool queda con uno menos")
+            with self._lock:
+                self.reiniciando -= 1
+                self.descartadas += 1
+                if ranura in self._ranuras:
+                    self._ranuras.remove(ranura)
+            ranura.cerrar()
+            return
+        with self._lock:
+            self.reiniciando -= 1
+            self.reinicios += 1
+        self._libres.put(ranura)
+
+    def predict(self, datos):
+        ranura = self._tomar_ranura()
+        rota = False
+        try:
+            resultado = np.empty(len(datos))
+            for inicio in range(0, len(datos), self.max_filas):
+                if isinstance(datos, LoteCodificado):
+                    trozo = datos.filas(inicio, inicio + self.max_filas)
+                else:
+                    trozo = datos.iloc[inicio:inicio + self.max_filas]
+                n = len(trozo)
+                self.compilado.codificar(trozo, salida=ranura.matriz[:n])
+                try:
+                    ranura.conexion.send(n)
+                    error = ranura.conexion.recv()
+                except (EOFError, OSError) as caida:
+                    rota = True
+                    raise RuntimeError(
+                        f"El trabajador de inferencia terminó (código {ranura.proceso.exitcode})"
+                    ) from caida
+                if error is not None:
+                    raise RuntimeError(f"Error en el trabajador de inferencia: {error}")
+                resultado[inicio:inicio + n] = ranura.preds[:n]
+            return resultado
+        finally:
+            if rota:
+                print(f"⚠️ El trabajador de inferencia {ranura.proceso.pid} terminó; se reinicia")
+                with self._lock:
+                    self.reiniciando += 1
+                threading.Thread(target=self._reponer, args=(ranura,), name="reinicio-trabajador", daemon=True).start()
+            else:
+                self._libres.put(ranura)
+
+    def cerrar(self):
+        # Sin esto el registro de atexit retiene el pool (y su modelo) hasta que termina el proceso
+        atexit.unregister(self.cerrar)
+        ranuras, self._ranuras = self._ranuras, []
+        for ranura in ranuras:
+            ranura.cerrar()
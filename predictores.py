@@ -0,0 +1,215 @@
+"""Backends de inferencia intercambiables alrededor del artefacto del modelo.
+
+Todos exponen ``predict(datos) -> np.ndarray`` sobre el DataFrame de
+``construir_datos_modelo``:
+
+* ``PredictorPipeline``: la referencia, delega en ``modelo.predict``.
+* ``PredictorCompilado``: precalcula la codificación categórica del
+  ``ColumnTransformer`` del pipeline y pasa una matriz densa float32
+  directamente al estimador final (``inplace_predict`` en XGBoost). Acepta
+  además un ``LoteCodificado`` (``acepta_lotes``), cuyas categóricas ya vienen
+  como códigos enteros.
+"""
+import numpy as np
+import pandas as pd
+from sklearn.compose import ColumnTransformer
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import FunctionTransformer, OneHotEncoder, OrdinalEncoder
+
+from codificacion import LoteCodificado, transformadores_ajustados
+
+BACKENDS = ("pipeline", "compilado", "auto")
+
+
+class BackendNoSoportado(ValueError):
+    """El artefacto no tiene la forma que el backend sabe compilar."""
+
+
+def _codigos(datos, columna, indice):
+    """Posición de cada valor de ``columna`` en ``indice`` (-1 si no está)."""
+    if isinstance(datos, LoteCodificado):
+        return np.broadcast_to(datos[columna], len(datos))
+    return indice.get_indexer(datos[columna].to_numpy())
+
+
+class PredictorPipeline:
+    nombre = "pipeline"
+    acepta_lotes = False
+
+    def __init__(self, modelo):
+        self.modelo = modelo
+
+    def predict(self, datos):
+        return np.asarray(self.modelo.predict(datos), dtype=float)
+
+
+class _BloqueOneHot:
+    def __init__(self, columnas, encoder):
+        if encoder._infrequent_enabled:
+            raise BackendNoSoportado("OneHotEncoder con categorías infrecuentes")
+        self.columnas = columnas
+        self.indices = [pd.Index(categorias) for categorias in encoder.categories_]
+        self.descartadas = (
+            [None] * len(columnas) if encoder.drop_idx_ is None else list(encoder.drop_idx_)
+        )
+        self.ignorar_desconocidas = encoder.handle_unknown != "error"
+        self.ancho = sum(
+            len(indice) - (descartada is not None) for indice, descartada in zip(self.indices, self.descartadas)
+        )
+
+    def transformar(self, datos, salida):
+        n = len(datos)
+        filas = np.arange(n)
+        desplazamiento = 0
+        for columna, indice, descartada in zip(self.columnas, self.indices, self.descartadas):
+            codigos = _codigos(datos, columna, indice)
+            validos = codigos >= 0
+            if not self.ignorar_desconocidas and not validos.all():
+                raise ValueError(f"Categoría desconocida en {columna}")
+            if descartada is not None:
+                validos &= codigos != descartada
+                codigos = np.where(codigos > descartada, codigos - 1, codigos)
+            salida[filas[validos], desplazamiento + codigos[validos]] = 1.0
+            desplazamiento += len(indice) - (descartada is not None)
+
+
+class _BloqueOrdinal:
+    def __init__(self, columnas, encoder):
+        self.columnas = columnas
+        self.indices = [pd.Index(categorias) for categorias in encoder.categories_]
+        self.valor_desconocido = (
+            encoder.unknown_value if encoder.handle_unknown == "use_encoded_value" else None
+        )
+        self.ancho = len(columnas)
+
+    def transformar(self, datos, salida):
+        for j, (columna, indice) in enumerate(zip(self.columnas, self.indices)):
+            codigos = _codigos(datos, columna, indice).astype(np.float32)
+            desconocidos = codigos < 0
+            if desconocidos.any():
+                if self.valor_desconocido is None:
+                    raise ValueError(f"Categoría desconocida en {columna}")
+                codigos[desconocidos] = self.valor_desconocido
+            salida[:, j] = codigos
+
+
+class _BloqueDirecto:
+    """Columnas que pasan sin cambios (``passthrough`` o ``FunctionTransformer`` identidad)."""
+
+    def __init__(self, columnas):
+        self.columnas = columnas
+        self.ancho = len(columnas)
+
+    def transformar(self, datos, salida):
+        lote = isinstance(datos, LoteCodificado)
+        for j, columna in enumerate(self.columnas):
+            salida[:, j] = datos[columna] if lote else datos[columna].to_numpy()
+
+
+class _BloqueGenerico:
+    """Cualquier otro transformador ajustado: se delega en su ``transform``."""
+
+    def __init__(self, columnas, transformador, ancho):
+        self.columnas = columnas
+        self.transformador = transformador
+        self.ancho = ancho
+
+    def transformar(self, datos, salida):
+        if isinstance(datos, LoteCodificado):
+            datos = datos.a_dataframe()
+        resultado = self.transformador.transform(datos[self.columnas])
+        salida[:] = resultado.toarray() if hasattr(resultado, "toarray") else resultado
+
+
+class PredictorCompilado:
+    nombre = "compilado"
+    acepta_lotes = True
+
+    def __init__(self, modelo):
+        if not isinstance(modelo, Pipeline) or len(modelo.steps) != 2:
+            raise BackendNoSoportado("se esperaba un Pipeline de (ColumnTransformer, estimador)")
+        preprocesamiento, self.estimador = modelo.steps[0][1], modelo.steps[-1][1]
+        if not isinstance(preprocesamiento, ColumnTransformer):
+            raise BackendNoSoportado("el primer paso del pipeline no es un ColumnTransformer")
+
+        self.bloques = []
+        for nombre, transformador, columnas in transformadores_ajustados(preprocesamiento):
+            if transformador == "drop" or not columnas:
+                continue
+            if isinstance(transformador, OneHotEncoder):
+                self.bloques.append(_BloqueOneHot(columnas, transformador))
+            elif isinstance(transformador, OrdinalEncoder):
+                self.bloques.append(_BloqueOrdinal(columnas, transformador))
+            elif transformador == "passthrough" or (
+                isinstance(transformador, FunctionTransformer) and transformador.func is None
+            ):
+                self.bloques.append(_BloqueDirecto(columnas))
+            else:
+                indices = preprocesamiento.output_indices_[nombre]
+                self.bloques.append(_BloqueGenerico(columnas, transformador, indices.stop - indices.start))
+        self.n_features = sum(bloque.ancho for bloque in self.bloques)
+
+        self.booster = None
+        if hasattr(self.estimador, "get_booster"):
+            self.booster = self.estimador.get_booster()
+            try:
+                self.rango_iteraciones = (0, self.estimador.best_iteration + 1)
+            except AttributeError:
+                self.rango_iteraciones = (0, 0)
+
+    def codificar(self, datos, salida=None):
+        """Matriz densa float32 equivalente a la salida del ``ColumnTransformer``.
+
+        ``datos`` es el DataFrame de entrada o un ``LoteCodificado`` del mismo modelo.
+
+        Si se da ``salida`` (p. ej. una vista sobre memoria compartida) se escribe ahí.
+        """
+        if salida is None:
+            salida = np.zeros((len(datos), self.n_features), dtype=np.float32)
+        else:
+            salida[:] = 0
+        inicio = 0
+        for bloque in self.bloques:
+            bloque.transformar(datos, salida[:, inicio:inicio + bloque.ancho])
+            inicio += bloque.ancho
+        return salida
+
+    def predict(self, datos):
+        return self.predecir_matriz(self.codificar(datos))
+
+    def predecir_matriz(self, matriz):
+        """Evalúa el estimador final sobre una matriz ya codificada."""
+        if self.booster is not None:
+            preds = self.booster.inplace_predict(
+                matriz, iteration_range=self.rango_iteraciones, validate_features=False
+            )
+        else:
+            preds = self.estimador.predict(matriz)
+        return np.asarray(preds, dtype=float).reshape(-1)
+
+
+def crear_predictor(modelo, backend="auto", muestra=None, tolerancia=1e-6):
+    """Construye el predictor del backend pedido.
+
+    Con ``backend="auto"`` intenta el compilado y vuelve al pipeline si el artefacto
+    no es compatible o si, sobre ``muestra``, sus predicciones se alejan de la
+    referencia más de ``tolerancia`` (relativa).
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Backend desconocido: {backend} (opciones: {', '.join(BACKENDS)})")
+    referencia = PredictorPipeline(modelo)
+    if backend == "pipeline":
+        return referencia
+    try:
+        compilado = PredictorCompilado(modelo)
+        if muestra is not None:
+            esperado = referencia.predict(muestra)
+            obtenido = compilado.predict(muestra)
+            if not np.allclose(obtenido, esperado, rtol=tolerancia, atol=0):
+                raise BackendNoSoportado("las predicciones no coinciden con el pipeline de referencia")
+        return compilado
+    except BackendNoSoportado as error:
+        if backend == "compilado":
+            raise
+        print(f"⚠️ Backend compilado no disponible ({error}); se usa el pipeline")
+        return referencia
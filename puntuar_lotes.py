@@ -0,0 +1,177 @@
+"""Puntuación masiva fuera de línea de catálogos de eventos (CSV o Parquet).
+
+    python puntuar_lotes.py catalogo.csv predicciones.parquet [--filas 50000] [--procesos 4] [--ventana]
+
+La entrada tiene las columnas del formulario de /predecir (``fecha``,
+``Departamento``, ``Municipio``, ``artista_nombre``, ``genero``, ...). Como en el
+servicio, departamento y municipio se llevan a su forma canónica con el índice de
+geografía de ``main`` y ``EsCapital`` se deriva de él (una columna ``EsCapital`` de
+la entrada se ignora); las filas cuyo par no está en la tabla se puntúan con los
+nombres recibidos y EsCapital "0" y se marcan con ``ubicacion_valida`` en falso. Se
+lee por tramos de ``--filas`` filas, las features temporales se calculan vectorizadas
+con el calendario de ``main`` y cada tramo se escribe al Parquet de salida apenas
+está predicho, con las columnas ``prediccion``, ``ingresos_estimados`` y
+``ubicacion_valida`` (y ``EsCapital`` derivado). La memoria no depende del tamaño de
+la entrada. Con ``--ventana`` la predicción es el promedio de la ventana de ±2 días,
+igual que en /predecir.
+
+Requiere pyarrow (no hace falta para el servicio web).
+"""
+import argparse
+import multiprocessing as mp
+import resource
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow solo lo necesita esta herramienta
+    pa = pq = None
+
+import main
+
+COLUMNAS_REQUERIDAS = [
+    "fecha", "Departamento", "Municipio", "artista_nombre", "genero", "tipo", "CategoriaFunciones",
+    "NumeroFunciones", "PrecioMinimo", "PrecioMaximo", "cantidad_artistas_evento",
+]
+TIPOS_COLUMNAS = {
+    "NumeroFunciones": "int64",
+    "PrecioMinimo": "float64",
+    "PrecioMaximo": "float64",
+    "cantidad_artistas_evento": "int64",
+}
+
+
+def leer_tramos(ruta, filas):
+    """Itera la entrada en DataFrames de a lo sumo ``filas`` filas."""
+    if Path(ruta).suffix.lower() in (".parquet", ".pq"):
+        for lote in pq.ParquetFile(ruta).iter_batches(batch_size=filas):
+            yield lote.to_pandas()
+    else:
+        yield from pd.read_csv(ruta, chunksize=filas, dtype={"EsCapital": str})
+
+
+def puntuar_tramo(tramo, ventana=False):
+    """Agrega ``prediccion`` e ``ingresos_estimados`` a ``tramo`` (con el modelo de ``main``)."""
+    faltantes = [c for c in COLUMNAS_REQUERIDAS if c not in tramo.columns]
+    if faltantes:
+        raise ValueError(f"Faltan columnas en la entrada: {', '.join(faltantes)}")
+    tramo = tramo.astype(TIPOS_COLUMNAS)
+    departamentos, municipios, es_capital, ubicadas = main.GEO.ubicar_columnas(
+        tramo["Departamento"].to_numpy(dtype=object), tramo["Municipio"].to_numpy(dtype=object)
+    )
+    if not ubicadas.all():
+        print(
+            f"⚠️ {np.count_nonzero(~ubicadas):,} filas con un departamento/municipio fuera de la tabla "
+            "(ubicacion_valida = False)",
+            file=sys.stderr,
+        )
+
+    evento = {
+        "Departamento": departamentos,
+        "Municipio": municipios,
+        "EsCapital": es_capital,
+        "CategoriaFunciones": tramo["CategoriaFunciones"].to_numpy(dtype=object),
+        "artista": tramo["artista_nombre"].to_numpy(dtype=object),
+        "genero": tramo["genero"].to_numpy(dtype=object),
+        "tipo": tramo["tipo"].to_numpy(dtype=object),
+        "NumeroFunciones": tramo["NumeroFunciones"].to_numpy(),
+        "PrecioMinimo": tramo["PrecioMinimo"].to_numpy(),
+        "PrecioMaximo": tramo["PrecioMaximo"].to_numpy(),
+        "cantidad_artistas_evento": tramo["cantidad_artistas_evento"].to_numpy(),
+    }
+    fechas = pd.to_datetime(tramo["fecha"]).to_numpy(dtype="datetime64[D]")
+
+    n_ventana = 1
+    if ventana:
+        n_ventana = len(main.DESPLAZAMIENTOS_VENTANA)
+        fechas = (fechas[:, None] + np.asarray(main.DESPLAZAMIENTOS_VENTANA)).ravel()
+        evento = {clave: np.repeat(valores, n_ventana) for clave, valores in evento.items()}
+    datos = main.construir_lote(evento, main.CALENDARIO.consultar(fechas))
+    preds = np.asarray(main.predictor.predict(datos), dtype=float).reshape(-1, n_ventana).mean(axis=1)
+
+    precio_promedio = (tramo["PrecioMinimo"].to_numpy() + tramo["PrecioMaximo"].to_numpy()) / 2
+    return tramo.assign(
+        EsCapital=es_capital,
+        prediccion=preds,
+        ingresos_estimados=(preds * precio_promedio).astype(np.int64),
+        ubicacion_valida=ubicadas,
+    )
+
+
+def cargar_modelo():
+    main.cargar_modelo()
+    if main.modelo is None:
+        raise RuntimeError(f"No se pudo cargar el modelo: {main.ERROR_CARGA}")
+
+
+def puntuar(entrada, salida, filas=50_000, procesos=1, ventana=False, cada_segundos=5.0):
+    """Puntúa ``entrada`` hacia ``salida``; devuelve el total de filas escritas.
+
+    Con ``procesos > 1`` cada proceso carga el modelo una vez y recibe tramos
+    completos; hay como máximo ``2 * procesos`` tramos en vuelo y se escriben en el
+    orden de la entrada.
+    """
+    if pq is None:
+        raise RuntimeError("La puntuación masiva necesita pyarrow (pip install pyarrow)")
+
+    escritor = None
+    total = 0
+    inicio = ultimo_reporte = time.perf_counter()
+
+    def escribir(resultado):
+        nonlocal escritor, total, ultimo_reporte
+        tabla = pa.Table.from_pandas(resultado, preserve_index=False)
+        if escritor is None:
+            escritor = pq.ParquetWriter(salida, tabla.schema)
+        escritor.write_table(tabla.cast(escritor.schema))
+        total += len(resultado)
+        if time.perf_counter() - ultimo_reporte >= cada_segundos:
+            ultimo_reporte = time.perf_counter()
+            print(f"📊 {total:,} filas, {total / (ultimo_reporte - inicio):,.0f} filas/s", file=sys.stderr)
+
+    try:
+        if procesos > 1:
+            metodo = "forkserver" if "forkserver" in mp.get_all_start_methods() else "spawn"
+            with ProcessPoolExecutor(procesos, mp.get_context(metodo), initializer=cargar_modelo) as ejecutor:
+                en_vuelo = deque()
+                for tramo in leer_tramos(entrada, filas):
+                    en_vuelo.append(ejecutor.submit(puntuar_tramo, tramo, ventana))
+                    if len(en_vuelo) >= 2 * procesos:
+                        escribir(en_vuelo.popleft().result())
+                while en_vuelo:
+                    escribir(en_vuelo.popleft().result())
+        else:
+            cargar_modelo()
+            for tramo in leer_tramos(entrada, filas):
+                escribir(puntuar_tramo(tramo, ventana))
+    finally:
+        if escritor is not None:
+            escritor.close()
+
+    duracion = time.perf_counter() - inicio
+    pico_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(
+        f"✅ {total:,} filas en {duracion:.1f} s ({total / max(duracion, 1e-9):,.0f} filas/s), "
+        f"RSS máx. {pico_mb:.0f} MB -> {salida}",
+        file=sys.stderr,
+    )
+    return total
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Puntúa un catálogo de eventos CSV/Parquet y escribe Parquet.")
+    parser.add_argument("entrada", help="archivo .csv o .parquet")
+    parser.add_argument("salida", help="archivo .parquet de salida")
+    parser.add_argument("--filas", type=int, default=50_000, help="filas por tramo")
+    parser.add_argument("--procesos", type=int, default=1, help="procesos trabajadores (1 = en este proceso)")
+    parser.add_argument("--ventana", action="store_true", help="promedio de la ventana de ±2 días como en /predecir")
+    args = parser.parse_args()
+    puntuar(args.entrada, args.salida, args.filas, args.procesos, args.ventana)
@@ -0,0 +1,137 @@
+"""Registro de versiones del modelo: recarga en segundo plano, publicación atómica y reversión.
+
+La versión activa es un único atributo y publicar o revertir es reasignarlo. Cada
+petición toma la versión activa al empezar y la usa hasta terminar, así que las
+que están en vuelo acaban con la versión con la que empezaron aunque entre tanto
+se publique otra. Se guardan hasta ``max_anteriores`` versiones previas para
+revertir al instante; la que sale del historial libera sus recursos (los
+procesos trabajadores de ``PredictorProcesos``), así que con ``max_anteriores=0``
+una petición que aún use la versión reemplazada puede fallar con ese backend.
+"""
+import threading
+import time
+from collections import deque
+
+
+class RecargaEnCurso(RuntimeError):
+    """Ya hay una recarga del modelo en curso."""
+
+
+class VersionModelo:
+    """Un artefacto cargado y calentado, con todo lo que las peticiones derivan de él."""
+
+    def __init__(self, version, ruta, modelo, predictor, indice, autocompletado, segundos_carga):
+        self.numero = None
+        self.version = version
+        self.ruta = ruta
+        self.modelo = modelo
+        self.predictor = predictor
+        self.indice = indice
+        self.autocompletado = autocompletado
+        self.segundos_carga = segundos_carga
+        self.tiempos_ms = {}
+        self.publicada = None
+
+    def describir(self):
+        return {
+            "numero": self.numero,
+            "version": self.version,
+            "ruta": self.ruta,
+            "backend": self.predictor.nombre,
+            "segundos_carga": round(self.segundos_carga, 3),
+            "tiempos_ms": self.tiempos_ms,
+            "publicada": self.publicada,
+        }
+
+    def cerrar(self):
+        cerrar = getattr(self.predictor, "cerrar", None)
+        if cerrar is not None:
+            cerrar()
+
+
+class RegistroModelos:
+    def __init__(self, max_anteriores=1, al_publicar=None, al_descartar=None):
+        self.max_anteriores = max_anteriores
+        self.al_publicar = al_publicar
+        self.al_descartar = al_descartar
+        self.activa = None
+        self.anteriores = deque()
+        self.recarga = None
+        self._numero = 0
+        self._lock = threading.Lock()
+
+    def publicar(self, version):
+        """Hace activa ``version`` y pasa la anterior al historial."""
+        with self._lock:
+            self._numero += 1
+            version.numero = self._numero
+            version.publicada = time.time()
+            if self.activa is not None:
+                self.anteriores.appendleft(self.activa)
+            self._activar(version)
+            descartadas = []
+            while len(self.anteriores) > self.max_anteriores:
+                descartadas.append(self.anteriores.pop())
+        for descartada in descartadas:
+            descartada.cerrar()
+            if self.al_descartar is not None:
+                self.al_descartar(descartada)
+        return version
+
+    def revertir(self, numero=None):
+        """Vuelve a la versión anterior más reciente (o a la de ``numero``).
+
+        Lanza ``LookupError`` si no hay versión anterior (o ninguna con ese número).
+        """
+        with self._lock:
+            candidatas = [v for v in self.anteriores if numero is None or v.numero == numero]
+            if not candidatas:
+                raise LookupError("No hay versión anterior" if numero is None else f"No hay versión {numero}")
+            elegida = candidatas[0]
+            self.anteriores.remove(elegida)
+            self.anteriores.appendleft(self.activa)
+            self._activar(elegida)
+        return elegida
+
+    def _activar(self, version):
+        self.activa = version
+        if self.al_publicar is not None:
+            self.al_publicar(version)
+
+    def recargar(self, preparar):
+        """Corre ``preparar()`` (carga y calentamiento) en un hilo y publica la versión que devuelve.
+
+        La versión activa sigue atendiendo mientras tanto; si ``preparar`` falla no
+        cambia nada. Lanza ``RecargaEnCurso`` si ya hay una recarga en marcha.
+        """
+        with self._lock:
+            if self.recarga is not None and self.recarga["estado"] == "en_curso":
+                raise RecargaEnCurso("Ya hay una recarga del modelo en curso")
+            self.recarga = {"estado": "en_curso", "iniciada": time.time(), "terminada": None, "error": None}
+            recarga = self.recarga
+        threading.Thread(target=self._recargar, args=(preparar, recarga), name="recarga-modelo", daemon=True).start()
+        return dict(recarga)
+
+    def _recargar(self, preparar, recarga):
+        try:
+            version = self.publicar(preparar())
+            recarga.update(estado="publicada", numero=version.numero)
+        except Exception as error:
+            recarga.update(estado="error", error=repr(error))
+        recarga["terminada"] = time.time()
+
+    def vivas(self):
+        """Versiones en memoria: la activa y las anteriores."""
+        with self._lock:
+            return [v for v in (self.activa, *self.anteriores) if v is not None]
+
+    def estado(self):
+        with self._lock:
+            activa, anteriores = self.activa, list(self.anteriores)
+            recarga = None if self.recarga is None else dict(self.recarga)
+        return {
+            "activa": None if activa is None else activa.describir(),
+            "anteriores": [version.describir() for version in anteriores],
+            "max_anteriores": self.max_anteriores,
+            "recarga": recarga,
+        }
@@ -0,0 +1,35 @@
+// Requiere geografia.js (municipiosPorDepartamento y capitales)
+
+function cargarMunicipios() {
+    const deptSelect = document.getElementById('Departamento');
+    const munSelect = document.getElementById('Municipio');
+    const departamento = deptSelect.value;
+
+    munSelect.innerHTML = '<option value="">Seleccionar municipio</option>';
+
+    if (departamento && municipiosPorDepartamento[departamento]) {
+        municipiosPorDepartamento[departamento].forEach(mun => {
+            const option = document.createElement('option');
+            option.value = mun;
+            option.textContent = mun;
+            munSelect.appendChild(option);
+        });
+    }
+}
+
+function verificarCapital() {
+    const munSelect = document.getElementById('Municipio');
+    const esCapitalSelect = document.getElementById('EsCapital');
+    const municipio = munSelect.value;
+
+    if (capitales.has(municipio)) {
+        esCapitalSelect.value = '1';
+    } else {
+        esCapitalSelect.value = '0';
+    }
+}
+
+window.onload = function() {
+    cargarMunicipios();
+    document.getElementById('Municipio').value = document.body.dataset.municipio;
+};
@@ -0,0 +1,35 @@
+"""Configuración compartida: rutas del proyecto y el modelo sustituto de ``benchmarks/``."""
+import sys
+from pathlib import Path
+
+import pytest
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ))
+sys.path.insert(0, str(RAIZ / "benchmarks"))
+
+
+@pytest.fixture(scope="session")
+def ruta_modelo():
+    """Ruta del modelo sustituto (se genera la primera vez)."""
+    import joblib
+    from _comun import RUTA_SUSTITUTO
+    from modelo_sustituto import construir_modelo
+
+    if not RUTA_SUSTITUTO.exists():
+        joblib.dump(construir_modelo(), RUTA_SUSTITUTO)
+    return RUTA_SUSTITUTO
+
+
+@pytest.fixture(scope="session")
+def main(ruta_modelo):
+    """``main`` importado y cargado con el modelo sustituto (sin calentamiento, para ir rápido)."""
+    import os
+
+    os.environ.setdefault("EVENTIA_MODEL_PATH", str(ruta_modelo))
+    os.environ.setdefault("EVENTIA_CALENTAMIENTO_REPETICIONES", "0")
+    import main
+
+    main.cargar_modelo()
+    assert main.MODELOS.activa is not None, main.ERROR_CARGA
+    return main
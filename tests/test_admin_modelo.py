@@ -0,0 +1,83 @@
+"""/admin/modelo/recargar solo acepta artefactos por nombre dentro del directorio de modelos."""
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture
+def directorio(main, tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "DIRECTORIO_MODELOS", str(tmp_path))
+    monkeypatch.setattr(main, "ADMIN_TOKEN", "secreto")
+    (tmp_path / "modelo.pkl").write_bytes(b"")
+    os.symlink("/etc/passwd", tmp_path / "enlace.pkl")
+    return tmp_path
+
+
+def test_ruta_artefacto(main, directorio):
+    assert main.ruta_artefacto("modelo.pkl") == str(directorio / "modelo.pkl")
+    assert main.ruta_artefacto("nuevo.pkl") == str(directorio / "nuevo.pkl")
+    for archivo in ["", "/etc/passwd", "../modelo.pkl", "sub/modelo.pkl", "..", ".descarga-x.tmp", "enlace.pkl"]:
+        assert main.ruta_artefacto(archivo) is None, archivo
+
+
+@pytest.mark.parametrize(
+    "solicitud",
+    [
+        {"archivo": "/etc/passwd"},
+        {"archivo": "../x.pkl"},
+        {"archivo": "enlace.pkl"},
+        {"url": "file:///etc/passwd"},
+        {"archivo": "modelo.pkl", "url": "http://localhost/modelo.pkl"},
+    ],
+)
+def test_recargar_rechaza_rutas_fuera_del_directorio(main, directorio, solicitud):
+    anterior = main.MODELOS.recarga
+    with TestClient(main.app) as cliente:
+        resp = cliente.post(
+            "/admin/modelo/recargar", json=solicitud, headers={"Authorization": "Bearer secreto"}
+        )
+    assert resp.status_code == 422, resp.text
+    assert main.MODELOS.recarga is anterior
+
+
+@pytest.fixture
+def servidor():
+    """Servidor HTTP local que responde ``b"no es un pickle"`` a cualquier GET."""
+
+    class Manejador(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.end_headers()
+            self.wfile.write(b"no es un pickle")
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Manejador)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}/modelo.pkl"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_recarga_desde_url_no_pisa_el_modelo_en_uso(main, directorio, servidor, monkeypatch):
+    monkeypatch.setattr(main, "MODEL_PATH", str(directorio / "modelo.pkl"))
+    original = main.MODELOS.activa
+    with TestClient(main.app) as cliente:
+        resp = cliente.post(
+            "/admin/modelo/recargar", json={"url": servidor}, headers={"Authorization": "Bearer secreto"}
+        )
+        assert resp.status_code == 202, resp.text
+        limite = time.monotonic() + 30
+        while main.MODELOS.recarga["estado"] == "en_curso" and time.monotonic() < limite:
+            time.sleep(0.02)
+    assert main.MODELOS.recarga["estado"] == "error"
+    assert main.MODELOS.activa is original
+    # La descarga fallida quedó con su propio nombre; MODEL_PATH no se tocó
+    assert (directorio / "modelo.pkl").read_bytes() == b""
+    descargados = [p for p in directorio.iterdir() if p.name.startswith("modelo-")]
+    assert [p.read_bytes() for p in descargados] == [b"no es un pickle"]
@@ -0,0 +1,98 @@
+"""/api/v1/predict y /api/v1/predict/bulk."""
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from _comun import EVENTO_EJEMPLO
+
+ESCENARIO = dict(EVENTO_EJEMPLO, artista="Concierto", artista_nombre=EVENTO_EJEMPLO["artista"], fecha="2026-03-14")
+
+
+@pytest.fixture
+def cliente(main):
+    with TestClient(main.app) as cliente:
+        yield cliente
+
+
+def test_masivo_no_pasa_por_la_cache(main, cliente):
+    antes = main.CACHE.metricas()
+    escenarios = [dict(ESCENARIO, fecha=f"2027-01-{dia:02d}") for dia in range(1, 29)]
+    resp = cliente.post("/api/v1/predict/bulk", json=escenarios)
+    assert resp.status_code == 200, resp.text
+    despues = main.CACHE.metricas()
+    assert (despues["tamano"], despues["aciertos"], despues["fallos"]) == (
+        antes["tamano"], antes["aciertos"], antes["fallos"]
+    )
+
+    # Una consulta individual sí usa la caché y da lo mismo que el escenario masivo
+    individual = cliente.post("/api/v1/predict", json=escenarios[0]).json()
+    assert main.CACHE.metricas()["tamano"] == antes["tamano"] + 5
+    assert [p["prediccion"] for p in individual["predicciones"]] == resp.json()["predicciones"][0]
+
+
+def test_masivo_valida_categorias_por_columna(main, cliente, monkeypatch):
+    monkeypatch.setattr(main, "CATEGORIAS_DESCONOCIDAS", "rechazar")
+    escenarios = [ESCENARIO] * 3 + [dict(ESCENARIO, genero="Género inventado")]
+    resp = cliente.post("/api/v1/predict/bulk", json=escenarios)
+    assert resp.status_code == 422
+    assert "genero='Género inventado'" in resp.json()["detail"]
+    assert cliente.post("/api/v1/predict/bulk", json=escenarios[:3]).status_code == 200
+
+
+@pytest.mark.parametrize("fecha", ["0001-01-01", "0001-01-02", "9999-12-30", "9999-12-31"])
+def test_fechas_cuya_ventana_se_sale_del_rango(cliente, fecha):
+    assert cliente.post("/api/v1/predict", json=dict(ESCENARIO, fecha=fecha)).status_code == 422
+    assert cliente.post("/api/v1/predict/bulk", json=[dict(ESCENARIO, fecha=fecha)]).status_code == 422
+    assert cliente.post("/predecir", data=dict(ESCENARIO, fecha=fecha)).status_code == 422
+
+
+def test_fechas_en_el_borde_del_rango(cliente):
+    for fecha in ["0001-01-03", "9999-12-29"]:
+        resp = cliente.post("/api/v1/predict", json=dict(ESCENARIO, fecha=fecha))
+        assert resp.status_code == 200, resp.text
+        assert len(resp.json()["predicciones"]) == 5
+
+
+def test_predict_devuelve_la_ventana(main, cliente):
+    resp = cliente.post("/api/v1/predict", json=ESCENARIO)
+    assert resp.status_code == 200, resp.text
+    cuerpo = resp.json()
+    assert [p["fecha"] for p in cuerpo["predicciones"]] == [f"2026-03-{dia}" for dia in range(12, 17)]
+    assert cuerpo["predicciones"][2]["dia_semana"] == "Sábado"
+    preds = [p["prediccion"] for p in cuerpo["predicciones"]]
+    assert cuerpo["promedio"] == pytest.approx(sum(preds) / 5)
+    assert cuerpo["maximo"] == max(preds) and cuerpo["minimo"] == min(preds)
+    assert cuerpo["fecha_maximo"] == cuerpo["predicciones"][preds.index(max(preds))]["fecha"]
+    assert cuerpo["fecha_minimo"] == cuerpo["predicciones"][preds.index(min(preds))]["fecha"]
+    precio_promedio = (ESCENARIO["PrecioMinimo"] + ESCENARIO["PrecioMaximo"]) / 2
+    assert cuerpo["ingresos_estimados"] == int(cuerpo["promedio"] * precio_promedio)
+
+
+def test_masivo_coincide_con_predict_y_no_depende_del_tamano_de_lote(main, cliente, monkeypatch):
+    escenarios = [
+        dict(ESCENARIO, fecha=f"2026-{mes:02d}-15", PrecioMinimo=50000.0 * mes, Municipio=municipio)
+        for mes in range(1, 13)
+        for municipio in ("Medellín", "Envigado")
+    ]
+    completo = cliente.post("/api/v1/predict/bulk", json=escenarios).json()
+    # Lotes de 3 escenarios (15 filas): el resultado no cambia al partir en lotes
+    monkeypatch.setattr(main, "TAMANO_LOTE", 15)
+    partido = cliente.post("/api/v1/predict/bulk", json=escenarios).json()
+    assert partido == completo
+    assert completo["n"] == len(escenarios) and completo["desplazamientos"] == [-2, -1, 0, 1, 2]
+
+    for i in (0, 7, len(escenarios) - 1):
+        individual = cliente.post("/api/v1/predict", json=escenarios[i]).json()
+        np.testing.assert_allclose(
+            completo["predicciones"][i], [p["prediccion"] for p in individual["predicciones"]], rtol=1e-12
+        )
+        assert completo["promedio"][i] == pytest.approx(individual["promedio"])
+        assert completo["fecha_maximo"][i] == individual["fecha_maximo"]
+        assert completo["fecha_minimo"][i] == individual["fecha_minimo"]
+        assert completo["ingresos_estimados"][i] == individual["ingresos_estimados"]
+
+
+def test_masivo_vacio_y_demasiado_grande(main, cliente, monkeypatch):
+    assert cliente.post("/api/v1/predict/bulk", json=[]).json() == {"n": 0}
+    monkeypatch.setattr(main, "MAX_ESCENARIOS", 2)
+    assert cliente.post("/api/v1/predict/bulk", json=[ESCENARIO] * 3).status_code == 413
@@ -0,0 +1,69 @@
+"""Arranque de ``main`` con opciones que cambian lo que se construye al importar.
+
+Cada caso corre en un proceso nuevo porque la configuración se lee al importar.
+"""
+import os
+import subprocess
+import sys
+
+from conftest import RAIZ
+
+
+def ejecutar(codigo, ruta_modelo, **entorno):
+    entorno = dict(os.environ, EVENTIA_MODEL_PATH=str(ruta_modelo), **entorno)
+    resultado = subprocess.run(
+        [sys.executable, "-c", codigo], cwd=RAIZ, env=entorno, capture_output=True, text=True, timeout=180
+    )
+    assert resultado.returncode == 0, resultado.stderr[-3000:]
+    return resultado.stdout
+
+
+PREDECIR_CON_MICROLOTES = """
+from datetime import date
+import main
+from _comun import EVENTO_EJEMPLO
+
+main.cargar_modelo()
+temporales = main.CALENDARIO.rango(date.today(), 5)
+preds = main.PLANIFICADOR.predecir(main.construir_lote(EVENTO_EJEMPLO, temporales), main.MODELOS.activa)
+assert len(preds) == 5 and main.PLANIFICADOR.lotes == 1
+"""
+
+
+def test_importa_main_con_microlotes(ruta_modelo):
+    ejecutar(
+        "import sys; sys.path.insert(0, 'benchmarks')\n" + PREDECIR_CON_MICROLOTES,
+        ruta_modelo,
+        EVENTIA_MICROLOTES_FILAS="64",
+        EVENTIA_CALENTAMIENTO_REPETICIONES="0",
+    )
+
+
+PREDECIR_EN_HIJO_CON_FORK = """
+import os
+from datetime import date
+import main
+from _comun import EVENTO_EJEMPLO
+
+main.cargar_modelo()
+temporales = main.CALENDARIO.rango(date.today(), 5)
+# Como gunicorn --preload: el padre ya usó el planificador antes de crear los workers
+main.PLANIFICADOR.predecir(main.construir_lote(EVENTO_EJEMPLO, temporales), main.MODELOS.activa)
+pid = os.fork()
+if pid == 0:
+    import signal
+    signal.alarm(30)
+    preds = main.PLANIFICADOR.predecir(main.construir_lote(EVENTO_EJEMPLO, temporales), main.MODELOS.activa)
+    os._exit(0 if len(preds) == 5 else 1)
+_, estado = os.waitpid(pid, 0)
+assert os.waitstatus_to_exitcode(estado) == 0, estado
+"""
+
+
+def test_microlotes_en_worker_creado_con_fork(ruta_modelo):
+    ejecutar(
+        "import sys; sys.path.insert(0, 'benchmarks')\n" + PREDECIR_EN_HIJO_CON_FORK,
+        ruta_modelo,
+        EVENTIA_MICROLOTES_FILAS="64",
+        EVENTIA_CALENTAMIENTO_REPETICIONES="0",
+    )
@@ -0,0 +1,62 @@
+"""/api/v1/predict/range: barrido de fechas con las mejores fechas y la curva completa."""
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from _comun import EVENTO_EJEMPLO
+
+EVENTO = dict(EVENTO_EJEMPLO, artista="Concierto", artista_nombre=EVENTO_EJEMPLO["artista"])
+
+
+@pytest.fixture
+def cliente(main):
+    with TestClient(main.app) as cliente:
+        yield cliente
+
+
+def barrer(cliente, **campos):
+    return cliente.post("/api/v1/predict/range", json=dict(EVENTO, **campos))
+
+
+def test_curva_y_mejores_fechas(main, cliente, monkeypatch):
+    resp = barrer(cliente, fecha_inicio="2026-01-01", fecha_fin="2026-12-31", top_k=7)
+    assert resp.status_code == 200, resp.text
+    cuerpo = resp.json()
+    curva = cuerpo["curva"]
+    preds = np.array(curva["predicciones"])
+    assert cuerpo["n_dias"] == 365 and len(preds) == 365
+    assert curva["fechas"][0] == "2026-01-01" and curva["fechas"][-1] == "2026-12-31"
+    assert cuerpo["promedio"] == pytest.approx(preds.mean())
+
+    # Top-K ordenado de mayor a menor y con los mismos valores que la curva
+    mejores = cuerpo["mejores"]
+    assert len(mejores) == 7
+    assert [m["prediccion"] for m in mejores] == sorted(preds, reverse=True)[:7]
+    for m in mejores:
+        assert preds[curva["fechas"].index(m["fecha"])] == m["prediccion"]
+
+    # Cada día de la curva es el día central de /api/v1/predict
+    for fecha in ("2026-01-01", "2026-06-14", "2026-12-31"):
+        individual = cliente.post("/api/v1/predict", json=dict(EVENTO, fecha=fecha)).json()
+        assert preds[curva["fechas"].index(fecha)] == pytest.approx(individual["predicciones"][2]["prediccion"])
+
+    # Partir el rango en lotes no cambia la curva
+    monkeypatch.setattr(main, "TAMANO_LOTE", 50)
+    partido = barrer(cliente, fecha_inicio="2026-01-01", fecha_fin="2026-12-31", top_k=7).json()
+    assert partido == cuerpo
+
+
+def test_empates_en_orden_cronologico(main, cliente, monkeypatch):
+    monkeypatch.setattr(main, "barrer_fechas", lambda evento, inicio, n_dias: np.array([1.0, 3.0, 2.0, 3.0, 3.0]))
+    mejores = barrer(cliente, fecha_inicio="2026-05-01", fecha_fin="2026-05-05", top_k=4).json()["mejores"]
+    assert [m["fecha"] for m in mejores] == ["2026-05-02", "2026-05-04", "2026-05-05", "2026-05-03"]
+    # top_k mayor que el rango devuelve todos los días
+    assert len(barrer(cliente, fecha_inicio="2026-05-01", fecha_fin="2026-05-05", top_k=50).json()["mejores"]) == 5
+
+
+def test_rangos_invalidos(main, cliente, monkeypatch):
+    assert barrer(cliente, fecha_inicio="2026-05-02", fecha_fin="2026-05-01").status_code == 422
+    assert barrer(cliente, fecha_inicio="2026-05-01", fecha_fin="2026-05-02", top_k=0).status_code == 422
+    monkeypatch.setattr(main, "MAX_DIAS_BARRIDO", 30)
+    assert barrer(cliente, fecha_inicio="2026-05-01", fecha_fin="2026-05-31").status_code == 413
+    assert barrer(cliente, fecha_inicio="2026-05-01", fecha_fin="2026-05-30").status_code == 200
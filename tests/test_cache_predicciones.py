@@ -0,0 +1,32 @@
+"""Caché de predicciones con varias versiones del modelo en uso a la vez."""
+import numpy as np
+
+from cache_predicciones import CachePredicciones
+from registro_modelos import RegistroModelos, VersionModelo
+
+
+def test_versiones_conviven_sin_vaciar_la_cache():
+    cache = CachePredicciones(100, 60)
+    cache.guardar([("a",), ("b",)], [1.0, 2.0], "v1")
+    cache.guardar([("a",)], [10.0], "v2")
+
+    preds, faltantes = cache.obtener([("a",), ("b",)], "v1")
+    np.testing.assert_array_equal(preds, [1.0, 2.0])
+    assert not faltantes.any()
+    preds, faltantes = cache.obtener([("a",), ("b",)], "v2")
+    assert preds[0] == 10.0 and faltantes.tolist() == [False, True]
+    assert cache.metricas()["invalidaciones"] == 0
+
+
+def test_descartar_version_del_registro_libera_sus_entradas():
+    cache = CachePredicciones(100, 60)
+    registro = RegistroModelos(1, al_descartar=lambda version: cache.descartar_version(version.version))
+    versiones = [VersionModelo(f"v{i}", None, None, None, None, {}, 0.0) for i in range(3)]
+    for version in versiones:
+        cache.guardar([("a",)], [1.0], version.version)
+        registro.publicar(version)
+
+    assert cache.obtener([("a",)], "v0")[1].all()
+    assert not cache.obtener([("a",)], "v1")[1].any()
+    assert not cache.obtener([("a",)], "v2")[1].any()
+    assert cache.metricas()["invalidaciones"] == 1
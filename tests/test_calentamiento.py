@@ -0,0 +1,17 @@
+"""El calentamiento no toca la caché compartida ni las métricas."""
+
+
+def test_calentar_no_toca_cache_ni_metricas(main, monkeypatch):
+    monkeypatch.setattr(main, "CALENTAMIENTO_FILAS", (1, 5))
+    monkeypatch.setattr(main, "CALENTAMIENTO_REPETICIONES", 2)
+    activa = main.MODELOS.activa
+    main.CACHE.guardar([("fila viva",)], [1.0], activa.version)
+    cache_antes = main.CACHE.metricas()
+    metricas_antes = (main.ETAPAS.exponer(), main.FILAS_POR_LOTE.exponer())
+
+    pasos = main.calentar(activa)
+
+    assert set(pasos) == {"predict_1", "predict_5", "predecir"}
+    assert main.CACHE.metricas() == cache_antes
+    assert not main.CACHE.obtener([("fila viva",)], activa.version)[1].any()
+    assert (main.ETAPAS.exponer(), main.FILAS_POR_LOTE.exponer()) == metricas_antes
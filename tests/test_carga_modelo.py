@@ -0,0 +1,53 @@
+"""Reintentos de la carga inicial del modelo."""
+import signal
+import threading
+
+import pytest
+
+from registro_modelos import RegistroModelos, VersionModelo
+
+
+@pytest.fixture
+def carga(main, monkeypatch):
+    """Registro vacío y una ``cargar_modelo`` que falla las primeras ``fallos`` veces."""
+    registro = RegistroModelos()
+    monkeypatch.setattr(main, "MODELOS", registro)
+    estado = {"llamadas": 0, "fallos": 0, "senales": []}
+
+    def cargar_modelo():
+        estado["llamadas"] += 1
+        if estado["llamadas"] > estado["fallos"]:
+            registro.publicar(VersionModelo("v", None, None, None, None, {}, 0.0))
+
+    monkeypatch.setattr(main, "cargar_modelo", cargar_modelo)
+    monkeypatch.setattr(main.os, "kill", lambda pid, senal: estado["senales"].append(senal))
+    return registro, estado
+
+
+def test_reintenta_hasta_cargar(main, carga, monkeypatch):
+    registro, estado = carga
+    estado["fallos"] = 3
+    monkeypatch.setattr(main, "CARGA_INTENTOS", 5)
+    main.cargar_modelo_con_reintentos(threading.Event(), espera_inicial=0.001)
+    assert estado["llamadas"] == 4 and registro.activa is not None and not estado["senales"]
+
+
+def test_termina_el_proceso_al_agotar_los_intentos(main, carga, monkeypatch):
+    registro, estado = carga
+    estado["fallos"] = 100
+    monkeypatch.setattr(main, "CARGA_INTENTOS", 3)
+    main.cargar_modelo_con_reintentos(threading.Event(), espera_inicial=0.001)
+    assert estado["llamadas"] == 3 and registro.activa is None
+    assert estado["senales"] == [signal.SIGTERM]
+
+
+def test_apagar_corta_la_espera(main, carga, monkeypatch):
+    _, estado = carga
+    estado["fallos"] = 100
+    monkeypatch.setattr(main, "CARGA_INTENTOS", 0)
+    detener = threading.Event()
+    hilo = threading.Thread(target=main.cargar_modelo_con_reintentos, args=(detener, 30.0))
+    hilo.start()
+    detener.set()
+    hilo.join(timeout=5)
+    assert not hilo.is_alive() and estado["llamadas"] == 1
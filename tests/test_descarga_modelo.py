@@ -0,0 +1,55 @@
+"""Permisos y nombres de los artefactos descargados."""
+import os
+import stat
+
+import pytest
+
+from descarga_modelo import asegurar_modelo, descargar_version, sha256_archivo
+
+
+@pytest.fixture
+def origen(tmp_path):
+    ruta = tmp_path / "origen.pkl"
+    ruta.write_bytes(b"modelo" * 1000)
+    return ruta
+
+
+def modo(ruta):
+    return stat.S_IMODE(os.stat(ruta).st_mode)
+
+
+def test_archivo_nuevo_respeta_la_umask(tmp_path, origen):
+    anterior = os.umask(0o027)
+    try:
+        destino = tmp_path / "nuevo.pkl"
+        assert asegurar_modelo(str(origen), str(destino))
+    finally:
+        os.umask(anterior)
+    assert modo(destino) == 0o640
+    assert destino.read_bytes() == origen.read_bytes()
+
+
+def test_reemplazo_conserva_los_permisos_del_destino(tmp_path, origen):
+    destino = tmp_path / "existente.pkl"
+    destino.write_bytes(b"viejo")
+    os.chmod(destino, 0o664)
+    # El contenido viejo no coincide con el SHA-256 pedido: se descarga de nuevo
+    assert asegurar_modelo(str(origen), str(destino), sha256_archivo(origen))
+    assert modo(destino) == 0o664
+    assert destino.read_bytes() == origen.read_bytes()
+
+
+def test_descargar_version_no_pisa_archivos(tmp_path, origen):
+    directorio = tmp_path / "modelos"
+    directorio.mkdir()
+    ruta = descargar_version(str(origen), str(directorio))
+    assert os.path.basename(ruta) == f"modelo-{sha256_archivo(origen)[:16]}.pkl"
+    inodo = os.stat(ruta).st_ino
+
+    # El mismo contenido reutiliza el archivo sin reemplazarlo; otro contenido va a otro nombre
+    assert descargar_version(str(origen), str(directorio)) == ruta
+    assert os.stat(ruta).st_ino == inodo
+    origen.write_bytes(b"otro modelo")
+    otra = descargar_version(str(origen), str(directorio))
+    assert otra != ruta and open(otra, "rb").read() == b"otro modelo"
+    assert sorted(os.listdir(directorio)) == sorted([os.path.basename(ruta), os.path.basename(otra)])
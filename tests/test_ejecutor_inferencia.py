@@ -0,0 +1,93 @@
+"""Métricas de espera del ejecutor de inferencia."""
+import asyncio
+import time
+
+import pytest
+
+from ejecutor_inferencia import ColaLlena, EjecutorInferencia
+
+
+def test_espera_media_solo_de_trabajos_terminados():
+    ejecutor = EjecutorInferencia(1, 10)
+
+    async def escenario():
+        lento = asyncio.ensure_future(ejecutor.ejecutar(time.sleep, 0.2))
+        await asyncio.sleep(0.01)
+        en_cola = [asyncio.ensure_future(ejecutor.ejecutar(time.sleep, 0)) for _ in range(3)]
+        await asyncio.sleep(0.05)
+        # Cuatro aceptadas y ninguna terminada: las que esperan no diluyen la media
+        intermedias = ejecutor.metricas()
+        await asyncio.gather(lento, *en_cola)
+        return intermedias
+
+    intermedias = asyncio.run(escenario())
+    assert intermedias["aceptadas"] == 4 and intermedias["terminadas"] == 0
+    final = ejecutor.metricas()
+    assert final["terminadas"] == 4
+    # Las tres en cola esperaron ~0.15 s cada una detrás del trabajo lento
+    assert final["espera_media_ms"] == pytest.approx(ejecutor.espera_total / 4 * 1000)
+    assert final["espera_media_ms"] > 0.1 * 1000 * 3 / 4
+
+
+def test_trabajo_que_falla_cuenta_su_espera():
+    ejecutor = EjecutorInferencia(1, 0)
+
+    def falla():
+        raise ValueError("x")
+
+    with pytest.raises(ValueError):
+        asyncio.run(ejecutor.ejecutar(falla))
+    assert ejecutor.metricas()["terminadas"] == 1
+
+
+def test_cola_llena():
+    ejecutor = EjecutorInferencia(1, 0)
+
+    async def escenario():
+        lento = asyncio.ensure_future(ejecutor.ejecutar(time.sleep, 0.05))
+        await asyncio.sleep(0)
+        with pytest.raises(ColaLlena):
+            await ejecutor.ejecutar(time.sleep, 0)
+        await lento
+
+    asyncio.run(escenario())
+    assert ejecutor.metricas()["rechazadas"] == 1
+
+
+def test_cancelar_la_espera_no_libera_el_hilo():
+    ejecutor = EjecutorInferencia(1, 1)
+
+    async def escenario():
+        lento = asyncio.ensure_future(ejecutor.ejecutar(time.sleep, 0.3))
+        await asyncio.sleep(0.05)
+        # El cliente se desconecta: la petición deja de esperar pero el hilo sigue ocupado
+        lento.cancel()
+        await asyncio.sleep(0)
+        assert ejecutor.en_vuelo == 1
+        en_cola = asyncio.ensure_future(ejecutor.ejecutar(time.sleep, 0))
+        await asyncio.sleep(0)
+        with pytest.raises(ColaLlena):
+            await ejecutor.ejecutar(time.sleep, 0)
+        await en_cola
+        await asyncio.sleep(0.01)
+
+    asyncio.run(escenario())
+    assert ejecutor.en_vuelo == 0
+    assert ejecutor.metricas()["terminadas"] == 2
+
+
+def test_cancelar_un_trabajo_en_cola_lo_saca_de_la_admision():
+    ejecutor = EjecutorInferencia(1, 1)
+
+    async def escenario():
+        lento = asyncio.ensure_future(ejecutor.ejecutar(time.sleep, 0.1))
+        en_cola = asyncio.ensure_future(ejecutor.ejecutar(time.sleep, 0))
+        await asyncio.sleep(0.02)
+        en_cola.cancel()
+        await asyncio.sleep(0.01)
+        assert ejecutor.en_vuelo == 1
+        await lento
+
+    asyncio.run(escenario())
+    assert ejecutor.en_vuelo == 0
+    assert ejecutor.metricas()["terminadas"] == 1
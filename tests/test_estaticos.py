@@ -0,0 +1,58 @@
+"""Negociación de Content-Encoding de los recursos precalculados."""
+import gzip
+
+import pytest
+from starlette.requests import Request
+
+import estaticos
+from estaticos import RecursoEstatico, calidades_codificacion
+
+CONTENIDO = "body { color: #7e57c2; }\n" * 200
+
+
+def peticion(accept_encoding=None):
+    cabeceras = [] if accept_encoding is None else [(b"accept-encoding", accept_encoding.encode())]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": cabeceras})
+
+
+def codificacion(recurso, accept_encoding):
+    return recurso.responder(peticion(accept_encoding)).headers.get("content-encoding", "identity")
+
+
+@pytest.fixture(params=["con brotli", "sin brotli"])
+def recurso(request, monkeypatch):
+    if request.param == "sin brotli":
+        monkeypatch.setattr(estaticos, "brotli", None)
+    elif estaticos.brotli is None:
+        pytest.skip("brotli no está instalado")
+    return RecursoEstatico(CONTENIDO, "text/css")
+
+
+def test_calidades():
+    assert calidades_codificacion("gzip, br;q=0.5, *;q=0, deflate;q=x") == {
+        "gzip": 1.0, "br": 0.5, "*": 0.0, "deflate": 0.0
+    }
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, con_brotli, sin_brotli",
+    [
+        (None, "identity", "identity"),
+        ("gzip, deflate, br", "br", "gzip"),
+        ("br;q=0, gzip", "gzip", "gzip"),
+        ("br; q=0.0, gzip;q=0", "identity", "identity"),
+        ("gzip;q=1.0, br;q=0.5", "gzip", "gzip"),
+        ("*", "br", "gzip"),
+        ("*;q=0.5, gzip;q=0", "br", "identity"),
+        ("identity", "identity", "identity"),
+    ],
+)
+def test_negociacion(recurso, accept_encoding, con_brotli, sin_brotli):
+    esperado = sin_brotli if estaticos.brotli is None else con_brotli
+    assert codificacion(recurso, accept_encoding) == esperado
+
+
+def test_variantes_decodifican_al_original(recurso):
+    assert gzip.decompress(recurso.variantes["gzip"]) == CONTENIDO.encode()
+    if estaticos.brotli is not None:
+        assert estaticos.brotli.decompress(recurso.variantes["br"]) == CONTENIDO.encode()
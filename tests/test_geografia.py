@@ -0,0 +1,92 @@
+"""Índice de geografía, búsqueda por prefijo y rutas de autocompletado."""
+import pytest
+from fastapi.testclient import TestClient
+
+from geografia import BuscadorPrefijos, IndiceGeografia, normalizar
+
+TABLA = {
+    "Antioquia": ["Medellín", "Bello", "San Rafael"],
+    "Bolívar": ["Cartagena", "San Pablo"],
+    "Nariño": ["San Pablo", "Pasto"],
+}
+CAPITALES = ["Medellín", "Cartagena", "Pasto"]
+
+
+def test_normalizar():
+    assert normalizar(" Bogotá  D.C.") == "bogota d.c."
+    assert normalizar("MEDELLÍN") == normalizar("medellin")
+
+
+def test_buscador_prefijos_orden_y_limites():
+    buscador = BuscadorPrefijos(["Santa Marta", "Santander", "Marinilla", "Málaga"], max_resultados=3)
+    # Primero los que empiezan por el prefijo, después los que tienen otra palabra que empieza por él
+    assert buscador.buscar("mar") == ["Marinilla", "Santa Marta"]
+    assert buscador.buscar("MALA") == ["Málaga"]
+    assert buscador.buscar("san") == ["Santa Marta", "Santander"]
+    assert buscador.buscar("xyz") == []
+    assert buscador.buscar("", limite=2) == ["Málaga", "Marinilla"]
+    # Cada nodo guarda como mucho max_resultados candidatos
+    assert len(buscador.buscar("a", limite=10)) <= 3
+
+
+def test_indice_ubica_y_deriva_capital():
+    geo = IndiceGeografia(TABLA, CAPITALES)
+    assert geo.ubicar("Antioquia", "Medellín") == ("Antioquia", "Medellín", "1")
+    assert geo.ubicar("antioquia", "medellin") == ("Antioquia", "Medellín", "1")
+    assert geo.ubicar("Antioquia", "Bello") == ("Antioquia", "Bello", "0")
+    assert geo.ubicar("Antioquia", "Pasto") is None
+    assert geo.departamentos_de["San Pablo"] == ("Bolívar", "Nariño")
+    assert geo.departamento("BOLIVAR") == "Bolívar"
+    assert geo.departamento("Cundinamarca") is None
+
+
+def test_ubicar_columnas_coincide_con_ubicar():
+    geo = IndiceGeografia(TABLA, CAPITALES)
+    departamentos = ["antioquia", "Bolívar", "Antioquia", None, "Nariño"]
+    municipios = ["medellin", "Cartagena", "Pasto", "Bello", "San Pablo"]
+    d, m, capital, ubicadas = geo.ubicar_columnas(departamentos, municipios)
+    assert list(ubicadas) == [True, True, False, False, True]
+    # Las filas sin ubicar conservan lo recibido (un nulo sigue siendo nulo)
+    assert list(d[[0, 1, 2, 4]]) == ["Antioquia", "Bolívar", "Antioquia", "Nariño"]
+    assert not isinstance(d[3], str)
+    assert list(m) == ["Medellín", "Cartagena", "Pasto", "Bello", "San Pablo"]
+    assert list(capital) == ["1", "1", "0", "0", "0"]
+
+
+def test_buscar_municipios_por_departamento():
+    geo = IndiceGeografia(TABLA, CAPITALES)
+    assert geo.buscar_municipios("san pa") == [("Bolívar", "San Pablo", "0"), ("Nariño", "San Pablo", "0")]
+    assert geo.buscar_municipios("san", departamento="Antioquia") == [("Antioquia", "San Rafael", "0")]
+    assert geo.buscar_municipios("san", limite=1) == [("Bolívar", "San Pablo", "0")]
+
+
+@pytest.fixture
+def cliente(main):
+    with TestClient(main.app) as cliente:
+        yield cliente
+
+
+def test_autocompletar_municipios(main, cliente):
+    resp = cliente.get("/api/v1/autocomplete/municipios", params={"q": "medell"})
+    assert resp.status_code == 200
+    assert resp.json()[0] == {"Departamento": "Antioquia", "Municipio": "Medellín", "EsCapital": "1"}
+
+    resp = cliente.get("/api/v1/autocomplete/municipios", params={"q": "", "departamento": "magdalena", "limite": 3})
+    lugares = resp.json()
+    assert len(lugares) == 3 and {lugar["Departamento"] for lugar in lugares} == {"Magdalena"}
+
+    assert cliente.get("/api/v1/autocomplete/municipios", params={"departamento": "Atlántida"}).status_code == 422
+    for limite in (0, main.MAX_AUTOCOMPLETADO + 1):
+        assert cliente.get("/api/v1/autocomplete/municipios", params={"limite": limite}).status_code == 422
+
+
+def test_autocompletar_vocabulario_del_modelo(main, cliente):
+    for campo, columna in main.CAMPOS_AUTOCOMPLETADO.items():
+        buscador = main.MODELOS.activa.autocompletado[columna]
+        primero = buscador.textos[0]
+        resp = cliente.get(f"/api/v1/autocomplete/{campo}", params={"q": primero[:3].upper(), "limite": 5})
+        assert resp.status_code == 200
+        assert resp.json() == buscador.buscar(primero[:3], 5)
+        assert primero in resp.json()
+    assert cliente.get("/api/v1/autocomplete/ciudades").status_code == 404
+    assert cliente.get("/api/v1/autocomplete/artistas", params={"limite": 0}).status_code == 422
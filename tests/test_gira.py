@@ -0,0 +1,68 @@
+"""/api/v1/plan/tour: matriz ciudad x fecha para todos los municipios (o los de unos departamentos)."""
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from _comun import EVENTO_EJEMPLO
+
+PLAN = {
+    clave: valor
+    for clave, valor in dict(EVENTO_EJEMPLO, artista="Concierto", artista_nombre=EVENTO_EJEMPLO["artista"]).items()
+    if clave not in ("Departamento", "Municipio", "EsCapital")
+}
+
+
+@pytest.fixture
+def cliente(main):
+    with TestClient(main.app) as cliente:
+        yield cliente
+
+
+def planear(cliente, **campos):
+    return cliente.post("/api/v1/plan/tour", json=dict(PLAN, fecha_inicio="2026-07-01", fecha_fin="2026-07-07", **campos))
+
+
+def test_matriz_de_todos_los_municipios(main, cliente, monkeypatch):
+    resp = planear(cliente, top_k=10)
+    assert resp.status_code == 200, resp.text
+    cuerpo = resp.json()
+    matriz = cuerpo["matriz"]
+    preds = np.array(matriz["predicciones"])
+    assert matriz["municipios"] == main.GEOGRAFIA["municipio"].tolist()
+    assert preds.shape == (len(main.GEOGRAFIA["municipio"]), 7)
+    assert matriz["fechas"] == [f"2026-07-0{dia}" for dia in range(1, 8)]
+
+    # Ciudades ordenadas por su mejor día, con EsCapital de la tabla de geografía
+    ciudades = cuerpo["ciudades"]
+    assert [c["mejor_prediccion"] for c in ciudades] == sorted(preds.max(axis=1), reverse=True)
+    capitales = {c["Municipio"]: c["EsCapital"] for c in ciudades}
+    assert capitales == dict(zip(main.GEOGRAFIA["municipio"].tolist(), main.GEOGRAFIA["es_capital"].tolist()))
+    assert [m["prediccion"] for m in cuerpo["mejores"]] == sorted(preds.ravel(), reverse=True)[:10]
+
+    # Cada celda es el día central de /api/v1/predict en esa ciudad
+    i = matriz["municipios"].index("Medellín")
+    individual = cliente.post(
+        "/api/v1/predict", json=dict(PLAN, Departamento="Antioquia", Municipio="Medellín", fecha="2026-07-04")
+    ).json()
+    assert preds[i, 3] == pytest.approx(individual["predicciones"][2]["prediccion"])
+
+    # Los tramos de TAMANO_LOTE filas no cambian el resultado
+    monkeypatch.setattr(main, "TAMANO_LOTE", 97)
+    assert planear(cliente, top_k=10).json() == cuerpo
+
+
+def test_filtrar_por_departamento(main, cliente):
+    cuerpo = planear(cliente, departamentos=["antioquia"]).json()
+    esperados = main.GEOGRAFIA["municipio"][main.GEOGRAFIA["departamento"] == "Antioquia"].tolist()
+    assert cuerpo["matriz"]["municipios"] == esperados
+    assert {c["Departamento"] for c in cuerpo["ciudades"]} == {"Antioquia"}
+
+
+def test_validaciones(main, cliente, monkeypatch):
+    assert planear(cliente, departamentos=["Atlántida"]).status_code == 422
+    assert planear(cliente, top_k=0).status_code == 422
+    assert cliente.post(
+        "/api/v1/plan/tour", json=dict(PLAN, fecha_inicio="2026-07-07", fecha_fin="2026-07-01")
+    ).status_code == 422
+    monkeypatch.setattr(main, "MAX_DIAS_BARRIDO", 6)
+    assert planear(cliente).status_code == 413
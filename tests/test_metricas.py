@@ -0,0 +1,72 @@
+"""Métricas en formato de Prometheus: tipos de ``metricas`` y /metrics."""
+import re
+
+from fastapi.testclient import TestClient
+
+from _comun import EVENTO_EJEMPLO
+from metricas import Contador, Histograma, Medidor, RegistroMetricas
+
+
+def muestras(texto):
+    """``{"nombre{etiquetas}": valor}`` de las líneas que no son comentarios."""
+    return {
+        linea.rsplit(" ", 1)[0]: float(linea.rsplit(" ", 1)[1])
+        for linea in texto.splitlines()
+        if linea and not linea.startswith("#")
+    }
+
+
+def test_formato_de_texto():
+    registro = RegistroMetricas()
+    contador = registro.registrar(Contador("x_total", "Ayuda", ("ruta",)))
+    histograma = registro.registrar(Histograma("x_segundos", "Ayuda", limites=(0.1, 1.0)))
+    medidor = registro.registrar(Medidor("x_rss", "Ayuda", funcion=lambda: 42))
+    contador.inc('/a"b\\')
+    contador.inc('/a"b\\', cantidad=2)
+    for valor in (0.05, 0.5, 0.7, 3.0):
+        histograma.observar(valor)
+    texto = registro.exponer()
+
+    assert "# TYPE x_total counter" in texto and "# TYPE x_segundos histogram" in texto
+    assert "# TYPE x_rss gauge" in texto
+    valores = muestras(texto)
+    assert valores['x_total{ruta="/a\\"b\\\\"}'] == 3
+    # Cubetas acumuladas, con +Inf igual a la cuenta
+    assert [valores[f'x_segundos_bucket{{le="{le}"}}'] for le in ("0.1", "1.0", "+Inf")] == [1, 3, 4]
+    assert valores["x_segundos_count"] == 4 and valores["x_segundos_sum"] == 4.25
+    assert valores["x_rss"] == 42
+    medidor.funcion = lambda: None
+    assert muestras(registro.exponer())["x_rss"] == 42
+
+
+def test_metrics_tras_una_prediccion(main):
+    formulario = dict(EVENTO_EJEMPLO, artista="Concierto", artista_nombre=EVENTO_EJEMPLO["artista"], fecha="2029-04-02")
+    with TestClient(main.app) as cliente:
+        antes = muestras(cliente.get("/metrics").text)
+        assert cliente.post("/predecir", data=formulario).status_code == 200
+        cliente.get("/static/no-existe.css")
+        resp = cliente.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain; version=0.0.4")
+    despues = muestras(resp.text)
+
+    def delta(clave):
+        return despues.get(clave, 0) - antes.get(clave, 0)
+
+    assert delta('eventia_peticiones_total{metodo="POST",ruta="/predecir",estado="200"}') == 1
+    # Las rutas con parámetros se cuentan por plantilla, no por URL
+    assert delta('eventia_peticiones_total{metodo="GET",ruta="/static/{archivo}",estado="404"}') == 1
+    assert delta('eventia_peticion_segundos_count{metodo="POST",ruta="/predecir"}') == 1
+    for nombre in ("features", "predict", "render"):
+        assert delta(f'eventia_etapa_segundos_count{{etapa="{nombre}"}}') >= 1, nombre
+    assert delta('eventia_modelo_lote_filas_bucket{le="5"}') >= 1
+    assert despues["eventia_proceso_rss_bytes"] > 0
+    version = main.MODELOS.activa.version
+    assert any(re.match(rf'eventia_modelo_info\{{version="{version}",backend="\w+"\}}', clave) for clave in despues)
+    assert despues["eventia_modelo_carga_segundos"] > 0
+
+
+def test_metrics_deshabilitadas(main, monkeypatch):
+    monkeypatch.setattr(main, "METRICAS", False)
+    with TestClient(main.app) as cliente:
+        assert cliente.get("/metrics").status_code == 404
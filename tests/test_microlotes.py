@@ -0,0 +1,70 @@
+"""Planificador de microlotes: las peticiones en espera no ocupan hilos del ejecutor."""
+import asyncio
+import threading
+import time
+
+import httpx
+import numpy as np
+
+from _comun import EVENTO_EJEMPLO
+from microlotes import PlanificadorMicrolotes
+
+
+def test_lotes_de_contextos_distintos_corren_en_paralelo():
+    en_curso, maximo, lock = [0], [0], threading.Lock()
+
+    def lenta(datos, contexto):
+        with lock:
+            en_curso[0] += 1
+            maximo[0] = max(maximo[0], en_curso[0])
+        time.sleep(0.2)
+        with lock:
+            en_curso[0] -= 1
+        return np.full(len(datos), contexto)
+
+    planificador = PlanificadorMicrolotes(lenta, max_filas=64, max_espera=0.01, hilos=2)
+    futuros = [planificador.encolar(np.zeros(3), contexto) for contexto in (1, 2)]
+    assert [f.result(timeout=5).tolist() for f in futuros] == [[1, 1, 1], [2, 2, 2]]
+    assert maximo[0] == 2 and planificador.lotes == 2
+
+
+def test_peticiones_concurrentes_comparten_lote_con_un_solo_hilo(main, monkeypatch):
+    monkeypatch.setattr(main, "EJECUTOR", main.EjecutorInferencia(1, 64))
+    planificador = main.PlanificadorMicrolotes(
+        lambda datos, version=None: main.predecir_modelo(datos, version), 256, 0.05
+    )
+    monkeypatch.setattr(main, "PLANIFICADOR", planificador)
+    escenarios = [
+        dict(EVENTO_EJEMPLO, artista_nombre=EVENTO_EJEMPLO["artista"], fecha=f"2028-02-{dia:02d}")
+        for dia in range(1, 17)
+    ]
+
+    async def lanzar():
+        transporte = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transporte, base_url="http://prueba") as cliente:
+            return await asyncio.gather(*(cliente.post("/api/v1/predict", json=e) for e in escenarios))
+
+    respuestas = asyncio.run(lanzar())
+    assert [r.status_code for r in respuestas] == [200] * len(escenarios)
+    # Con un hilo en el ejecutor, un lote de varias peticiones solo es posible si las que
+    # esperan su microlote no ocupan ese hilo
+    assert planificador.metricas()["peticiones_por_lote"] > 1
+    assert main.EJECUTOR.en_vuelo == 0
+
+
+def test_predecir_con_microlotes_da_la_misma_pagina(main, monkeypatch):
+    from fastapi.testclient import TestClient
+
+    formulario = dict(EVENTO_EJEMPLO, artista="Concierto", artista_nombre=EVENTO_EJEMPLO["artista"], fecha="2028-03-05")
+    # Caché propia y vacía: la segunda petición también tiene que llegar al modelo
+    monkeypatch.setattr(main, "CACHE", main.CachePredicciones(100, 60))
+    with TestClient(main.app) as cliente:
+        sin_microlotes = cliente.post("/predecir", data=formulario).text
+        main.CACHE.descartar_version(main.MODELOS.activa.version)
+        planificador = main.PlanificadorMicrolotes(
+            lambda datos, version=None: main.predecir_modelo(datos, version), 64, 0.001
+        )
+        monkeypatch.setattr(main, "PLANIFICADOR", planificador)
+        con_microlotes = cliente.post("/predecir", data=formulario).text
+    assert planificador.lotes == 1
+    assert con_microlotes == sin_microlotes
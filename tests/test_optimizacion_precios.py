@@ -0,0 +1,114 @@
+"""Optimización de precios: ``optimizar_precios`` y /api/v1/optimize/prices."""
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from _comun import EVENTO_EJEMPLO
+from optimizacion_precios import optimizar_precios
+
+
+def asistencia_suave(pmin, pmax, funciones):
+    """Asistencia que cae con el precio: los ingresos tienen un único máximo interior."""
+    return 1000.0 * funciones * np.exp(-(pmin + pmax) / 400.0)
+
+
+def evaluador(registro):
+    def evaluar(pmin, pmax, funciones):
+        registro.extend(zip(pmin.tolist(), pmax.tolist(), funciones.tolist()))
+        return asistencia_suave(pmin, pmax, funciones)
+
+    return evaluar
+
+
+PRECIOS = np.linspace(0, 1000, 41)
+
+
+def test_exhaustivo_encuentra_el_maximo_y_descarta_celdas_invalidas():
+    evaluadas = []
+    resultado = optimizar_precios(evaluador(evaluadas), PRECIOS, PRECIOS, [1, 2], refinar=False)
+    assert all(pmin <= pmax for pmin, pmax, _ in evaluadas)
+    assert resultado["evaluadas"] == resultado["validas"] == len(evaluadas) == 2 * 41 * 42 // 2
+
+    f, i, j = resultado["mejor"]
+    pmin, pmax = np.meshgrid(PRECIOS, PRECIOS, indexing="ij")
+    ingresos = asistencia_suave(pmin, pmax, 2) * (pmin + pmax) / 2
+    ingresos[pmin > pmax] = -np.inf
+    assert (f, i, j) == (1, *np.unravel_index(np.argmax(ingresos), ingresos.shape))
+    assert np.isnan(resultado["ingresos"][0, 5, 0])
+
+
+def test_refinado_llega_al_mismo_optimo_con_menos_celdas():
+    exhaustivo = optimizar_precios(evaluador([]), PRECIOS, PRECIOS, [1, 2], refinar=False)
+    evaluadas = []
+    refinado = optimizar_precios(evaluador(evaluadas), PRECIOS, PRECIOS, [1, 2], refinar=True)
+    assert refinado["mejor"] == exhaustivo["mejor"]
+    assert refinado["evaluadas"] == len(evaluadas) < exhaustivo["evaluadas"] / 3
+    # Ninguna celda se evalúa dos veces
+    assert len(set(evaluadas)) == len(evaluadas)
+
+
+def test_sin_celdas_validas():
+    resultado = optimizar_precios(evaluador([]), [500.0, 600.0], [100.0, 200.0], [1])
+    assert resultado["mejor"] is None and resultado["evaluadas"] == 0
+
+
+OPTIMIZACION = dict(
+    EVENTO_EJEMPLO,
+    artista="Concierto",
+    artista_nombre=EVENTO_EJEMPLO["artista"],
+    fecha="2026-03-14",
+    precio_minimo_desde=50000,
+    precio_minimo_hasta=200000,
+    precio_maximo_desde=150000,
+    precio_maximo_hasta=600000,
+    pasos=21,
+    numero_funciones=[1, 2],
+)
+
+
+@pytest.fixture
+def cliente(main):
+    with TestClient(main.app) as cliente:
+        yield cliente
+
+
+def optimizar(cliente, **campos):
+    return cliente.post("/api/v1/optimize/prices", json=dict(OPTIMIZACION, **campos))
+
+
+def test_endpoint_refinado_y_exhaustivo(cliente):
+    exhaustivo = optimizar(cliente, refinar=False)
+    refinado = optimizar(cliente, refinar=True)
+    assert exhaustivo.status_code == refinado.status_code == 200, (exhaustivo.text, refinado.text)
+    exhaustivo, refinado = exhaustivo.json(), refinado.json()
+    assert (exhaustivo["modo"], refinado["modo"]) == ("exhaustivo", "refinado")
+    assert refinado["celdas_evaluadas"] < exhaustivo["celdas_evaluadas"] == exhaustivo["celdas_validas"]
+    assert refinado["mejor"]["ingresos_estimados"] <= exhaustivo["mejor"]["ingresos_estimados"]
+
+    mejor = exhaustivo["mejor"]
+    assert mejor["PrecioMinimo"] <= mejor["PrecioMaximo"] and mejor["NumeroFunciones"] in (1, 2)
+    precio_promedio = (mejor["PrecioMinimo"] + mejor["PrecioMaximo"]) / 2
+    assert mejor["ingresos_estimados"] == int(mejor["asistentes_promedio"] * precio_promedio)
+    assert exhaustivo["mejora"] == mejor["ingresos_estimados"] - exhaustivo["actual"]["ingresos_estimados"]
+
+    # La configuración actual es la misma ventana de ±2 días que /api/v1/predict
+    ventana = cliente.post("/api/v1/predict", json=dict(OPTIMIZACION)).json()
+    assert exhaustivo["actual"]["asistentes_promedio"] == pytest.approx(ventana["promedio"])
+
+    superficie = exhaustivo["superficie"]
+    assert superficie["numero_funciones"] == [1, 2]
+    assert np.shape(superficie["ingresos"]) == (2, len(superficie["precios_minimos"]), len(superficie["precios_maximos"]))
+
+
+@pytest.mark.parametrize(
+    "campos, estado",
+    [
+        ({"precio_minimo_desde": 300000, "precio_minimo_hasta": 100000}, 422),
+        ({"pasos": 1}, 422),
+        ({"numero_funciones": [0, 1]}, 422),
+        ({"precio_minimo_desde": 700000, "precio_minimo_hasta": 800000}, 422),
+        ({"pasos": 400}, 413),
+    ],
+)
+def test_endpoint_rechaza_grillas_invalidas(cliente, campos, estado):
+    assert optimizar(cliente, **campos).status_code == estado
@@ -0,0 +1,94 @@
+"""Perfilado bajo demanda: ``Perfilador`` y el flujo de /admin/perfilado."""
+import marshal
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from _comun import EVENTO_EJEMPLO
+from perfilado import Perfilador, SesionActiva
+
+FORMULARIO = dict(EVENTO_EJEMPLO, artista="Concierto", artista_nombre=EVENTO_EJEMPLO["artista"], fecha="2026-03-14")
+CABECERAS = {"Authorization": "Bearer secreto"}
+
+
+def trabajo_lento():
+    limite = time.monotonic() + 0.2
+    while time.monotonic() < limite:
+        sum(range(1000))
+    return "listo"
+
+
+def test_muestreo_da_pilas_colapsadas():
+    perfilador = Perfilador()
+    perfilador.iniciar("muestreo", peticiones=1, intervalo=0.002)
+    assert perfilador.activo
+    assert perfilador.envolver(trabajo_lento)() == "listo"
+    assert not perfilador.activo
+
+    contenido, media_type = perfilador.resultado("colapsado")
+    assert media_type.startswith("text/plain")
+    lineas = contenido.strip().splitlines()
+    assert lineas and all(linea.rsplit(" ", 1)[1].isdigit() for linea in lineas)
+    # Las pilas empiezan en la función perfilada, sin los marcos del envoltorio
+    assert all(linea.startswith("test_perfilado:trabajo_lento") for linea in lineas)
+    with pytest.raises(ValueError):
+        perfilador.resultado("pstats")
+
+
+def test_sesion_por_tiempo_y_sesion_activa():
+    perfilador = Perfilador()
+    perfilador.iniciar("determinista", segundos=0.2)
+    with pytest.raises(SesionActiva):
+        perfilador.iniciar("muestreo")
+    assert perfilador.resultado("texto") is None
+    time.sleep(0.5)
+    assert perfilador.estado()["estado"] == "terminada"
+    # Terminada la sesión, las llamadas ya no se perfilan
+    assert perfilador.envolver(trabajo_lento)() == "listo"
+    assert perfilador.estado()["completadas"] == 0
+    assert perfilador.resultado("texto")[0] == "Sin peticiones perfiladas\n"
+
+
+@pytest.fixture
+def cliente(main, monkeypatch):
+    monkeypatch.setattr(main, "PERFILADO_TOKEN", "secreto")
+    monkeypatch.setattr(main, "PERFILADOR", Perfilador())
+    with TestClient(main.app) as cliente:
+        yield cliente
+
+
+def test_flujo_determinista(main, cliente):
+    resp = cliente.post("/admin/perfilado", json={"modo": "determinista", "peticiones": 2}, headers=CABECERAS)
+    assert resp.status_code == 200, resp.text
+    assert cliente.post("/admin/perfilado", json={"modo": "muestreo"}, headers=CABECERAS).status_code == 409
+    assert cliente.get("/admin/perfilado", params={"formato": "pstats"}, headers=CABECERAS).status_code == 202
+
+    for _ in range(3):
+        assert cliente.post("/predecir", data=FORMULARIO).status_code == 200
+    estado = cliente.get("/admin/perfilado", headers=CABECERAS).json()
+    assert (estado["estado"], estado["completadas"]) == ("terminada", 2)
+
+    volcado = cliente.get("/admin/perfilado", params={"formato": "pstats"}, headers=CABECERAS)
+    assert volcado.headers["content-type"] == "application/octet-stream"
+    funciones = {nombre for _, _, nombre in marshal.loads(volcado.content)}
+    assert "renderizar_resultado" in funciones
+    texto = cliente.get("/admin/perfilado", params={"formato": "texto"}, headers=CABECERAS)
+    assert "renderizar_resultado" in texto.text
+    assert cliente.get("/admin/perfilado", params={"formato": "colapsado"}, headers=CABECERAS).status_code == 422
+
+
+def test_detener_y_validaciones(main, cliente):
+    assert cliente.get("/admin/perfilado", headers=CABECERAS).status_code == 404
+    for solicitud in ({"modo": "otro"}, {"peticiones": 0}, {"segundos": 0}, {"intervalo_ms": 0.5}):
+        assert cliente.post("/admin/perfilado", json=solicitud, headers=CABECERAS).status_code == 422, solicitud
+    cliente.post("/admin/perfilado", json={"modo": "muestreo", "segundos": 60}, headers=CABECERAS)
+    assert cliente.delete("/admin/perfilado", headers=CABECERAS).json()["estado"] == "terminada"
+    assert cliente.get("/admin/perfilado", params={"formato": "colapsado"}, headers=CABECERAS).status_code == 200
+
+
+def test_autenticacion(main, cliente, monkeypatch):
+    assert cliente.get("/admin/perfilado").status_code == 401
+    assert cliente.get("/admin/perfilado", headers={"Authorization": "Bearer otro"}).status_code == 401
+    monkeypatch.setattr(main, "PERFILADO_TOKEN", "")
+    assert cliente.get("/admin/perfilado", headers=CABECERAS).status_code == 404
@@ -0,0 +1,88 @@
+"""Un trabajador de inferencia que muere se reinicia en vez de dejar su ranura rota."""
+import gc
+import os
+import shutil
+import signal
+import time
+import weakref
+
+import joblib
+import numpy as np
+import pytest
+
+from modelo_sustituto import generar_datos
+from pool_procesos import PredictorProcesos
+from predictores import PredictorCompilado
+
+
+@pytest.fixture
+def pool(ruta_modelo):
+    compilado = PredictorCompilado(joblib.load(ruta_modelo))
+    pool = PredictorProcesos(compilado, ruta_modelo, 2)
+    yield pool
+    pool.cerrar()
+
+
+def test_trabajador_muerto_se_reinicia(pool):
+    datos, _ = generar_datos(50, semilla=3)
+    esperado = pool.compilado.predict(datos)
+    victima = pool._ranuras[0]
+    os.kill(victima.proceso.pid, signal.SIGKILL)
+    victima.proceso.join(timeout=5)
+
+    # Cada llamada usa una ranura libre; a lo sumo una da con el trabajador muerto y falla
+    errores = 0
+    for _ in range(4):
+        try:
+            np.testing.assert_allclose(pool.predict(datos), esperado, rtol=1e-12)
+        except RuntimeError as error:
+            assert "terminó" in str(error)
+            errores += 1
+    assert errores == 1
+
+    limite = time.monotonic() + 60
+    while pool.estado()["reiniciando"] and time.monotonic() < limite:
+        time.sleep(0.05)
+    assert pool.estado() == {"procesos": 2, "disponibles": 2, "reiniciando": 0, "reinicios": 1, "descartadas": 0}
+    assert victima.proceso.is_alive()
+    for _ in range(4):
+        np.testing.assert_allclose(pool.predict(datos), esperado, rtol=1e-12)
+
+
+def test_trabajador_no_arranca_si_el_artefacto_cambio(ruta_modelo, tmp_path):
+    ruta = tmp_path / "modelo.pkl"
+    shutil.copy(ruta_modelo, ruta)
+    compilado = PredictorCompilado(joblib.load(ruta))
+    pool = PredictorProcesos(compilado, str(ruta), 2)
+    try:
+        datos, _ = generar_datos(50, semilla=3)
+        esperado = compilado.predict(datos)
+        # Otro artefacto en la misma ruta: el trabajador que se reinicie no debe cargarlo
+        joblib.dump(joblib.load(ruta), ruta)
+        os.utime(ruta, ns=(0, 0))
+        victima = pool._ranuras[0]
+        os.kill(victima.proceso.pid, signal.SIGKILL)
+        victima.proceso.join(timeout=5)
+        for _ in range(2):
+            try:
+                pool.predict(datos)
+            except RuntimeError:
+                pass
+
+        limite = time.monotonic() + 60
+        while pool.estado()["reiniciando"] and time.monotonic() < limite:
+            time.sleep(0.05)
+        estado = pool.estado()
+        assert (estado["disponibles"], estado["reinicios"], estado["descartadas"]) == (1, 0, 1)
+        np.testing.assert_allclose(pool.predict(datos), esperado, rtol=1e-12)
+    finally:
+        pool.cerrar()
+
+
+def test_pool_cerrado_se_libera(ruta_modelo):
+    pool = PredictorProcesos(PredictorCompilado(joblib.load(ruta_modelo)), ruta_modelo, 1)
+    referencia = weakref.ref(pool)
+    pool.cerrar()
+    del pool
+    gc.collect()
+    assert referencia() is None
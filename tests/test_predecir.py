@@ -0,0 +1,89 @@
+"""/predecir: la ventana de ±2 días en una sola llamada al modelo, igual que el recorrido fila a fila."""
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from _comun import EVENTO_EJEMPLO
+from features_temporales import calcular_features_temporales
+
+FORMULARIO = dict(EVENTO_EJEMPLO, artista="Concierto", artista_nombre=EVENTO_EJEMPLO["artista"])
+
+
+def ventana_fila_a_fila(modelo, fecha, evento):
+    """El recorrido original: un DataFrame de una fila y un ``predict`` por día."""
+    fecha_base = datetime.strptime(fecha, "%Y-%m-%d")
+    preds, fechas_cortas = [], []
+    for i in range(-2, 3):
+        features = calcular_features_temporales((fecha_base + timedelta(days=i)).strftime("%Y-%m-%d"))
+        datos = pd.DataFrame([{
+            "Departamento": evento["Departamento"],
+            "Municipio": evento["Municipio"],
+            "DiaSemana": features["dia_semana"],
+            "CategoriaFunciones": evento["CategoriaFunciones"],
+            "EsCapital": evento["EsCapital"],
+            "artista": evento["artista"],
+            "genero": evento["genero"],
+            "tipo": evento["tipo"],
+            "Año": features["anio"],
+            "SemanaDelAño_sin": features["semana_sin"],
+            "SemanaDelAño_cos": features["semana_cos"],
+            "DiaDelAño_sin": features["dia_sin"],
+            "DiaDelAño_cos": features["dia_cos"],
+            "NumeroFunciones": evento["NumeroFunciones"],
+            "PrecioMinimo": evento["PrecioMinimo"],
+            "PrecioMaximo": evento["PrecioMaximo"],
+            "cantidad_artistas_evento": evento["cantidad_artistas_evento"],
+        }])
+        preds.append(float(modelo.predict(datos)[0]))
+        fechas_cortas.append(features["fecha_corta"])
+    return np.array(preds), fechas_cortas
+
+
+class PlantillaEspia:
+    """Envuelve la plantilla de resultados y guarda los valores con los que se renderiza."""
+
+    def __init__(self, plantilla):
+        self.plantilla = plantilla
+        self.valores = None
+
+    def render(self, **valores):
+        self.valores = valores
+        return self.plantilla.render(**valores)
+
+
+@pytest.mark.parametrize("fecha", ["2025-06-14", "2026-12-30", "2028-02-28"])
+def test_ventana_igual_al_recorrido_fila_a_fila(main, monkeypatch, fecha):
+    espia = PlantillaEspia(main.PLANTILLA_RESULTADO)
+    monkeypatch.setattr(main, "PLANTILLA_RESULTADO", espia)
+    predictor = main.MODELOS.activa.predictor
+    llamadas = []
+    predict = predictor.predict
+    monkeypatch.setattr(predictor, "predict", lambda datos: llamadas.append(len(datos)) or predict(datos))
+    monkeypatch.setattr(main, "CACHE", main.CachePredicciones(0, 60))
+
+    with TestClient(main.app) as cliente:
+        resp = cliente.post("/predecir", data=dict(FORMULARIO, fecha=fecha))
+    assert resp.status_code == 200, resp.text
+    assert llamadas == [5]
+
+    preds, fechas_cortas = ventana_fila_a_fila(main.modelo, fecha, EVENTO_EJEMPLO)
+    valores = espia.valores
+    np.testing.assert_allclose([b["valor"] for b in valores["barras"]], preds.astype(int), atol=1)
+    assert valores["promedio"] == pytest.approx(preds.mean(), rel=1e-6)
+    assert valores["max_pred"] == pytest.approx(max(preds.max(), 0.0), rel=1e-6)
+    assert valores["min_pred"] == pytest.approx(preds.min(), rel=1e-6)
+    assert valores["fecha_max"] == (fechas_cortas[int(np.argmax(preds))] if preds.max() > 0 else "")
+    assert valores["fecha_min"] == fechas_cortas[int(np.argmin(preds))]
+    precio_promedio = (FORMULARIO["PrecioMinimo"] + FORMULARIO["PrecioMaximo"]) / 2
+    assert valores["ingresos_estimados"] == pytest.approx(preds.mean() * precio_promedio, rel=1e-6)
+    assert [b["color"] for b in valores["barras"]] == ["#b39ddb"] * 2 + ["#7e57c2"] + ["#b39ddb"] * 2
+    assert f'<div class="metric-value">{int(valores["promedio"])}</div>' in resp.text
+
+
+def test_formulario_incompleto(main):
+    with TestClient(main.app) as cliente:
+        resp = cliente.post("/predecir", data={"fecha": "2026-03-14"})
+    assert resp.status_code == 422
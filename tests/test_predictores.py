@@ -0,0 +1,53 @@
+"""Paridad del backend compilado con el pipeline de sklearn sobre el modelo sustituto."""
+import numpy as np
+import pytest
+
+from bench_predictores import grilla_paridad
+from codificacion import IndiceCategorias
+from modelo_sustituto import construir_modelo, generar_datos
+from predictores import PredictorCompilado, PredictorPipeline
+
+TOLERANCIA = {"rtol": 1e-6, "atol": 1e-6}
+
+
+@pytest.fixture(scope="module", params=["gb", "xgb"])
+def backends(request):
+    if request.param == "xgb":
+        pytest.importorskip("xgboost")
+    modelo = construir_modelo(n=2000, arboles=50, estimador=request.param)
+    return modelo, PredictorPipeline(modelo), PredictorCompilado(modelo)
+
+
+def mezcla(n=500):
+    """Filas variadas con categorías conocidas y desconocidas intercaladas y precios extremos."""
+    datos, _ = generar_datos(n, semilla=7)
+    cada = np.arange(n)
+    datos.loc[cada % 3 == 0, "artista"] = "Artista desconocido"
+    datos.loc[cada % 5 == 0, "genero"] = "Cumbia"
+    datos.loc[cada % 7 == 0, ["Departamento", "Municipio"]] = ["Amazonas", "Leticia"]
+    datos.loc[cada % 11 == 0, "tipo"] = "Otro"
+    extremos = [(0.0, 0.0), (1.0, 1.0), (0.0, 5e9), (1e12, 1e12), (999_999.5, 1_000_000.5)]
+    for i, (minimo, maximo) in enumerate(extremos):
+        datos.loc[i::len(extremos) * 4, ["PrecioMinimo", "PrecioMaximo"]] = [minimo, maximo]
+    return datos
+
+
+@pytest.mark.parametrize("datos", [grilla_paridad(), mezcla()], ids=["grilla", "mezcla"])
+def test_compilado_igual_al_pipeline(backends, datos):
+    _, referencia, compilado = backends
+    np.testing.assert_allclose(compilado.predict(datos), referencia.predict(datos), **TOLERANCIA)
+
+
+def test_lote_codificado_igual_al_pipeline(backends):
+    modelo, referencia, compilado = backends
+    datos = mezcla()
+    indice = IndiceCategorias.desde_modelo(modelo)
+    lote = indice.lote({columna: datos[columna].to_numpy() for columna in datos.columns}, len(datos))
+    np.testing.assert_allclose(compilado.predict(lote), referencia.predict(datos), **TOLERANCIA)
+
+
+@pytest.mark.parametrize("n", [1, 2, 37])
+def test_lotes_pequenos(backends, n):
+    _, referencia, compilado = backends
+    datos = mezcla().iloc[:n].reset_index(drop=True)
+    np.testing.assert_allclose(compilado.predict(datos), referencia.predict(datos), **TOLERANCIA)
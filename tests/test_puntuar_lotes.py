@@ -0,0 +1,50 @@
+"""La puntuación por lotes ubica y deriva EsCapital igual que el servicio."""
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from _comun import EVENTO_EJEMPLO
+
+
+@pytest.fixture(scope="module")
+def puntuar_lotes(main):
+    import puntuar_lotes
+
+    return puntuar_lotes
+
+
+def catalogo(**columnas):
+    fila = dict(EVENTO_EJEMPLO, fecha="2026-03-14", artista_nombre=EVENTO_EJEMPLO["artista"])
+    del fila["artista"], fila["EsCapital"]
+    n = len(next(iter(columnas.values())))
+    return pd.DataFrame({**{c: [v] * n for c, v in fila.items()}, **columnas})
+
+
+def test_nombres_sin_tildes_puntuan_como_la_api(main, puntuar_lotes):
+    tramo = catalogo(
+        Departamento=["Antioquia", "antioquia", "ANTIOQUIA"],
+        Municipio=["Medellín", "medellin", "MEDELLIN"],
+        EsCapital=["0", "0", "1"],
+    )
+    resultado = puntuar_lotes.puntuar_tramo(tramo)
+    assert resultado["EsCapital"].tolist() == ["1", "1", "1"]
+    assert resultado["ubicacion_valida"].all()
+    np.testing.assert_allclose(resultado["prediccion"], resultado["prediccion"][0], rtol=1e-12)
+
+    with TestClient(main.app) as cliente:
+        respuesta = cliente.post(
+            "/api/v1/predict", json=dict(EVENTO_EJEMPLO, artista="Concierto", artista_nombre="Karol G",
+                                         Municipio="medellin", fecha="2026-03-14")
+        )
+    assert respuesta.status_code == 200, respuesta.text
+    dia = next(p for p in respuesta.json()["predicciones"] if p["fecha"] == "2026-03-14")
+    np.testing.assert_allclose(resultado["prediccion"][1], dia["prediccion"], rtol=1e-9)
+
+
+def test_filas_fuera_de_la_tabla_se_marcan(puntuar_lotes):
+    tramo = catalogo(Departamento=["Antioquia", "Atlántida"], Municipio=["Bello", "Ciudad perdida"], EsCapital=["1", "1"])
+    resultado = puntuar_lotes.puntuar_tramo(tramo)
+    assert resultado["ubicacion_valida"].tolist() == [True, False]
+    assert resultado["EsCapital"].tolist() == ["0", "0"]
+    assert resultado["Municipio"].tolist() == ["Bello", "Ciudad perdida"]